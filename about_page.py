@@ -0,0 +1,97 @@
+"""
+팀소개(/about) 페이지 데이터 로더
+배너, 페이지 섹션, 조종사, 정비사, 후보자, 전대장 인사말, 개요 섹션을
+SQLite JSON 함수로 묶어 한 번의 쿼리로 가져오고, 변경 불가능한 가벼운 레코드(namedtuple)로 돌려준다.
+
+레코드가 변경 불가능하므로 결과를 요청 사이에 공유해도 안전하다. 관련 테이블의
+data_versions 가 그대로면 워커 메모리의 스냅샷을 그대로 돌려주고, 관리자 수정으로
+버전이 바뀌면 다음 요청에서 다시 만든다.
+"""
+
+import json
+import threading
+from collections import namedtuple
+
+
+# (모델 필드, 테이블, WHERE 조건, 하나만 가져오는지 여부)
+# 조건의 :lang 은 요청 언어(ko/en)로 바인딩된다
+ABOUT_PARTS = (
+	('banner', 'banner_settings', "page_name = 'about'", True),
+	('sections', 'page_sections', "page_name = 'about' AND is_active = 1", False),
+	('pilots', 'pilots', 'is_active = 1', False),
+	('maintenance_crew', 'maintenance_crew', 'is_active = 1', False),
+	('candidates', 'candidates', 'is_active = 1', False),
+	('commanders', 'commander_greeting', 'is_active = 1 AND lang = :lang', False),
+	('overview_sections', 'about_sections',
+		"section_type IN ('mission', 'selection', 'formation') AND is_active = 1 AND lang = :lang", False),
+)
+
+AboutPage = namedtuple('AboutPage', [name for name, _, _, _ in ABOUT_PARTS])
+
+# 스냅샷 유효성 판단에 쓰는 테이블 (data_versions 기준)
+ABOUT_TABLES = tuple(sorted({table for _, table, _, _ in ABOUT_PARTS}))
+
+_query_cache = {}
+_snapshots = {}
+_snapshot_lock = threading.Lock()
+
+
+def _columns(conn, table):
+	return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _build(conn):
+	"""테이블 컬럼을 읽어 통합 쿼리와 레코드 타입을 만든다 (스키마는 시작 시 고정이므로 한 번만)"""
+	selects = []
+	record_types = {}
+	for name, table, where, single in ABOUT_PARTS:
+		columns = _columns(conn, table)
+		record_types[name] = namedtuple(table.title().replace('_', ''), columns)
+		fields = ', '.join(f"'{column}', {column}" for column in columns)
+		if single:
+			selects.append(f'(SELECT json_object({fields}) FROM {table} WHERE {where} LIMIT 1) AS {name}')
+		else:
+			selects.append(
+				f'(SELECT json_group_array(json_object({fields})) FROM '
+				f'(SELECT * FROM {table} WHERE {where} ORDER BY order_num)) AS {name}')
+	return 'SELECT ' + ',\n\t'.join(selects), record_types
+
+
+def load_about_page(conn, lang='ko', versions=None):
+	"""/about 템플릿에 필요한 데이터 전체
+
+	versions 에 data_versions 값(dict)을 넘기면 관련 테이블 버전이 같은 동안은 스냅샷을 재사용한다.
+	"""
+	lang = 'en' if lang == 'en' else 'ko'
+	if versions is None:
+		return _query_about_page(conn, lang)
+
+	key = tuple(versions.get(table) for table in ABOUT_TABLES)
+	snapshot = _snapshots.get(lang)
+	if snapshot is not None and snapshot[0] == key:
+		return snapshot[1]
+	page = _query_about_page(conn, lang)
+	with _snapshot_lock:
+		_snapshots[lang] = (key, page)
+	return page
+
+
+def _query_about_page(conn, lang):
+	"""단일 쿼리로 /about 데이터를 읽어 레코드로 변환"""
+	if 'query' not in _query_cache:
+		_query_cache['query'], _query_cache['types'] = _build(conn)
+	query, record_types = _query_cache['query'], _query_cache['types']
+
+	row = conn.execute(query, {'lang': lang}).fetchone()
+	values = {}
+	for index, (name, _, _, single) in enumerate(ABOUT_PARTS):
+		raw = row[index]
+		record_type = record_types[name]
+		if single:
+			values[name] = record_type(**json.loads(raw)) if raw else None
+		else:
+			records = [record_type(**item) for item in json.loads(raw or '[]')]
+			# json_group_array 는 서브쿼리 순서를 따르지만, 보장되지 않으므로 정렬을 한 번 더 고정
+			records.sort(key=lambda record: record.order_num or 0)
+			values[name] = tuple(records)
+	return AboutPage(**values)
@@ -1,13 +1,30 @@
 import os
 import sqlite3
-from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+import time
+import zipfile
+import click
+from flask import Flask, render_template, request, redirect, url_for, flash, session, make_response
 from flask_mail import Mail, Message
 from functools import wraps
-from PIL import Image
+from db import Database
+import migrations
+import schedule_repo
+import search
+from page_cache import PageCache
+from about_page import load_about_page
+from site_images import SiteImageRegistry
+from chat_events import ChatEvents
+from pagination import PAGE_ARGS, paginate_request
+from images import IMAGE_COLUMNS, VARIANT_NAME, ImagePipeline, static_path, store_upload
+from assets import AssetManifest
+from compression import Compressor, build as build_compressed
+from uploads import UploadRequest
+from image_variants import ImageVariantRegistry
 
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
+# 업로드 파일 파트를 메모리에 모으지 않고 처리 전 폴더의 임시 파일로 바로 받는다 (uploads.py)
+app.request_class = UploadRequest
 app.secret_key = os.environ.get('SECRET_KEY', 'devsecret-change-this-in-production')
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.jinja_env.auto_reload = True
@@ -15,44 +32,6 @@ app.jinja_env.auto_reload = True
 # 파일 업로드 크기 제한 (16MB)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-# 이미지 최적화 함수
-def optimize_image(file_path, max_width=1200, max_height=1200, quality=85):
-	"""
-	업로드된 이미지를 최적화합니다.
-	- EXIF 방향 정보를 처리하여 올바른 방향으로 회전
-	- 최대 크기로 리사이즈 (비율 유지)
-	- JPEG 포맷으로 압축 저장
-	"""
-	try:
-		with Image.open(file_path) as img:
-			# EXIF 방향 정보 처리
-			try:
-				from PIL import ImageOps
-				img = ImageOps.exif_transpose(img)
-			except Exception:
-				pass  # EXIF 정보가 없는 경우 무시
-			
-			# RGB 모드로 변환 (JPEG는 RGBA를 지원하지 않음)
-			if img.mode in ('RGBA', 'LA', 'P'):
-				background = Image.new('RGB', img.size, (255, 255, 255))
-				if img.mode == 'P':
-					img = img.convert('RGBA')
-				background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-				img = background
-			elif img.mode != 'RGB':
-				img = img.convert('RGB')
-			
-			# 비율을 유지하면서 리사이즈
-			img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-			
-			# 최적화하여 저장
-			img.save(file_path, 'JPEG', quality=quality, optimize=True)
-			
-		return True
-	except Exception as e:
-		print(f"이미지 최적화 중 오류 발생: {e}")
-		return False
-
 # Jinja2 필터 추가
 @app.template_filter('youtube_embed')
 def youtube_embed_filter(url):
@@ -77,412 +56,104 @@ def youtube_embed_filter(url):
 	
 	return url
 
+# 검색 결과 발췌의 일치 부분 <mark> 표시
+app.add_template_filter(search.highlight, 'highlight')
+
 # 데이터베이스 설정
-DATABASE = 'blackeagles.db'
+DATABASE = os.environ.get('DATABASE', 'blackeagles.db')
+app.config['DATABASE'] = DATABASE
+# 워커(프로세스)당 연결 풀 크기 - 스레드 수에 맞춰 조정
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 8))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+# 저장 모드: wal (기본) / rollback. 개별 PRAGMA 는 아래 환경변수로 덮어쓸 수 있다
+app.config['DB_STORAGE_MODE'] = os.environ.get('DB_STORAGE_MODE', 'wal')
+for _key, _cast in (('DB_SYNCHRONOUS', str), ('DB_CACHE_SIZE', int), ('DB_MMAP_SIZE', int), ('DB_BUSY_TIMEOUT', int)):
+	if os.environ.get(_key):
+		app.config[_key] = _cast(os.environ[_key])
+# 채팅/문의 등 방문자 쓰기를 프로세스당 하나의 쓰기 큐로 모아 일괄 커밋
+app.config['DB_WRITE_QUEUE'] = os.environ.get('DB_WRITE_QUEUE', 'true').lower() == 'true'
+# 시작 시 스키마가 뒤처져 있으면 자동으로 마이그레이션 (운영에서는 false 로 두고 배포 시 flask migrate 실행)
+app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', 'true').lower() == 'true'
+# 채팅 푸시(Socket.IO). false 면 위젯과 관리자 화면이 폴링으로만 동작
+app.config['CHAT_PUSH'] = os.environ.get('CHAT_PUSH', 'true').lower() == 'true'
+# 워커가 여러 개일 때 워커 간 이벤트 전달용 메시지 큐 (예: redis://localhost:6379/0)
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE', '')
+# threading (gthread 워커) / gevent (gevent 워커, gunicorn.conf.py 가 자동 설정)
+app.config['SOCKETIO_ASYNC_MODE'] = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+# 푸시를 쓸 수 없을 때 위젯이 롱폴링(새 메시지가 올 때까지 요청을 붙잡아 두는 방식)을 쓸지와 최대 대기 시간(초)
+app.config['CHAT_LONG_POLL'] = os.environ.get('CHAT_LONG_POLL', 'true').lower() == 'true'
+app.config['CHAT_LONG_POLL_TIMEOUT'] = float(os.environ.get('CHAT_LONG_POLL_TIMEOUT', 25))
+# 관리자 채팅 목록 한 페이지의 세션 수
+app.config['ADMIN_CHATS_PAGE_SIZE'] = int(os.environ.get('ADMIN_CHATS_PAGE_SIZE', 50))
+# 공지/일정/갤러리/문의 목록 한 페이지의 항목 수 (공개 페이지와 관리자 페이지 공통)
+app.config['LIST_PAGE_SIZE'] = int(os.environ.get('LIST_PAGE_SIZE', 30))
+# 업로드 사진 최적화를 맡는 프로세스 수 (워커당). 0 이면 요청 안에서 바로 처리
+app.config['IMAGE_WORKERS'] = int(os.environ.get('IMAGE_WORKERS', 2))
+# 처리 전 원본을 잠시 두는 폴더 (정적 파일로 노출되지 않는 위치)
+app.config['IMAGE_INCOMING_FOLDER'] = os.environ.get('IMAGE_INCOMING_FOLDER', '')
+# 업로드 사진 최적화 프로필 (quality / balanced / fast, images.OPTIMIZE_PROFILES)
+app.config['IMAGE_PROFILE'] = os.environ.get('IMAGE_PROFILE', 'balanced')
+# 갤러리 일괄 업로드를 동시에 처리할 프로세스 수 (0 이면 CPU 코어 수), 요청 하나의 최대 크기와 사진 수
+app.config['IMAGE_BATCH_WORKERS'] = int(os.environ.get('IMAGE_BATCH_WORKERS', 0))
+app.config['GALLERY_UPLOAD_MAX_BYTES'] = int(os.environ.get('GALLERY_UPLOAD_MAX_BYTES', 1024 * 1024 * 1024))
+app.config['GALLERY_BATCH_MAX_FILES'] = int(os.environ.get('GALLERY_BATCH_MAX_FILES', 500))
+# 공개 페이지 사진을 너비별 AVIF/WebP/JPEG 변형이 있는 <picture> 로 출력할지 여부
+app.config['RESPONSIVE_IMAGES'] = os.environ.get('RESPONSIVE_IMAGES', 'true').lower() == 'true'
+# 지문(?v=해시)이 맞는 정적 파일과 내용 해시 이름의 업로드 파일을 브라우저가 캐시할 시간(초, immutable)
+app.config['ASSET_MAX_AGE'] = int(os.environ.get('ASSET_MAX_AGE', 365 * 24 * 3600))
+# 렌더링한 HTML/JSON 응답을 그 자리에서 압축할 최소 크기(바이트)와 gzip 압축 수준
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 6))
+
+db = Database(app)
 
 def get_db():
-	"""데이터베이스 연결"""
-	conn = sqlite3.connect(DATABASE)
-	conn.row_factory = sqlite3.Row
-	return conn
+	"""데이터베이스 연결 (요청 동안 풀에서 빌린 연결을 재사용)"""
+	return db.connection()
+
+# 공개 페이지 응답 캐시 (관리자 수정 시 data_versions 트리거로 자동 무효화)
+page_cache = PageCache(db)
+
+# 정적 파일 지문 URL(템플릿 전역 asset_url)과 장기 캐시 헤더
+assets = AssetManifest(app)
+
+# 응답 압축 - 정적 파일은 미리 만든 .br/.gz, HTML 은 그 자리에서 (지문 캐시 헤더보다 먼저 실행되도록 뒤에 등록)
+compression = Compressor(app)
+
+# 사이트 이미지 조회 테이블 (템플릿 전역 site_images / site_image(key) 로 사용)
+site_images = SiteImageRegistry(db, page_cache.table_versions)
+site_images.init_app(app)
+
+# 채팅 메시지 푸시 (세션별 방 + 관리자 방)
+chat_events = ChatEvents(app)
+
+# 업로드 사진 최적화 (백그라운드 프로세스 풀)
+image_pipeline = ImagePipeline(db, app)
+
+# 반응형 이미지 변형 조회 테이블 (템플릿 전역 picture(url, alt, sizes=...) 로 사용)
+image_variants = ImageVariantRegistry(db, page_cache.table_versions)
+image_variants.init_app(app)
+
+
+def enqueue_member_photo(file, table, fallback_url):
+	"""멤버 사진 업로드를 최적화 작업으로 넘기고, 행에 저장할 URL(처리 중 자리표시)을 돌려준다"""
+	return image_pipeline.submit(file, table, 'photo_url', os.path.join(app.static_folder, 'members'),
+		'/static/members', fallback_url)
+
+
+def enqueue_gallery_variants(image_url):
+	"""갤러리에 등록한 로컬 정적 이미지의 반응형 변형을 백그라운드에서 만든다 (외부 URL 은 그대로)"""
+	path = static_path(app.static_folder, image_url)
+	if path and os.path.exists(path) and not image_variants.get(image_url):
+		image_pipeline.submit_variants(path, image_url)
 
 def init_db():
-	"""데이터베이스 초기화"""
-	conn = get_db()
-	cursor = conn.cursor()
-	
-	# 공지사항 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS notices (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			title TEXT NOT NULL,
-			content TEXT NOT NULL,
-			author TEXT NOT NULL,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 일정 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS schedules (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			title TEXT NOT NULL,
-			location TEXT,
-			event_date DATE NOT NULL,
-			description TEXT,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 문의 메시지 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS contact_messages (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			name TEXT,
-			email TEXT NOT NULL,
-			message TEXT NOT NULL,
-			type TEXT DEFAULT 'contact',
-			is_read INTEGER DEFAULT 0,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 페이지 섹션 테이블 (개선된 버전)
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS page_sections (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			page_name TEXT NOT NULL,
-			section_id TEXT NOT NULL,
-			section_type TEXT NOT NULL,
-			title TEXT,
-			content TEXT,
-			image_url TEXT,
-			link_url TEXT,
-			link_text TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			UNIQUE(page_name, section_id)
-		)
-	''')
-	
-	# 기본 페이지 섹션 생성
-	default_sections = [
-		('home', 'about', 'text', 'About Us', '가상블랙이글스는 대한민국 블랙이글스의 다양한 특수비행을 통해 고도의 비행기량을 뽐내는 대한민국 가상 특수비행팀입니다.', None, None, None, 1, 1),
-		('about', 'intro', 'text', '팀 소개', '블랙이글스는 대한민국 공군의 자랑입니다.', None, None, None, 1, 1),
-		('contact', 'discord', 'text', 'Contact Us', 'Discord ㅣ Johnson#4553', None, None, None, 1, 1),
-	]
-	
-	for section in default_sections:
-		cursor.execute('''
-			INSERT OR IGNORE INTO page_sections 
-			(page_name, section_id, section_type, title, content, image_url, link_url, link_text, order_num, is_active)
-			VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-		''', section)
-	
-	# 배너 설정 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS banner_settings (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			page_name TEXT UNIQUE NOT NULL,
-			background_image TEXT,
-			title TEXT NOT NULL,
-			subtitle TEXT,
-			description TEXT,
-			button_text TEXT,
-			button_link TEXT,
-			title_font TEXT DEFAULT 'Arial, sans-serif',
-			title_color TEXT DEFAULT '#ffffff',
-			subtitle_color TEXT DEFAULT '#ffffff',
-			description_color TEXT DEFAULT '#ffffff',
-			vertical_position TEXT DEFAULT 'center',
-			padding_top INTEGER DEFAULT 250,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 기존 테이블에 컬럼 추가 (이미 있으면 무시)
-	try:
-		cursor.execute('ALTER TABLE banner_settings ADD COLUMN vertical_position TEXT DEFAULT "center"')
-	except:
-		pass
-	try:
-		cursor.execute('ALTER TABLE banner_settings ADD COLUMN padding_top INTEGER DEFAULT 250')
-	except:
-		pass
-	
-	# 기본 홈페이지 배너 설정
-	cursor.execute('''
-		INSERT OR IGNORE INTO banner_settings (page_name, background_image, title, subtitle, description, button_text, button_link)
-		VALUES ('home', '/static/images/hero.jpg', 'Black Eagles', 'Republic Of Korea AirForce', 
-		        '가상블랙이글스는 대한민국 블랙이글스의 다양한 특수비행을 통해 고도의 비행기량을 뽐내는 대한민국 가상 특수비행팀입니다.', 
-		        'more', '#about')
-	''')
-	
-	# 조종사 정보 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS pilots (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			number INTEGER NOT NULL,
-			position TEXT NOT NULL,
-			callsign TEXT NOT NULL,
-			generation TEXT NOT NULL,
-			aircraft TEXT NOT NULL,
-			photo_url TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 기본 조종사 데이터 삽입 (중복 방지)
-	default_pilots = [
-		(1, 'LEADER', 'Bulta', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 1, 1),
-		(2, 'LEFT WING', 'Fox9', 'VBE 2기', 'F-18', '/static/members/moon.jpeg', 2, 1),
-		(3, 'RIGHT WING', 'Ace', 'VBE 1기', 'F-18', '/static/members/moon.jpeg', 3, 1),
-		(4, 'Slot', 'Moon', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 4, 1),
-		(5, 'SYNCHRO-1', 'ZeroDistance', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 5, 1),
-		(6, 'SYNCHRO-2', 'Lewis', 'VBE 1기', 'F-5', '/static/members/Lewis.jpg', 6, 1),
-		(7, 'SOLO-1', 'Sonic', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 7, 1),
-		(8, 'SOLO-2', 'Strike', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 8, 1),
-	]
-	
-	# 이미 데이터가 있는지 확인
-	existing_count = cursor.execute('SELECT COUNT(*) FROM pilots').fetchone()[0]
-	
-	# 데이터가 없을 때만 기본 데이터 삽입
-	if existing_count == 0:
-		for pilot in default_pilots:
-			cursor.execute('''
-				INSERT INTO pilots 
-				(number, position, callsign, generation, aircraft, photo_url, order_num, is_active)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-			''', pilot)
-	
-	# 홈 콘텐츠 테이블 (유튜브, SNS 피드 등)
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS home_contents (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			content_type TEXT NOT NULL,
-			title TEXT,
-			content_data TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 기본 유튜브 콘텐츠 삽입
-	cursor.execute('''
-		INSERT OR IGNORE INTO home_contents (id, content_type, title, content_data, order_num, is_active)
-		VALUES (1, 'youtube', 'Latest Video', 'https://www.youtube.com/embed/dQw4w9WgXcQ', 1, 1)
-	''')
-	
-	# 팀소개 섹션 테이블 (개요, 항공기 등)
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS about_sections (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			section_type TEXT NOT NULL,
-			title TEXT,
-			content TEXT,
-			-- 언어 구분 (ko / en). 기존 DB에는 없을 수 있으므로 아래에서 ALTER TABLE 로 추가
-			-- lang TEXT NOT NULL DEFAULT 'ko',
-			image_url TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# about_sections 테이블에 lang 컬럼이 없을 수 있으므로 동적으로 추가
-	try:
-		cursor.execute('ALTER TABLE about_sections ADD COLUMN lang TEXT DEFAULT "ko"')
-	except Exception:
-		# 이미 컬럼이 있을 경우 에러를 무시
-		pass
-	
-	# 기본 개요 섹션 추가
-	cursor.execute('''
-		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
-		VALUES (1, 'overview', '가상 블랙이글스 소개', 
-		'가상 블랙이글스는 DCS World에서 활동하는 대한민국 가상 공군 특수비행팀입니다. 실제 블랙이글스의 정신과 전통을 계승하며, 정교한 편대비행과 에어쇼를 통해 뛰어난 비행실력을 선보입니다.', 
-		0, 1)
-	''')
-	
-	cursor.execute('''
-		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
-		VALUES (2, 'mission', '임무', 
-		'우리의 임무는 대한민국 공군의 우수성을 전 세계에 알리고, 가상 비행 시뮬레이션을 통해 항공에 대한 관심과 이해를 높이는 것입니다. 또한 팀원들의 비행 실력 향상과 팀워크 강화를 목표로 합니다.', 
-		1, 1)
-	''')
-	
-	cursor.execute('''
-		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
-		VALUES (3, 'aircraft_intro', 'T-50B 골든이글', 
-		'T-50B는 대한민국이 자체 개발한 초음속 고등훈련기로, 블랙이글스 팀이 사용하는 항공기입니다. 우수한 기동성과 안정성을 자랑하며, 다양한 편대비행 기동을 수행할 수 있습니다.', 
-		2, 1)
-	''')
-	
-	cursor.execute('''
-		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, image_url, order_num, is_active)
-		VALUES (4, 'aircraft_specs', 'T-50B 제원', 
-		'최대속도: 마하 1.5|전투행동반경: 1,851km|최대이륙중량: 12,300kg|엔진: F404-GE-102 터보팬|승무원: 2명|무장: 20mm 기관포, 공대공 미사일',
-		'/static/images/t50b.jpg', 
-		3, 1)
-	''')
-	
-	cursor.execute('''
-		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
-		VALUES (5, 'aircraft_features', '특징', 
-		'우수한 기동성|높은 안정성|효율적인 연료 소비|조종사 친화적 설계|다목적 운용 가능', 
-		4, 1)
-	''')
-	
-	# 전대장 인사말 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS commander_greeting (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			name TEXT NOT NULL,
-			-- 언어 구분 (ko / en). 기존 DB에는 없을 수 있으므로 아래에서 ALTER TABLE 로 추가
-			-- lang TEXT NOT NULL DEFAULT 'ko',
-			rank TEXT NOT NULL,
-			callsign TEXT NOT NULL,
-			generation TEXT NOT NULL,
-			aircraft TEXT NOT NULL,
-			photo_url TEXT,
-			greeting_text TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# commander_greeting 테이블에 lang 컬럼이 없을 수 있으므로 동적으로 추가
-	try:
-		cursor.execute('ALTER TABLE commander_greeting ADD COLUMN lang TEXT DEFAULT "ko"')
-	except Exception:
-		# 이미 컬럼이 있을 경우 에러를 무시
-		pass
-	
-	# 기본 전대장 데이터 삽입 (데이터가 없을 때만)
-	existing_commanders = cursor.execute('SELECT COUNT(*) as count FROM commander_greeting').fetchone()[0]
-	if existing_commanders == 0:
-		cursor.execute('''
-			INSERT INTO commander_greeting (name, rank, callsign, generation, aircraft, photo_url, greeting_text, order_num, is_active)
-			VALUES ('Bulta', 'COMMANDER', '#1 Bulta', 'VBE 1기', 'F-5', '/static/images/default-pilot.jpg', 
-			'안녕하십니까. 가상 블랙이글스 전대장입니다. 우리 팀은 대한민국 공군의 자랑스러운 전통을 계승하며, 최고의 비행 실력을 갖춘 정예 조종사들로 구성되어 있습니다.', 
-			1, 1)
-		''')
-
-	# 정비사 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS maintenance_crew (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			name TEXT NOT NULL,
-			role TEXT,
-			callsign TEXT,
-			photo_url TEXT,
-			bio TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-
-	# 후보자 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS candidates (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			name TEXT NOT NULL,
-			callsign TEXT,
-			photo_url TEXT,
-			bio TEXT,
-			order_num INTEGER DEFAULT 0,
-			is_active INTEGER DEFAULT 1,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-
-	# 사진 게시판 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS gallery (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			title TEXT NOT NULL,
-			description TEXT,
-			image_url TEXT NOT NULL,
-			upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			is_active INTEGER DEFAULT 1,
-			order_num INTEGER DEFAULT 0,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 기본 샘플 이미지 추가
-	cursor.execute('''
-		INSERT OR IGNORE INTO gallery (id, title, description, image_url, order_num, is_active)
-		VALUES (1, '편대비행 훈련', 'T-50B 4기 편대비행 훈련 모습', '/static/Picture/20251207_173919_section_formation.png', 1, 1)
-	''')
-	
-	cursor.execute('''
-		INSERT OR IGNORE INTO gallery (id, title, description, image_url, order_num, is_active)
-		VALUES (2, '에어쇼 공연', '2024 서울 에어쇼 블랙이글스 공연', '/static/Picture/Formation.png', 2, 1)
-	''')
-	
-	# 사이트 이미지 관리 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS site_images (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			image_key TEXT UNIQUE NOT NULL,
-			image_name TEXT NOT NULL,
-			image_path TEXT NOT NULL,
-			description TEXT,
-			category TEXT NOT NULL,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	# 기본 이미지 키 등록
-	default_images = [
-		('hero_banner', '홈 배너 이미지', '/static/images/hero.jpg', '메인 페이지 상단 배너', 'home'),
-		('about_banner', '팀소개 배너 이미지', '/static/images/hero.jpg', '팀소개 페이지 상단 배너', 'about'),
-		('default_pilot', '기본 파일럿 이미지', '/static/members/moon.jpeg', '파일럿 기본 프로필', 'about'),
-		('t50b_main', 'T-50B 메인 이미지', '/static/Picture/Formation.png', '항공기 소개 이미지', 'about'),
-	]
-	
-	for img_key, img_name, img_path, desc, cat in default_images:
-		cursor.execute('''
-			INSERT OR IGNORE INTO site_images (image_key, image_name, image_path, description, category)
-			VALUES (?, ?, ?, ?, ?)
-		''', (img_key, img_name, img_path, desc, cat))
-	
-	# 기존 DB에 이미 t50b_main 이 있다면 경로를 실제 존재하는 이미지로 교체
+	"""데이터베이스 스키마를 최신 버전으로 맞춘다 (적용한 마이그레이션 목록 반환)"""
+	conn = sqlite3.connect(DATABASE, timeout=30)
 	try:
-		cursor.execute('''
-			UPDATE site_images
-			SET image_path = '/static/Picture/Formation.png'
-			WHERE image_key = 't50b_main'
-		''')
-	except Exception:
-		pass
-	
-	# 실시간 채팅 테이블
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS chat_sessions (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			session_id TEXT UNIQUE NOT NULL,
-			user_name TEXT,
-			user_email TEXT,
-			status TEXT DEFAULT 'active',
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-		)
-	''')
-	
-	cursor.execute('''
-		CREATE TABLE IF NOT EXISTS chat_messages (
-			id INTEGER PRIMARY KEY AUTOINCREMENT,
-			session_id TEXT NOT NULL,
-			sender_type TEXT NOT NULL,
-			sender_name TEXT,
-			message TEXT NOT NULL,
-			is_read INTEGER DEFAULT 0,
-			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-			FOREIGN KEY (session_id) REFERENCES chat_sessions(session_id)
-		)
-	''')
-	
-	conn.commit()
-	conn.close()
+		return migrations.migrate(conn)
+	finally:
+		conn.close()
 
 # 관리자 계정 (실제 운영시에는 데이터베이스나 환경변수 사용 권장)
 ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME', 'admin')
@@ -539,14 +210,10 @@ def send_mail():
 	
 	try:
 		# 데이터베이스에 문의 내용 저장 (type은 'contact')
-		conn = get_db()
-		cursor = conn.cursor()
-		cursor.execute('''
+		db.write(lambda conn: conn.execute('''
 			INSERT INTO contact_messages (name, email, message, type)
 			VALUES (?, ?, ?, ?)
-		''', (name or '익명', email, message, 'contact'))
-		conn.commit()
-		conn.close()
+		''', (name or '익명', email, message, 'contact')))
 		
 		flash('문의가 성공적으로 접수되었습니다! 관리자가 확인 후 답변드리겠습니다.', 'success')
 	except Exception as e:
@@ -557,6 +224,7 @@ def send_mail():
 
 
 @app.route('/')
+@page_cache.cached('banner_settings', 'page_sections', 'home_contents', 'site_images')
 def index():
 	lang = request.args.get('lang', 'ko')  # 기본값은 한국어
 	try:
@@ -576,15 +244,6 @@ def index():
 		except:
 			home_contents = []
 		
-		# 사이트 이미지 가져오기
-		site_images = {}
-		try:
-			images = conn.execute('SELECT image_key, image_path FROM site_images').fetchall()
-			for img in images:
-				site_images[img['image_key']] = img['image_path']
-		except:
-			pass
-		
 		conn.close()
 	except Exception as e:
 		# 데이터베이스 에러 시 기본값 사용
@@ -592,20 +251,21 @@ def index():
 		banner = None
 		sections = []
 		home_contents = []
-		site_images = {}
 	
 	# 언어 설정을 템플릿에 전달
 	if lang == 'en':
-		return render_template('index_en.html', banner=banner, sections=sections, home_contents=home_contents, site_images=site_images)
+		return render_template('index_en.html', banner=banner, sections=sections, home_contents=home_contents)
 	else:
-		return render_template('index.html', banner=banner, sections=sections, home_contents=home_contents, site_images=site_images)
+		return render_template('index.html', banner=banner, sections=sections, home_contents=home_contents)
 
 
 @app.route('/notice')
+@page_cache.cached('notices', query_args=PAGE_ARGS)
 def notice():
 	lang = request.args.get('lang', 'ko')
 	conn = get_db()
-	notices = conn.execute('SELECT * FROM notices ORDER BY created_at DESC').fetchall()
+	notices = paginate_request(conn, 'SELECT * FROM notices', [('created_at', 'DESC'), ('id', 'DESC')],
+		page_size=app.config['LIST_PAGE_SIZE'])
 	conn.close()
 	
 	if lang == 'en':
@@ -628,42 +288,22 @@ def notice_detail(notice_id):
 
 
 @app.route('/about')
+@page_cache.cached('banner_settings', 'page_sections', 'pilots', 'maintenance_crew', 'candidates',
+	'commander_greeting', 'about_sections', 'site_images', 'image_variants')
 def about():
 	lang = request.args.get('lang', 'ko')
-	conn = get_db()
-	banner = conn.execute('SELECT * FROM banner_settings WHERE page_name = ?', ('about',)).fetchone()
-	sections = conn.execute('SELECT * FROM page_sections WHERE page_name = ? AND is_active = 1 ORDER BY order_num', ('about',)).fetchall()
-	pilots = conn.execute('SELECT * FROM pilots WHERE is_active = 1 ORDER BY order_num').fetchall()
-	
-	# 정비사 가져오기
-	maintenance_crew = conn.execute('SELECT * FROM maintenance_crew WHERE is_active = 1 ORDER BY order_num').fetchall()
-	
-	# 후보자 가져오기
-	candidates = conn.execute('SELECT * FROM candidates WHERE is_active = 1 ORDER BY order_num').fetchall()
-	
-	# 전대장 인사말 가져오기 - 언어별로 가져오기
-	lang_param = 'en' if lang == 'en' else 'ko'
-	commanders = conn.execute('SELECT * FROM commander_greeting WHERE is_active = 1 AND lang = ? ORDER BY order_num', (lang_param,)).fetchall()
-	
-	# 개요 섹션 가져오기 (임무, 선발, 편대) - 언어별로 가져오기
-	lang_param = 'en' if lang == 'en' else 'ko'
-	overview_sections = conn.execute('SELECT * FROM about_sections WHERE section_type IN (?, ?, ?) AND is_active = 1 AND lang = ? ORDER BY order_num', ('mission', 'selection', 'formation', lang_param)).fetchall()
-	
-	# 사이트 이미지 가져오기
-	site_images = {}
-	images = conn.execute('SELECT image_key, image_path FROM site_images').fetchall()
-	for img in images:
-		site_images[img['image_key']] = img['image_path']
-	
-	conn.close()
+	# 배너, 섹션, 조종사, 정비사, 후보자, 전대장 인사말(언어별), 개요 섹션(언어별)을 한 번에 조회
+	# (관련 테이블 버전이 그대로면 워커 메모리의 스냅샷 재사용)
+	page = load_about_page(get_db(), lang, versions=page_cache.table_versions())
 	
 	if lang == 'en':
-		return render_template('about_en.html', banner=banner, sections=sections, pilots=pilots, maintenance_crew=maintenance_crew, candidates=candidates, commanders=commanders, overview_sections=overview_sections, site_images=site_images)
+		return render_template('about_en.html', **page._asdict())
 	else:
-		return render_template('about.html', banner=banner, sections=sections, pilots=pilots, maintenance_crew=maintenance_crew, candidates=candidates, commanders=commanders, overview_sections=overview_sections, site_images=site_images)
+		return render_template('about.html', **page._asdict())
 
 
 @app.route('/contact')
+@page_cache.cached('banner_settings', 'page_sections')
 def contact():
 	lang = request.args.get('lang', 'ko')
 	conn = get_db()
@@ -678,6 +318,7 @@ def contact():
 
 
 @app.route('/donate')
+@page_cache.cached('banner_settings', 'page_sections')
 def donate():
 	lang = request.args.get('lang', 'ko')
 	conn = get_db()
@@ -692,10 +333,13 @@ def donate():
 
 
 @app.route('/gallery')
+@page_cache.cached('gallery', 'image_variants', query_args=PAGE_ARGS)
 def gallery():
 	lang = request.args.get('lang', 'ko')
 	conn = get_db()
-	photos = conn.execute('SELECT * FROM gallery WHERE is_active = 1 ORDER BY order_num, upload_date DESC').fetchall()
+	photos = paginate_request(conn, 'SELECT * FROM gallery',
+		[('order_num', 'ASC'), ('upload_date', 'DESC'), ('id', 'DESC')],
+		where='is_active = 1', page_size=app.config['LIST_PAGE_SIZE'])
 	conn.close()
 	
 	if lang == 'en':
@@ -716,13 +360,10 @@ def send_donate():
 	
 	try:
 		# 데이터베이스에 후원 문의 저장 (email 필드에 금액 저장, type은 'donate')
-		conn = get_db()
-		conn.execute(
+		db.write(lambda conn: conn.execute(
 			'INSERT INTO contact_messages (name, email, message, type) VALUES (?, ?, ?, ?)',
 			(name, amount, message, 'donate')
-		)
-		conn.commit()
-		conn.close()
+		))
 		
 		flash('후원 문의가 성공적으로 전송되었습니다! 빠른 시일 내에 연락드리겠습니다.', 'success')
 		return redirect(url_for('donate'))
@@ -734,10 +375,12 @@ def send_donate():
 
 
 @app.route('/schedule')
+@page_cache.cached('schedules', query_args=PAGE_ARGS)
 def schedule():
 	lang = request.args.get('lang', 'ko')
 	conn = get_db()
-	schedules = conn.execute('SELECT * FROM schedules ORDER BY event_date DESC').fetchall()
+	schedules = paginate_request(conn, schedule_repo.LIST_SELECT, schedule_repo.LIST_ORDER,
+		page_size=app.config['LIST_PAGE_SIZE'])
 	conn.close()
 	
 	if lang == 'en':
@@ -749,7 +392,7 @@ def schedule():
 @app.route('/schedule/<int:schedule_id>')
 def schedule_detail(schedule_id):
 	conn = get_db()
-	schedule = conn.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
+	schedule = schedule_repo.get(conn, schedule_id)
 	conn.close()
 	
 	if not schedule:
@@ -759,6 +402,38 @@ def schedule_detail(schedule_id):
 	return render_template('schedule_detail.html', schedule=schedule)
 
 
+# 공개 검색 대상: 공지사항(제목/내용/작성자)과 일정 - scope 로 한쪽만, field 로 공지사항 컬럼 하나만 찾는다
+SEARCH_SCOPES = ('notices', 'schedules')
+
+
+def search_page():
+	"""?page= (1부터) → (페이지 번호, OFFSET)"""
+	page = request.args.get('page', '1')
+	page = int(page) if page.isdigit() and int(page) > 0 else 1
+	return page, (page - 1) * app.config['LIST_PAGE_SIZE']
+
+
+@app.route('/search')
+def site_search():
+	lang = request.args.get('lang', 'ko')
+	query = request.args.get('q', '').strip()[:100]
+	scope = request.args.get('scope')
+	scopes = (scope,) if scope in SEARCH_SCOPES else SEARCH_SCOPES
+	field = request.args.get('field')
+	page, offset = search_page()
+	results = {}
+	if query:
+		conn = get_db()
+		for table in scopes:
+			columns = [field] if table == 'notices' and field in search.INDEXES['notices'][0] else None
+			results[table] = search.search(conn, table, query, limit=app.config['LIST_PAGE_SIZE'], offset=offset, columns=columns)
+		conn.close()
+	
+	template = 'search_en.html' if lang == 'en' else 'search.html'
+	return render_template(template, query=query, results=results, scope=scope if scope in SEARCH_SCOPES else None,
+		field=field, page=page)
+
+
 # 관리자 로그인 페이지
 @app.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
@@ -795,10 +470,9 @@ def admin_dashboard():
 	# 최근 문의 5개 가져오기
 	recent_messages = conn.execute('SELECT * FROM contact_messages ORDER BY created_at DESC LIMIT 5').fetchall()
 	
-	# 읽지 않은 채팅 메시지 수 가져오기
+	# 읽지 않은 채팅 메시지 수 가져오기 (세션 요약 합계)
 	unread_chat_count = conn.execute('''
-		SELECT COUNT(*) as count FROM chat_messages 
-		WHERE sender_type = 'user' AND is_read = 0
+		SELECT COALESCE(SUM(unread_user_count), 0) as count FROM chat_sessions
 	''').fetchone()['count']
 	
 	# 활성 채팅 세션 수
@@ -821,7 +495,8 @@ def admin_dashboard():
 @login_required
 def admin_notices():
 	conn = get_db()
-	notices = conn.execute('SELECT * FROM notices ORDER BY created_at DESC').fetchall()
+	notices = paginate_request(conn, 'SELECT * FROM notices', [('created_at', 'DESC'), ('id', 'DESC')],
+		page_size=app.config['LIST_PAGE_SIZE'])
 	conn.close()
 	return render_template('admin/notices.html', notices=notices)
 
@@ -901,7 +576,8 @@ def admin_notice_delete(notice_id):
 @login_required
 def admin_schedules():
 	conn = get_db()
-	schedules = conn.execute('SELECT * FROM schedules ORDER BY event_date DESC').fetchall()
+	schedules = paginate_request(conn, schedule_repo.LIST_SELECT, schedule_repo.LIST_ORDER,
+		page_size=app.config['LIST_PAGE_SIZE'])
 	conn.close()
 	return render_template('admin/schedules.html', schedules=schedules)
 
@@ -921,8 +597,12 @@ def admin_schedule_new():
 			return redirect(url_for('admin_schedule_new'))
 		
 		conn = get_db()
-		conn.execute('INSERT INTO schedules (title, location, event_date, description) VALUES (?, ?, ?, ?)',
-					 (title, location, event_date, description))
+		try:
+			schedule_repo.add(conn, title, location, event_date, description)
+		except ValueError as e:
+			conn.close()
+			flash(str(e), 'error')
+			return redirect(url_for('admin_schedule_new'))
 		conn.commit()
 		conn.close()
 		
@@ -945,18 +625,26 @@ def admin_schedule_edit(schedule_id):
 		description = request.form.get('description', '').strip()
 		
 		if not title or not event_date:
+			conn.close()
 			flash('제목과 날짜를 모두 입력해주세요.', 'error')
 			return redirect(url_for('admin_schedule_edit', schedule_id=schedule_id))
 		
-		conn.execute('UPDATE schedules SET title = ?, location = ?, event_date = ?, description = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
-					 (title, location, event_date, description, schedule_id))
+		try:
+			found = schedule_repo.update(conn, schedule_id, title, location, event_date, description)
+		except ValueError as e:
+			conn.close()
+			flash(str(e), 'error')
+			return redirect(url_for('admin_schedule_edit', schedule_id=schedule_id))
 		conn.commit()
 		conn.close()
 		
-		flash('일정이 수정되었습니다.', 'success')
+		if not found:
+			flash('일정을 찾을 수 없습니다.', 'error')
+		else:
+			flash('일정이 수정되었습니다.', 'success')
 		return redirect(url_for('admin_schedules'))
 	
-	schedule = conn.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
+	schedule = schedule_repo.get(conn, schedule_id)
 	conn.close()
 	
 	if not schedule:
@@ -971,7 +659,7 @@ def admin_schedule_edit(schedule_id):
 @login_required
 def admin_schedule_delete(schedule_id):
 	conn = get_db()
-	conn.execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
+	schedule_repo.delete(conn, schedule_id)
 	conn.commit()
 	conn.close()
 	
@@ -987,17 +675,38 @@ def admin_messages():
 	conn = get_db()
 	
 	if message_type == 'contact':
-		messages = conn.execute("SELECT * FROM contact_messages WHERE type = 'contact' OR type IS NULL ORDER BY created_at DESC").fetchall()
+		where = "type = 'contact'"
 	elif message_type == 'donate':
-		messages = conn.execute("SELECT * FROM contact_messages WHERE type = 'donate' ORDER BY created_at DESC").fetchall()
+		where = "type = 'donate'"
 	else:  # all
-		messages = conn.execute('SELECT * FROM contact_messages ORDER BY created_at DESC').fetchall()
+		where = None
+	messages = paginate_request(conn, 'SELECT * FROM contact_messages', [('created_at', 'DESC'), ('id', 'DESC')],
+		where=where, page_size=app.config['LIST_PAGE_SIZE'])
 	
 	conn.close()
 	
 	return render_template('admin/messages.html', messages=messages, current_type=message_type)
 
 
+# 문의 검색 (이름, 이메일, 메시지 - 관련도 순)
+@app.route('/admin/messages/search')
+@login_required
+def admin_messages_search():
+	message_type = request.args.get('type', 'all')
+	query = request.args.get('q', '').strip()[:100]
+	page, offset = search_page()
+	where, params = (('t.type = ?', (message_type,)) if message_type in ('contact', 'donate') else (None, ()))
+	conn = get_db()
+	messages, has_next = search.search(conn, 'contact_messages', query, limit=app.config['LIST_PAGE_SIZE'], offset=offset,
+		where=where, params=params)
+	conn.close()
+	
+	next_url = url_for('admin_messages_search', q=query, type=message_type, page=page + 1) if has_next else None
+	prev_url = url_for('admin_messages_search', q=query, type=message_type, page=page - 1) if page > 1 else None
+	return render_template('admin/messages.html', messages=messages, current_type=message_type, query=query,
+		next_url=next_url, prev_url=prev_url)
+
+
 # 문의 상세보기
 @app.route('/admin/messages/<int:message_id>')
 @login_required
@@ -1236,16 +945,8 @@ def admin_pilot_new():
 		photo_url = '/static/images/default-pilot.jpg'  # 기본 이미지
 		file = request.files.get('photo')
 		if file and file.filename:
-			filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_pilot_{callsign}.jpg"  # 최종 파일은 항상 .jpg
-			filepath = os.path.join('static', 'members', filename)
-			os.makedirs(os.path.dirname(filepath), exist_ok=True)
-			file.save(filepath)
-			
-			# 이미지 최적화
-			if optimize_image(filepath):
-				photo_url = f'/static/members/{filename}'
-			else:
-				flash('이미지 처리 중 오류가 발생했습니다.', 'warning')
+			# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+			photo_url = enqueue_member_photo(file, 'pilots', photo_url)
 		
 		conn = get_db()
 		conn.execute('''
@@ -1294,16 +995,8 @@ def admin_pilot_edit(pilot_id):
 		# 파일 업로드 처리
 		file = request.files.get('photo')
 		if file and file.filename:
-			filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_pilot_{callsign}.jpg"  # 최종 파일은 항상 .jpg
-			filepath = os.path.join('static', 'members', filename)
-			os.makedirs(os.path.dirname(filepath), exist_ok=True)
-			file.save(filepath)
-			
-			# 이미지 최적화
-			if optimize_image(filepath):
-				photo_url = f'/static/members/{filename}'
-			else:
-				flash('이미지 처리 중 오류가 발생했습니다.', 'warning')
+			# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+			photo_url = enqueue_member_photo(file, 'pilots', photo_url)
 		
 		conn.execute('''
 			UPDATE pilots 
@@ -1385,22 +1078,8 @@ def admin_maintenance_new():
 					flash('이미지 파일만 업로드 가능합니다.', 'error')
 					return redirect(url_for('admin_maintenance_new'))
 				
-				# 안전한 파일명 생성
-				safe_callsign = ''.join(c for c in callsign if c.isalnum() or c in ('-', '_'))
-				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-				filename = f'{timestamp}_crew_{safe_callsign}.jpg'  # 최종 파일은 항상 .jpg
-				
-				# 파일 저장
-				upload_folder = os.path.join(app.root_path, 'static', 'members')
-				os.makedirs(upload_folder, exist_ok=True)
-				file_path = os.path.join(upload_folder, filename)
-				file.save(file_path)
-				
-				# 이미지 최적화
-				if optimize_image(file_path):
-					photo_url = f'/static/members/{filename}'
-				else:
-					flash('이미지 처리 중 오류가 발생했습니다.', 'warning')
+				# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+				photo_url = enqueue_member_photo(file, 'maintenance_crew', photo_url)
 		
 		# 데이터베이스에 저장
 		conn = get_db()
@@ -1455,22 +1134,8 @@ def admin_maintenance_edit(crew_id):
 					flash('이미지 파일만 업로드 가능합니다.', 'error')
 					return redirect(url_for('admin_maintenance_edit', crew_id=crew_id))
 				
-				# 안전한 파일명 생성
-				safe_callsign = ''.join(c for c in callsign if c.isalnum() or c in ('-', '_'))
-				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-				filename = f'{timestamp}_crew_{safe_callsign}.jpg'  # 최종 파일은 항상 .jpg
-				
-				# 파일 저장
-				upload_folder = os.path.join(app.root_path, 'static', 'members')
-				os.makedirs(upload_folder, exist_ok=True)
-				file_path = os.path.join(upload_folder, filename)
-				file.save(file_path)
-				
-				# 이미지 최적화
-				if optimize_image(file_path):
-					photo_url = f'/static/members/{filename}'
-				else:
-					flash('이미지 처리 중 오류가 발생했습니다.', 'warning')
+				# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+				photo_url = enqueue_member_photo(file, 'maintenance_crew', photo_url)
 		
 		# 데이터베이스 업데이트
 		conn.execute('''
@@ -1551,18 +1216,8 @@ def admin_candidate_new():
 					flash('이미지 파일만 업로드 가능합니다.', 'error')
 					return redirect(url_for('admin_candidate_new'))
 				
-				# 안전한 파일명 생성
-				safe_callsign = ''.join(c for c in callsign if c.isalnum() or c in ('-', '_'))
-				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-				filename = f'{timestamp}_candidate_{safe_callsign}{file_ext}'
-				
-				# 파일 저장
-				upload_folder = os.path.join(app.root_path, 'static', 'members')
-				os.makedirs(upload_folder, exist_ok=True)
-				file_path = os.path.join(upload_folder, filename)
-				file.save(file_path)
-				
-				photo_url = f'/static/members/{filename}'
+				# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+				photo_url = enqueue_member_photo(file, 'candidates', photo_url)
 		
 		# 데이터베이스에 저장
 		conn = get_db()
@@ -1616,18 +1271,8 @@ def admin_candidate_edit(candidate_id):
 					flash('이미지 파일만 업로드 가능합니다.', 'error')
 					return redirect(url_for('admin_candidate_edit', candidate_id=candidate_id))
 				
-				# 안전한 파일명 생성
-				safe_callsign = ''.join(c for c in callsign if c.isalnum() or c in ('-', '_'))
-				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-				filename = f'{timestamp}_candidate_{safe_callsign}{file_ext}'
-				
-				# 파일 저장
-				upload_folder = os.path.join(app.root_path, 'static', 'members')
-				os.makedirs(upload_folder, exist_ok=True)
-				file_path = os.path.join(upload_folder, filename)
-				file.save(file_path)
-				
-				photo_url = f'/static/members/{filename}'
+				# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+				photo_url = enqueue_member_photo(file, 'candidates', photo_url)
 		
 		# 데이터베이스 업데이트
 		conn.execute('''
@@ -1702,18 +1347,8 @@ def admin_commander_new():
 		photo_url = '/static/images/default-pilot.jpg'  # 기본 이미지
 		file = request.files.get('photo')
 		if file and file.filename:
-			# 안전한 파일명 생성 (공백, 특수문자 제거)
-			safe_callsign = ''.join(c for c in callsign if c.isalnum() or c in ('-', '_'))
-			filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_commander_{safe_callsign}.jpg"  # 최종 파일은 항상 .jpg
-			filepath = os.path.join('static', 'members', filename)
-			os.makedirs(os.path.dirname(filepath), exist_ok=True)
-			file.save(filepath)
-			
-			# 이미지 최적화
-			if optimize_image(filepath):
-				photo_url = f'/static/members/{filename}'
-			else:
-				flash('이미지 처리 중 오류가 발생했습니다.', 'warning')
+			# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+			photo_url = enqueue_member_photo(file, 'commander_greeting', photo_url)
 		
 		conn = get_db()
 		conn.execute('''
@@ -1762,18 +1397,8 @@ def admin_commander_edit(commander_id):
 		# 파일 업로드 처리
 		file = request.files.get('photo')
 		if file and file.filename:
-			# 안전한 파일명 생성 (공백, 특수문자 제거)
-			safe_callsign = ''.join(c for c in callsign if c.isalnum() or c in ('-', '_'))
-			filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_commander_{safe_callsign}.jpg"  # 최종 파일은 항상 .jpg
-			filepath = os.path.join('static', 'members', filename)
-			os.makedirs(os.path.dirname(filepath), exist_ok=True)
-			file.save(filepath)
-			
-			# 이미지 최적화
-			if optimize_image(filepath):
-				photo_url = f'/static/members/{filename}'
-			else:
-				flash('이미지 처리 중 오류가 발생했습니다.', 'warning')
+			# 원본만 받아 두고 최적화는 백그라운드에서 (끝나면 행의 사진 URL 이 바뀜)
+			photo_url = enqueue_member_photo(file, 'commander_greeting', photo_url)
 		
 		conn.execute('''
 			UPDATE commander_greeting 
@@ -1940,18 +1565,9 @@ def admin_about_section_new():
 		if 'photo' in request.files:
 			file = request.files['photo']
 			if file and file.filename:
-				# 파일명 생성 (타임스탬프_섹션타입)
-				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-				safe_section = ''.join(c for c in section_type if c.isalnum() or c in ('-', '_'))
+				# 내용 해시 이름으로 저장 (같은 사진은 한 파일)
 				file_ext = os.path.splitext(file.filename)[1].lower()
-				filename = f"{timestamp}_section_{safe_section}{file_ext}"
-				
-				# 저장 경로
-				upload_folder = os.path.join(app.static_folder, 'Picture')
-				os.makedirs(upload_folder, exist_ok=True)
-				filepath = os.path.join(upload_folder, filename)
-				
-				file.save(filepath)
+				filename = store_upload(file, os.path.join(app.static_folder, 'Picture'), file_ext)
 				image_url = f'/static/Picture/{filename}'
 		
 		conn = get_db()
@@ -1992,18 +1608,9 @@ def admin_about_section_edit(section_id):
 		if 'photo' in request.files:
 			file = request.files['photo']
 			if file and file.filename:
-				# 파일명 생성 (타임스탬프_섹션타입)
-				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-				safe_section = ''.join(c for c in section_type if c.isalnum() or c in ('-', '_'))
+				# 내용 해시 이름으로 저장 (같은 사진은 한 파일)
 				file_ext = os.path.splitext(file.filename)[1].lower()
-				filename = f"{timestamp}_section_{safe_section}{file_ext}"
-				
-				# 저장 경로
-				upload_folder = os.path.join(app.static_folder, 'Picture')
-				os.makedirs(upload_folder, exist_ok=True)
-				filepath = os.path.join(upload_folder, filename)
-				
-				file.save(filepath)
+				filename = store_upload(file, os.path.join(app.static_folder, 'Picture'), file_ext)
 				image_url = f'/static/Picture/{filename}'
 		
 		conn.execute('''
@@ -2032,7 +1639,9 @@ def admin_about_section_edit(section_id):
 @login_required
 def admin_gallery():
 	conn = get_db()
-	photos = conn.execute('SELECT * FROM gallery ORDER BY order_num, upload_date DESC').fetchall()
+	photos = paginate_request(conn, 'SELECT * FROM gallery',
+		[('order_num', 'ASC'), ('upload_date', 'DESC'), ('id', 'DESC')],
+		page_size=app.config['LIST_PAGE_SIZE'])
 	conn.close()
 	return render_template('admin/gallery.html', photos=photos)
 
@@ -2058,6 +1667,7 @@ def admin_gallery_new():
 		''', (title, description, image_url, order_num, is_active))
 		conn.commit()
 		conn.close()
+		enqueue_gallery_variants(image_url)
 		
 		flash('사진이 추가되었습니다.', 'success')
 		return redirect(url_for('admin_gallery'))
@@ -2065,6 +1675,55 @@ def admin_gallery_new():
 	return render_template('admin/gallery_form.html')
 
 
+@app.route('/admin/gallery/upload', methods=['GET', 'POST'])
+@login_required
+def admin_gallery_upload():
+	"""여러 장(또는 zip)을 한 번에 올려 최적화하고 갤러리 행을 한 트랜잭션으로 추가"""
+	if request.method == 'POST':
+		# 사진 수백 장을 한 요청으로 받으므로 이 요청만 크기 한도를 늘린다 (본문은 임시 파일로 받음)
+		request.max_content_length = app.config['GALLERY_UPLOAD_MAX_BYTES']
+		title = request.form.get('title', '').strip()
+		description = request.form.get('description', '').strip()
+		is_active = 1 if request.form.get('is_active') else 0
+
+		started = time.perf_counter()
+		try:
+			received = image_pipeline.receive(request.files.getlist('photos'), app.config['GALLERY_BATCH_MAX_FILES'])
+		except (ValueError, zipfile.BadZipFile) as e:
+			flash(f'업로드 실패: {e}', 'error')
+			return redirect(url_for('admin_gallery_upload'))
+		if not received:
+			flash('이미지 파일(또는 zip)을 선택해 주세요.', 'error')
+			return redirect(url_for('admin_gallery_upload'))
+
+		results = image_pipeline.process_batch([path for _, path in received],
+			os.path.join(app.static_folder, 'gallery'), '/static/gallery')
+		photos = [(name, url) for (name, _), (url, _) in zip(received, results) if url]
+
+		def insert(conn):
+			# 기존 사진 뒤에 올린 순서대로 이어 붙인다
+			start = conn.execute('SELECT COALESCE(MAX(order_num), 0) + 1 FROM gallery').fetchone()[0]
+			conn.executemany('''
+				INSERT INTO gallery (title, description, image_url, order_num, is_active)
+				VALUES (?, ?, ?, ?, ?)
+			''', [(f'{title} {i + 1}' if title else os.path.splitext(name)[0], description, url, start + i, is_active)
+				for i, (name, url) in enumerate(photos)])
+		if photos:
+			db.write(insert)
+		elapsed = time.perf_counter() - started
+		for url in dict.fromkeys(url for _, url in photos):
+			enqueue_gallery_variants(url)
+
+		failed = len(received) - len(photos)
+		message = f'사진 {len(photos)}장을 추가했습니다 ({elapsed:.1f}초, {len(received) / elapsed:.1f}장/초).'
+		if failed:
+			message += f' 처리하지 못한 파일 {failed}개는 건너뛰었습니다.'
+		flash(message, 'success' if photos else 'error')
+		return redirect(url_for('admin_gallery'))
+
+	return render_template('admin/gallery_upload.html')
+
+
 @app.route('/admin/gallery/edit/<int:photo_id>', methods=['GET', 'POST'])
 @login_required
 def admin_gallery_edit(photo_id):
@@ -2088,6 +1747,7 @@ def admin_gallery_edit(photo_id):
 		''', (title, description, image_url, order_num, is_active, photo_id))
 		conn.commit()
 		conn.close()
+		enqueue_gallery_variants(image_url)
 		
 		flash('사진이 수정되었습니다.', 'success')
 		return redirect(url_for('admin_gallery'))
@@ -2148,13 +1808,10 @@ def admin_site_image_edit(image_id):
 		file = request.files.get('image')
 		
 		if file and file.filename:
-			# 파일 저장
-			filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-			filepath = os.path.join('static', 'images', filename)
-			os.makedirs(os.path.dirname(filepath), exist_ok=True)
-			file.save(filepath)
-			
-			image_path = f'/static/images/{filename}'
+			# 최적화 작업으로 넘기고 처리 중에는 자리표시 URL, 끝나면 최적화한 사진(실패하면 이전 사진)으로 바뀐다
+			current = conn.execute('SELECT image_path FROM site_images WHERE id = ?', (image_id,)).fetchone()
+			image_path = image_pipeline.submit(file, 'site_images', 'image_path', os.path.join(app.static_folder, 'images'),
+				'/static/images', current['image_path'] if current else None)
 			
 			# 데이터베이스 업데이트
 			conn.execute('''
@@ -2163,6 +1820,8 @@ def admin_site_image_edit(image_id):
 				WHERE id = ?
 			''', (image_path, image_id))
 			conn.commit()
+			# 이 워커의 이미지 테이블은 바로 갱신 (다른 워커는 버전 변경으로 갱신)
+			site_images.refresh(conn)
 			
 			flash('이미지가 업데이트되었습니다.', 'success')
 		else:
@@ -2195,17 +1854,55 @@ def chat_start():
 	user_name = request.json.get('name', '방문자')
 	user_email = request.json.get('email', '')
 	
-	conn = get_db()
-	conn.execute('''
+	db.write(lambda conn: conn.execute('''
 		INSERT INTO chat_sessions (session_id, user_name, user_email, status)
 		VALUES (?, ?, ?, 'active')
-	''', (session_id, user_name, user_email))
-	conn.commit()
-	conn.close()
+	''', (session_id, user_name, user_email)))
 	
 	return {'success': True, 'session_id': session_id}
 
 
+def chat_message_dict(conn, message_id):
+	"""채팅 메시지 한 건을 API 응답 형태로"""
+	m = conn.execute('''
+		SELECT id, sender_type, sender_name, message, created_at
+		FROM chat_messages WHERE id = ?
+	''', (message_id,)).fetchone()
+	return {
+		'id': m['id'],
+		'sender_type': m['sender_type'],
+		'sender_name': m['sender_name'],
+		'message': m['message'],
+		'created_at': m['created_at']
+	}
+
+
+def add_chat_message(conn, session_id, sender_type, sender_name, message, is_read=0):
+	"""메시지를 저장하고 같은 트랜잭션에서 세션 요약(메시지 수, 마지막 메시지, 읽지 않은 수)을 갱신
+
+	(저장된 메시지, 관리자가 읽지 않은 사용자 메시지 수) 를 돌려준다.
+	"""
+	cursor = conn.execute('''
+		INSERT INTO chat_messages (session_id, sender_type, sender_name, message, is_read)
+		VALUES (?, ?, ?, ?, ?)
+	''', (session_id, sender_type, sender_name, message, is_read))
+	saved = chat_message_dict(conn, cursor.lastrowid)
+	unread_delta = 1 if sender_type == 'user' and not is_read else 0
+	
+	# 세션 요약과 업데이트 시간 갱신
+	conn.execute('''
+		UPDATE chat_sessions SET
+			message_count = message_count + 1,
+			unread_user_count = unread_user_count + ?,
+			last_message = ?,
+			last_message_at = ?,
+			updated_at = CURRENT_TIMESTAMP
+		WHERE session_id = ?
+	''', (unread_delta, message, saved['created_at'], session_id))
+	unread_count = conn.execute('SELECT unread_user_count FROM chat_sessions WHERE session_id = ?', (session_id,)).fetchone()
+	return saved, unread_count[0] if unread_count else 0
+
+
 # 사용자: 메시지 전송
 @app.route('/chat/send', methods=['POST'])
 def chat_send():
@@ -2219,76 +1916,111 @@ def chat_send():
 	if not session_id or not message:
 		return {'success': False, 'error': '세션 ID와 메시지가 필요합니다.'}, 400
 	
-	conn = get_db()
-	cursor = conn.cursor()
+	def save_message(conn):
+		# 세션이 없다면 자동으로 생성 (로컬스토리지에 남아있던 오래된 세션 ID 대비)
+		session_info = conn.execute('SELECT * FROM chat_sessions WHERE session_id = ?', (session_id,)).fetchone()
+		if not session_info:
+			conn.execute('''
+				INSERT INTO chat_sessions (session_id, user_name, user_email, status)
+				VALUES (?, ?, ?, 'active')
+			''', (session_id, sender_name or '방문자', ''))
+		
+		# 메시지 저장 (세션 요약과 업데이트 시간도 함께 갱신)
+		return add_chat_message(conn, session_id, sender_type, sender_name, message)
 	
-	# 세션이 없다면 자동으로 생성 (로컬스토리지에 남아있던 오래된 세션 ID 대비)
-	session_info = cursor.execute('SELECT * FROM chat_sessions WHERE session_id = ?', (session_id,)).fetchone()
-	if not session_info:
-		cursor.execute('''
-			INSERT INTO chat_sessions (session_id, user_name, user_email, status)
-			VALUES (?, ?, ?, 'active')
-		''', (session_id, sender_name or '방문자', ''))
-	
-	# 메시지 저장
-	cursor.execute('''
-		INSERT INTO chat_messages (session_id, sender_type, sender_name, message)
-		VALUES (?, ?, ?, ?)
-	''', (session_id, sender_type, sender_name, message))
-	
-	# 세션 업데이트 시간 갱신
-	cursor.execute('''
-		UPDATE chat_sessions SET updated_at = CURRENT_TIMESTAMP WHERE session_id = ?
-	''', (session_id,))
+	saved, unread_count = db.write(save_message)
 	
-	conn.commit()
-	conn.close()
+	# 세션 방(위젯/관리자 상세 화면)과 관리자 목록에 바로 알림
+	chat_events.message(session_id, saved)
+	if sender_type == 'user':
+		chat_events.unread(session_id, unread_count, message)
 	
 	return {'success': True}
 
 
+def chat_session_head(conn, session_id):
+	"""세션 상태와 마지막 메시지 id (인덱스만으로 조회)"""
+	head = conn.execute('''
+		SELECT
+			(SELECT status FROM chat_sessions WHERE session_id = ?) AS status,
+			(SELECT id FROM chat_messages WHERE session_id = ?
+			 ORDER BY created_at DESC, id DESC LIMIT 1) AS last_id
+	''', (session_id, session_id)).fetchone()
+	return head['status'] or 'active', head['last_id'] or 0
+
+
 # 사용자: 메시지 가져오기
 @app.route('/api/chat/messages/<session_id>')
 def chat_messages(session_id):
-	"""채팅 메시지 목록 가져오기"""
-	conn = get_db()
-	
-	# 세션 상태 확인
-	session_info = conn.execute('''
-		SELECT status FROM chat_sessions WHERE session_id = ?
-	''', (session_id,)).fetchone()
-	
-	session_status = session_info['status'] if session_info else 'active'
-	
-	messages = conn.execute('''
-		SELECT id, sender_type, sender_name, message, created_at
-		FROM chat_messages
-		WHERE session_id = ?
-		ORDER BY created_at ASC
-	''', (session_id,)).fetchall()
-	
-	# 사용자가 읽은 메시지는 읽음 처리
-	if 'logged_in' not in session:  # 관리자가 아닌 경우
-		conn.execute('''
-			UPDATE chat_messages 
-			SET is_read = 1 
-			WHERE session_id = ? AND sender_type = 'admin' AND is_read = 0
-		''', (session_id,))
-		conn.commit()
-	
-	conn.close()
+	"""채팅 메시지 목록 가져오기
+
+	since=<마지막으로 받은 메시지 id> 를 주면 그 이후 메시지만 돌려준다.
+	응답 ETag 는 (마지막 메시지 id, 세션 상태) 이므로 변화가 없는 폴링은 304 로 끝난다.
+	wait=<초> 를 함께 주면(롱폴링) 새 메시지나 세션 종료가 있을 때까지 최대 그 시간만큼 기다린다.
+	"""
+	since = request.args.get('since', type=int)
+	wait = min(request.args.get('wait', 0, type=float), app.config['CHAT_LONG_POLL_TIMEOUT'])
+	
+	if since is not None and wait > 0:
+		# 알림 등록 → 확인 → 대기 순서라 확인 직후 도착한 메시지도 놓치지 않는다
+		with chat_events.signals.listen(session_id) as wait_for_message:
+			session_status, last_id = chat_session_head(get_db(), session_id)
+			if last_id <= since and session_status != 'closed':
+				# 기다리는 동안 연결을 붙잡지 않도록 풀에 반납
+				db.release()
+				wait_for_message(wait)
+				session_status, last_id = chat_session_head(get_db(), session_id)
+	else:
+		session_status, last_id = chat_session_head(get_db(), session_id)
 	
-	return {
-		'success': True,
-		'session_status': session_status,
-		'messages': [{
-			'id': m['id'],
-			'sender_type': m['sender_type'],
-			'sender_name': m['sender_name'],
-			'message': m['message'],
-			'created_at': m['created_at']
-		} for m in messages]
-	}
+	conn = get_db()
+	etag = f'{last_id}-{session_status}'
+	if request.if_none_match.contains(etag):
+		response = app.response_class(status=304)
+	else:
+		if since is not None:
+			messages = conn.execute('''
+				SELECT id, sender_type, sender_name, message, is_read, created_at
+				FROM chat_messages
+				WHERE session_id = ? AND id > ?
+				ORDER BY created_at ASC, id ASC
+			''', (session_id, since)).fetchall()
+		else:
+			messages = conn.execute('''
+				SELECT id, sender_type, sender_name, message, is_read, created_at
+				FROM chat_messages
+				WHERE session_id = ?
+				ORDER BY created_at ASC, id ASC
+			''', (session_id,)).fetchall()
+		
+		# 사용자가 읽은 메시지는 읽음 처리 (새로 받은 관리자 메시지가 있을 때만 쓰기)
+		if 'logged_in' not in session:  # 관리자가 아닌 경우
+			unread_upto = max((m['id'] for m in messages if m['sender_type'] == 'admin' and not m['is_read']), default=None)
+			if unread_upto is not None:
+				db.write(lambda conn: conn.execute('''
+					UPDATE chat_messages 
+					SET is_read = 1 
+					WHERE session_id = ? AND sender_type = 'admin' AND is_read = 0 AND id <= ?
+				''', (session_id, unread_upto)))
+		
+		response = make_response({
+			'success': True,
+			'session_status': session_status,
+			'last_id': max([last_id] + [m['id'] for m in messages]),
+			'messages': [{
+				'id': m['id'],
+				'sender_type': m['sender_type'],
+				'sender_name': m['sender_name'],
+				'message': m['message'],
+				'created_at': m['created_at']
+			} for m in messages]
+		})
+	
+	# 브라우저가 매번 If-None-Match 로 재검증하도록
+	response.set_etag(etag)
+	response.cache_control.no_cache = True
+	response.cache_control.private = True
+	return response
 
 
 # 사용자: 채팅 세션 종료
@@ -2301,29 +2033,27 @@ def chat_close():
 	if not session_id:
 		return {'success': False, 'error': '세션 ID가 필요합니다.'}, 400
 	
-	conn = get_db()
-	cursor = conn.cursor()
-	
-	# 세션 존재 여부 확인
-	session_info = cursor.execute('SELECT * FROM chat_sessions WHERE session_id = ?', (session_id,)).fetchone()
-	if not session_info:
-		# 세션이 없는데 종료를 요청한 경우(오래된 세션 ID 등) - 세션을 생성 후 바로 종료 상태로 기록
-		cursor.execute('''
-			INSERT INTO chat_sessions (session_id, user_name, user_email, status)
-			VALUES (?, ?, ?, 'closed')
-		''', (session_id, '방문자', ''))
-	else:
-		# 세션 상태를 closed 로 변경
-		cursor.execute('UPDATE chat_sessions SET status = "closed", updated_at = CURRENT_TIMESTAMP WHERE session_id = ?', (session_id,))
+	def close_session(conn):
+		# 세션 존재 여부 확인
+		session_info = conn.execute('SELECT * FROM chat_sessions WHERE session_id = ?', (session_id,)).fetchone()
+		if not session_info:
+			# 세션이 없는데 종료를 요청한 경우(오래된 세션 ID 등) - 세션을 생성 후 바로 종료 상태로 기록
+			conn.execute('''
+				INSERT INTO chat_sessions (session_id, user_name, user_email, status)
+				VALUES (?, ?, ?, 'closed')
+			''', (session_id, '방문자', ''))
+		else:
+			# 세션 상태를 closed 로 변경
+			conn.execute("UPDATE chat_sessions SET status = 'closed' WHERE session_id = ?", (session_id,))
+		
+		# 시스템 메시지(선택) - 관리자 화면에서도 종료 시점을 확인할 수 있도록
+		saved, _ = add_chat_message(conn, session_id, 'admin', '시스템', '사용자가 채팅을 종료했습니다.', is_read=1)
+		return saved
 	
-	# 시스템 메시지(선택) - 관리자 화면에서도 종료 시점을 확인할 수 있도록
-	cursor.execute('''
-		INSERT INTO chat_messages (session_id, sender_type, sender_name, message, is_read)
-		VALUES (?, 'admin', '시스템', ?, 1)
-	''', (session_id, '사용자가 채팅을 종료했습니다.'))
+	notice = db.write(close_session)
 	
-	conn.commit()
-	conn.close()
+	chat_events.message(session_id, notice)
+	chat_events.session_closed(session_id)
 	
 	return {'success': True}
 
@@ -2340,30 +2070,24 @@ def admin_chat_send():
 	if not session_id or not message:
 		return {'success': False, 'error': '세션 ID와 메시지가 필요합니다.'}, 400
 	
-	conn = get_db()
-	
-	# 세션 확인
-	session_info = conn.execute('''
-		SELECT * FROM chat_sessions WHERE session_id = ?
-	''', (session_id,)).fetchone()
+	def save_message(conn):
+		# 세션 확인
+		session_info = conn.execute('''
+			SELECT * FROM chat_sessions WHERE session_id = ?
+		''', (session_id,)).fetchone()
+		
+		if not session_info:
+			return None
+		
+		# 메시지 저장 (세션 요약과 업데이트 시간도 함께 갱신)
+		saved, _ = add_chat_message(conn, session_id, 'admin', '관리자', message)
+		return saved
 	
-	if not session_info:
-		conn.close()
+	saved = db.write(save_message)
+	if not saved:
 		return {'success': False, 'error': '세션을 찾을 수 없습니다.'}, 404
 	
-	# 메시지 저장
-	conn.execute('''
-		INSERT INTO chat_messages (session_id, sender_type, sender_name, message, is_read)
-		VALUES (?, 'admin', '관리자', ?, 0)
-	''', (session_id, message))
-	
-	# 세션 업데이트 시간 갱신
-	conn.execute('''
-		UPDATE chat_sessions SET updated_at = CURRENT_TIMESTAMP WHERE session_id = ?
-	''', (session_id,))
-	
-	conn.commit()
-	conn.close()
+	chat_events.message(session_id, saved)
 	
 	return {'success': True}
 
@@ -2372,22 +2096,11 @@ def admin_chat_send():
 @app.route('/admin/chats')
 @login_required
 def admin_chats():
-	"""관리자 채팅 관리 페이지"""
+	"""관리자 채팅 관리 페이지 (최근 대화 순, ?after= / ?before= 커서로 페이지 이동)"""
 	conn = get_db()
-	
-	# 모든 채팅 세션 가져오기
-	sessions = conn.execute('''
-		SELECT 
-			cs.*,
-			(SELECT COUNT(*) FROM chat_messages 
-			 WHERE session_id = cs.session_id AND sender_type = 'user' AND is_read = 0) as unread_count,
-			(SELECT message FROM chat_messages 
-			 WHERE session_id = cs.session_id 
-			 ORDER BY created_at DESC LIMIT 1) as last_message
-		FROM chat_sessions cs
-		ORDER BY cs.updated_at DESC
-	''').fetchall()
-	
+	# 세션 요약 컬럼을 바로 읽고, (updated_at, id) 키셋으로 한 페이지만 가져온다
+	sessions = paginate_request(conn, 'SELECT cs.*, cs.unread_user_count AS unread_count FROM chat_sessions cs',
+		[('cs.updated_at', 'DESC'), ('cs.id', 'DESC')], page_size=app.config['ADMIN_CHATS_PAGE_SIZE'])
 	conn.close()
 	return render_template('admin/chats.html', sessions=sessions)
 
@@ -2415,15 +2128,25 @@ def admin_chat_detail(session_id):
 		ORDER BY created_at ASC
 	''', (session_id,)).fetchall()
 	
-	# 관리자가 읽은 것으로 표시
-	conn.execute('''
-		UPDATE chat_messages 
-		SET is_read = 1 
-		WHERE session_id = ? AND sender_type = 'user' AND is_read = 0
-	''', (session_id,))
-	conn.commit()
-	
 	conn.close()
+	
+	# 관리자가 읽은 것으로 표시 (화면에 보여준 메시지까지만, 세션의 읽지 않은 수도 같은 트랜잭션에서 차감)
+	if messages and session_info['unread_user_count']:
+		shown_upto = messages[-1]['id']
+		
+		def mark_read(conn):
+			marked = conn.execute('''
+				UPDATE chat_messages 
+				SET is_read = 1 
+				WHERE session_id = ? AND sender_type = 'user' AND is_read = 0 AND id <= ?
+			''', (session_id, shown_upto)).rowcount
+			conn.execute('''
+				UPDATE chat_sessions SET unread_user_count = MAX(unread_user_count - ?, 0) WHERE session_id = ?
+			''', (marked, session_id))
+		
+		db.write(mark_read)
+	# 다른 관리자 화면의 읽지 않음 배지도 갱신
+	chat_events.unread(session_id, 0)
 	return render_template('admin/chat_detail.html', session=session_info, messages=messages)
 
 
@@ -2438,11 +2161,56 @@ def admin_chat_close(session_id):
 	''', (session_id,))
 	conn.commit()
 	conn.close()
+	chat_events.session_closed(session_id)
 	
 	flash('채팅 세션이 종료되었습니다.', 'success')
 	return redirect(url_for('admin_chats'))
 
 
+# 관리자: DB 연결 풀 통계 (풀 크기 조정용)
+@app.route('/admin/api/db-stats')
+@login_required
+def admin_db_stats():
+	"""워커별 연결 풀 통계"""
+	return {'success': True, **db.stats()}
+
+
+# 관리자: 공개 페이지 캐시 적중률
+@app.route('/admin/api/cache-stats')
+@login_required
+def admin_cache_stats():
+	"""워커별 라우트 캐시 적중/미스 통계"""
+	return {'success': True, 'page_cache': page_cache.stats(), 'site_images': site_images.stats(),
+		'image_variants': image_variants.stats(), 'compression': compression.stats()}
+
+
+# 관리자: 채팅 푸시 상태
+@app.route('/admin/api/chat-stats')
+@login_required
+def admin_chat_stats():
+	"""워커별 채팅 푸시 활성 여부와 발행 이벤트 수"""
+	return {'success': True, 'chat_push': chat_events.stats()}
+
+
+# 관리자: 업로드 사진 처리 상태 (관리자 폼이 자리표시 이미지를 최종 사진으로 바꿀 때 폴링)
+@app.route('/admin/api/image-jobs/<job_id>')
+@login_required
+def admin_image_job_status(job_id):
+	"""처리 작업 상태 - status 는 queued / done / failed, url 은 처리 후 행에 들어간 사진"""
+	job = image_pipeline.status(get_db(), job_id)
+	if job is None:
+		return {'success': False, 'error': 'not found'}, 404
+	return {'success': True, **job}
+
+
+# 관리자: 업로드 사진 처리 통계
+@app.route('/admin/api/image-stats')
+@login_required
+def admin_image_stats():
+	"""워커별 처리 작업 수와 처리 시간 합계"""
+	return {'success': True, 'images': image_pipeline.stats()}
+
+
 # 에러 핸들러 추가 (디버깅용)
 @app.errorhandler(500)
 def internal_error(error):
@@ -2452,17 +2220,190 @@ def internal_error(error):
 	return f"Internal Server Error: {str(error)}<br><br>Check Render logs for details.", 500
 
 
+# 스키마 마이그레이션 CLI: 워커를 띄우기 전에 한 번 실행
+#   flask --app app migrate
+@app.cli.command('migrate')
+@click.option('--status', is_flag=True, help='적용하지 않고 현재 버전만 출력')
+def migrate_command(status):
+	"""데이터베이스 스키마를 최신 버전으로 마이그레이션"""
+	conn = sqlite3.connect(DATABASE, timeout=30)
+	try:
+		version = migrations.current_version(conn)
+	finally:
+		conn.close()
+	click.echo(f'{DATABASE}: 스키마 버전 {version} / 최신 {migrations.latest_version()}')
+	if status:
+		return
+	applied = init_db()
+	for number, description in applied:
+		click.echo(f'  적용: {number} - {description}')
+	if not applied:
+		click.echo('  이미 최신입니다.')
+
+
+# 업로드 사진 처리 작업 확인/재처리 (워커가 처리 도중 종료된 경우)
+#   flask --app app image-jobs [--retry]
+@app.cli.command('image-jobs')
+@click.option('--retry', is_flag=True, help='끝나지 않은 작업을 지금 다시 처리')
+def image_jobs_command(retry):
+	"""업로드 사진 처리 작업 상태별 개수 출력"""
+	with app.app_context():
+		conn = get_db()
+		for row in conn.execute('SELECT status, COUNT(*) AS count FROM image_jobs GROUP BY status'):
+			click.echo(f"  {row['status']}: {row['count']}")
+		if retry:
+			done, failed = image_pipeline.retry(conn)
+			click.echo(f'  재처리: 성공 {done}, 실패 {failed}')
+
+
+def variant_sources(conn, folders=()):
+	"""반응형 변형을 만들 이미지 URL 목록 - DB 의 사진 컬럼 + 정적 폴더(static 기준 상대 경로)의 이미지"""
+	queries = [f'SELECT {column} AS url FROM {table}' for table, column in
+		(('pilots', 'photo_url'), ('maintenance_crew', 'photo_url'), ('candidates', 'photo_url'),
+		('commander_greeting', 'photo_url'), ('gallery', 'image_url'), ('about_sections', 'image_url'))]
+	urls = [row['url'] for row in conn.execute(' UNION '.join(queries)) if row['url']]
+	for folder in folders:
+		directory = os.path.join(app.static_folder, folder)
+		for name in sorted(os.listdir(directory)):
+			# 이미 만든 변형(<이름>-<너비>w.<형식>)은 원본으로 보지 않는다
+			if name.lower().endswith(('.jpg', '.jpeg', '.png')) and not VARIANT_NAME.search(name):
+				urls.append(f"/static/{folder.strip('/')}/{name}")
+	return urls
+
+
+# 이미 올라가 있는 사진의 반응형 변형 생성 (변형이 없는 이미지만, --force 면 전부 다시)
+#   flask --app app image-variants [--force] [images "low show" ...]
+# 폴더를 주면 소개 페이지 기동 사진처럼 템플릿에 경로가 적힌 정적 이미지도 처리한다
+@app.cli.command('image-variants')
+@click.option('--force', is_flag=True, help='이미 변형이 있는 이미지도 다시 생성')
+@click.argument('folders', nargs=-1)
+def image_variants_command(force, folders):
+	"""멤버 사진·지휘관 사진·갤러리·소개 섹션 이미지(와 지정한 정적 폴더)의 변형 생성"""
+	with app.app_context():
+		conn = get_db()
+		sources = variant_sources(conn, folders)
+		made, skipped = image_pipeline.backfill_variants(conn, app.static_folder, sources, force=force)
+		click.echo(f'  변형 생성: {made}개 이미지, 건너뜀 {skipped}개')
+
+
+
+# 정적 텍스트 파일(CSS/JS/SVG ...)의 .gz/.br 미리 만들기 (배포할 때마다, 바뀐 파일만 다시 압축)
+#   flask --app app compress-static
+@app.cli.command('compress-static')
+def compress_static_command():
+	"""static 폴더 텍스트 파일의 압축본 생성"""
+	stats = build_compressed(app.static_folder)
+	click.echo(f"  텍스트 파일 {stats['files']}개, {stats['bytes'] / 1024:.0f} KB (새로 쓴 압축 파일 {stats['written']}개)")
+	for encoding, size in stats['compressed'].items():
+		click.echo(f"  {encoding}: {size / 1024:.0f} KB")
+
+# 정적 이미지 일괄 최적화 기본 대상 폴더 (static 기준)
+BACKFILL_FOLDERS = ('images', 'members', 'Picture')
+
+
+def folder_bytes(folders):
+	"""static 아래 폴더들의 파일 크기 합계"""
+	total = 0
+	for folder in folders:
+		directory = os.path.join(app.static_folder, folder)
+		total += sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+	return total
+
+
+def source_references():
+	"""템플릿·정적 CSS/JS·파이썬 소스의 내용 (파일 경로가 직접 적힌 곳이 있는지 찾을 때 사용)"""
+	texts = []
+	for folder, extensions in ((app.template_folder, ('.html',)), (app.static_folder, ('.css', '.js')), (app.root_path, ('.py',))):
+		folder = os.path.join(app.root_path, folder)
+		for name in os.listdir(folder):
+			if name.endswith(extensions):
+				with open(os.path.join(folder, name), encoding='utf-8', errors='ignore') as f:
+					texts.append(f.read())
+	return '\n'.join(texts)
+
+
+# 이미 올라가 있는 큰 정적 이미지를 최적화하고 DB 참조를 새 파일로 바꾼다 (중단해도 다시 실행하면 이어서 처리)
+#   flask --app app image-backfill [--dry-run] [--prune] [--min-kb 100] [--max-size 1920] [images members Picture]
+# 투명 배경 이미지와 충분히 줄지 않는 이미지는 원본을 그대로 둔다
+@app.cli.command('image-backfill')
+@click.option('--dry-run', is_flag=True, help='처리하지 않고 대상 파일만 출력')
+@click.option('--min-kb', default=100, show_default=True, help='이보다 작은 파일은 건너뜀')
+@click.option('--max-size', default=1920, show_default=True, help='결과 이미지의 최대 가로/세로(px)')
+@click.option('--workers', default=0, help='동시에 처리할 프로세스 수 (0 이면 IMAGE_BATCH_WORKERS)')
+@click.option('--prune', is_flag=True, help='DB·템플릿·소스 어디에서도 참조하지 않게 된 원본 삭제')
+@click.argument('folders', nargs=-1)
+def image_backfill_command(dry_run, min_kb, max_size, workers, prune, folders):
+	"""static/images·members·Picture(또는 지정한 폴더)의 큰 이미지 최적화와 바이트 보고"""
+	folders = folders or BACKFILL_FOLDERS
+	with app.app_context():
+		conn = get_db()
+		candidates = image_pipeline.static_candidates(conn, app.static_folder, folders, min_kb * 1024)
+		click.echo(f'  대상: {len(candidates)}개, {sum(size for _, _, size in candidates) / 1024:.0f} KB')
+		if dry_run:
+			for url, _, size in candidates:
+				click.echo(f'    {size / 1024:>8.0f} KB  {url}')
+			return
+
+		disk_before = folder_bytes(folders)
+		counts = {'done': 0, 'kept': 0, 'failed': 0}
+		saved = [0, 0]
+
+		def report(url, result, error):
+			status = result['status'] if result else 'failed'
+			counts[status] += 1
+			if status == 'done':
+				saved[0] += result['bytes_before']
+				saved[1] += result['bytes_after']
+				click.echo(f"    {result['bytes_before'] / 1024:>8.0f} KB → {result['bytes_after'] / 1024:>6.0f} KB  {url}")
+			else:
+				click.echo(f"    {'원본 유지' if result else '실패'} ({result['reason'] if result else error})  {url}")
+
+		if workers:
+			image_pipeline.batch_workers = workers
+		image_pipeline.backfill_static(candidates, max_size, on_result=report)
+
+		pruned = 0
+		if prune:
+			texts = source_references()
+			referenced = set()
+			for table, column in sorted(IMAGE_COLUMNS):
+				referenced.update(row[0] for row in conn.execute(f'SELECT {column} FROM {table}'))
+			for row in conn.execute("SELECT source_url FROM static_backfill WHERE status = 'done'"):
+				url = row['source_url']
+				path = static_path(app.static_folder, url)
+				if url in referenced or url[len('/static/'):] in texts or not path or not os.path.exists(path):
+					continue
+				os.remove(path)
+				pruned += 1
+
+		disk_after = folder_bytes(folders)
+		total = conn.execute("""
+			SELECT COUNT(*), COALESCE(SUM(bytes_before), 0), COALESCE(SUM(bytes_after), 0)
+			FROM static_backfill WHERE status = 'done'
+		""").fetchone()
+		click.echo(f"  최적화 {counts['done']}개, 원본 유지 {counts['kept']}개, 실패 {counts['failed']}개, 삭제한 원본 {pruned}개")
+		if saved[0]:
+			click.echo(f'  이번 실행 참조 이미지: {saved[0] / 1024:.0f} KB → {saved[1] / 1024:.0f} KB ({(saved[1] - saved[0]) / saved[0]:+.0%})')
+		if total[1]:
+			click.echo(f'  지금까지 참조 이미지 {total[0]}개: {total[1] / 1024:.0f} KB → {total[2] / 1024:.0f} KB ({(total[2] - total[1]) / total[1]:+.0%})')
+		click.echo(f"  {', '.join(folders)} 폴더: {disk_before / 1024:.0f} KB → {disk_after / 1024:.0f} KB")
+
 """
 애플리케이션 초기화
-WSGI (gunicorn 등) 로 임포트되는 경우에도 DB 스키마가 보장되도록
-모듈 임포트 시점에 한 번 init_db() 를 호출한다.
-CREATE TABLE IF NOT EXISTS / INSERT OR IGNORE 를 사용하므로
-여러 번 호출되어도 안전하다.
+워커 시작 시에는 schema_version 을 한 번 확인만 한다. 스키마가 뒤처져 있으면
+AUTO_MIGRATE 설정에 따라 마이그레이션을 적용하거나(여러 워커가 동시에 시도해도
+BEGIN IMMEDIATE 로 한 번만 적용됨) 오류를 기록한다.
 """
 with app.app_context():
 	try:
-		init_db()
-		app.logger.info("Database initialized successfully")
+		schema_version = migrations.current_version(get_db())
+		if schema_version < migrations.latest_version():
+			if app.config['AUTO_MIGRATE']:
+				for number, description in init_db():
+					app.logger.info(f"Applied migration {number}: {description}")
+			else:
+				app.logger.error(f"Database schema is at version {schema_version}, expected {migrations.latest_version()}. "
+					"Run 'flask --app app migrate' before starting workers.")
 	except Exception as e:
 		app.logger.error(f"Failed to initialize database: {str(e)}")
 		import traceback
@@ -2475,6 +2416,6 @@ if __name__ == '__main__':
 	port = int(os.environ.get('PORT', 5001))
 	# Run the dev server without the auto-reloader (single process) to avoid issues
 	# when starting the app detached in this environment.
-	app.run(host=host, port=port, debug=False, use_reloader=False)
+	chat_events.run(app, host=host, port=port, debug=False, use_reloader=False)
 
 
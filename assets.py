@@ -0,0 +1,103 @@
+"""
+정적 파일 지문(fingerprint)과 장기 캐시
+url_for('static', filename=...) 가 만드는 URL 에 파일 내용 해시(?v=<해시>)를 붙이고,
+해시가 현재 파일과 맞는 요청과 내용 해시로 이름 붙인 업로드 파일(<해시>.jpg, <해시>-640w.webp)은
+Cache-Control: public, max-age=1년, immutable 로 응답한다. 파일이 바뀌면 해시(URL)가 바뀌므로
+브라우저는 페이지를 볼 때마다 304 재검증을 보내지 않고, 바뀐 파일만 새로 받는다.
+
+템플릿에서는 asset_url('style.css') 또는 asset_url('/static/images/hero.jpg') 로 사용한다.
+외부 URL 이나 쿼리가 붙은 URL(처리 중 자리표시 등)은 그대로 돌려준다.
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+from flask import request, url_for
+
+# 내용 해시로 이름 붙인 파일: <해시>.<확장자> 또는 반응형 변형 <해시>-<너비>w.<확장자>
+CONTENT_ADDRESSED = re.compile(r'^[0-9a-f]{20}(-\d+w)?\.\w+$')
+HASH_LENGTH = 20
+
+
+def file_hash(path, length=HASH_LENGTH):
+	"""파일 내용의 SHA-256 앞부분 (16진수)"""
+	with open(path, 'rb') as f:
+		return hashlib.file_digest(f, 'sha256').hexdigest()[:length]
+
+
+def is_content_addressed(filename):
+	return bool(CONTENT_ADDRESSED.match(os.path.basename(filename)))
+
+
+class AssetManifest:
+	"""정적 파일별 내용 해시 (프로세스 단위, 파일 수정 시각·크기가 바뀌면 다시 계산)"""
+
+	def __init__(self, app=None):
+		self.app = None
+		self.max_age = 365 * 24 * 3600
+		self._hashes = {}
+		self._lock = threading.Lock()
+		self.immutable_responses = 0
+		if app is not None:
+			self.init_app(app)
+
+	def init_app(self, app):
+		self.app = app
+		self.max_age = app.config.get('ASSET_MAX_AGE', self.max_age)
+		app.url_defaults(self._url_defaults)
+		app.after_request(self._cache_headers)
+		app.add_template_global(self.url, 'asset_url')
+		app.extensions['assets'] = self
+
+	def version(self, filename):
+		"""static 폴더 기준 filename 의 내용 해시 (없는 파일이면 None)"""
+		path = os.path.join(self.app.static_folder, filename)
+		try:
+			stat = os.stat(path)
+		except OSError:
+			return None
+		key = (stat.st_mtime_ns, stat.st_size)
+		cached = self._hashes.get(path)
+		if cached and cached[0] == key:
+			return cached[1]
+		digest = file_hash(path, 12)
+		with self._lock:
+			self._hashes[path] = (key, digest)
+		return digest
+
+	def url(self, path):
+		"""'style.css' 나 '/static/...' 를 지문 붙은 URL 로 (그 밖의 URL 은 그대로)"""
+		if not path:
+			return path
+		if path.startswith('/static/'):
+			path = path[len('/static/'):]
+		elif path.startswith(('/', 'http:', 'https:', 'data:')):
+			return path
+		if '?' in path:
+			return '/static/' + path
+		return url_for('static', filename=path)
+
+	def _url_defaults(self, endpoint, values):
+		if endpoint != 'static' or 'v' in values or is_content_addressed(values.get('filename', '')):
+			return
+		version = self.version(values['filename'])
+		if version:
+			values['v'] = version
+
+	def _cache_headers(self, response):
+		if request.endpoint != 'static' or response.status_code not in (200, 304):
+			return response
+		filename = (request.view_args or {}).get('filename', '')
+		requested = request.args.get('v')
+		if is_content_addressed(filename) or (requested and requested == self.version(filename)):
+			response.cache_control.no_cache = None
+			response.cache_control.public = True
+			response.cache_control.max_age = self.max_age
+			response.cache_control.immutable = True
+			self.immutable_responses += 1
+		return response
+
+	def stats(self):
+		return {'hashed_files': len(self._hashes), 'immutable_responses': self.immutable_responses}
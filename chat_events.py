@@ -0,0 +1,151 @@
+"""
+실시간 채팅 푸시 (Flask-SocketIO)
+채팅 위젯과 관리자 화면이 주기적으로 폴링하는 대신 Socket.IO 로 연결해 두고,
+메시지가 저장되면 서버가 해당 세션 방(room)으로 바로 보낸다.
+
+- 방문자 위젯: join 이벤트로 자신의 세션 방(chat:<session_id>)에 들어간다
+- 관리자 화면: 로그인 세션이면 연결 시 admins 방에 들어가 읽지 않은 메시지 수 변경을 받는다
+- CHAT_PUSH=false 이거나 소켓 연결이 안 되는 환경에서는 위젯이 롱폴링(또는 3초 폴링)으로 동작한다
+- 워커가 여러 개면 SOCKETIO_MESSAGE_QUEUE(예: redis://) 로 워커 간 이벤트를 전달한다
+
+롱폴링 요청은 SessionSignals 로 같은 프로세스 안에서 새 메시지 알림을 기다린다.
+다른 워커에서 저장된 메시지는 알림을 받지 못하고 대기 시간이 끝난 뒤 다음 요청에서 받는다.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from flask import session
+from flask_socketio import SocketIO, join_room, leave_room
+
+ADMIN_ROOM = 'admins'
+
+
+def session_room(session_id):
+	return f'chat:{session_id}'
+
+
+class SessionSignals:
+	"""세션별 새 메시지 알림 (프로세스 내부)
+
+	listen() 으로 먼저 등록한 뒤 DB 를 확인하고 wait() 하면, 확인과 대기 사이에 도착한
+	알림도 놓치지 않는다. 대기자가 없는 세션은 메모리에 남기지 않는다.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._entries = {}  # session_id -> [Condition, version, 대기자 수]
+		self.waiting = 0
+
+	@contextmanager
+	def listen(self, session_id):
+		with self._lock:
+			entry = self._entries.get(session_id)
+			if entry is None:
+				entry = self._entries[session_id] = [threading.Condition(), 0, 0]
+			entry[2] += 1
+			self.waiting += 1
+			seen = entry[1]
+
+		def wait(timeout):
+			"""알림이 오면 True, 시간이 다 되면 False"""
+			condition = entry[0]
+			with condition:
+				return condition.wait_for(lambda: entry[1] != seen, timeout)
+
+		try:
+			yield wait
+		finally:
+			with self._lock:
+				entry[2] -= 1
+				self.waiting -= 1
+				if entry[2] == 0 and self._entries.get(session_id) is entry:
+					del self._entries[session_id]
+
+	def notify(self, session_id):
+		with self._lock:
+			entry = self._entries.get(session_id)
+		if entry is not None:
+			with entry[0]:
+				entry[1] += 1
+				entry[0].notify_all()
+
+
+class ChatEvents:
+	"""채팅 이벤트 발행 - 비활성화 상태에서는 모든 발행이 아무 일도 하지 않는다"""
+
+	def __init__(self, app=None):
+		self.socketio = None
+		self.signals = SessionSignals()
+		self.published = 0
+		if app is not None:
+			self.init_app(app)
+
+	@property
+	def enabled(self):
+		return self.socketio is not None
+
+	def init_app(self, app):
+		if app.config.get('CHAT_PUSH', True):
+			self.socketio = SocketIO(
+				app,
+				async_mode=app.config.get('SOCKETIO_ASYNC_MODE') or None,
+				message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE') or None,
+				ping_interval=app.config.get('SOCKETIO_PING_INTERVAL', 25),
+			)
+			self.socketio.on_event('connect', self._on_connect)
+			self.socketio.on_event('join', self._on_join)
+			self.socketio.on_event('leave', self._on_leave)
+		# 템플릿에서 위젯 스크립트에 전송 방식을 알려줄 때 사용
+		app.add_template_global(self.enabled, 'chat_push')
+		app.add_template_global(app.config.get('CHAT_LONG_POLL', True), 'chat_long_poll')
+
+	def _on_connect(self, auth=None):
+		if session.get('logged_in'):
+			join_room(ADMIN_ROOM)
+
+	def _on_join(self, data):
+		"""세션 방 입장 - 세션 ID(UUID)를 아는 쪽만 들어올 수 있다 (폴링 API 와 같은 기준)"""
+		session_id = (data or {}).get('session_id')
+		if not session_id:
+			return {'success': False}
+		join_room(session_room(session_id))
+		return {'success': True}
+
+	def _on_leave(self, data):
+		session_id = (data or {}).get('session_id')
+		if session_id:
+			leave_room(session_room(session_id))
+
+	def _emit(self, event, payload, room):
+		if self.socketio is None:
+			return
+		self.socketio.emit(event, payload, to=room)
+		self.published += 1
+
+	def message(self, session_id, message):
+		"""새 메시지를 세션 방으로 전달 (message 는 /api/chat/messages 의 항목과 같은 형태)"""
+		self.signals.notify(session_id)
+		self._emit('chat_message', {'session_id': session_id, 'message': message}, session_room(session_id))
+
+	def session_closed(self, session_id):
+		self.signals.notify(session_id)
+		self._emit('chat_closed', {'session_id': session_id}, session_room(session_id))
+
+	def unread(self, session_id, unread_count, last_message=None):
+		"""관리자 화면에 세션별 읽지 않은 메시지 수 변경 알림"""
+		self._emit('chat_unread', {
+			'session_id': session_id,
+			'unread_count': unread_count,
+			'last_message': last_message,
+		}, ADMIN_ROOM)
+
+	def run(self, app, **kwargs):
+		"""개발 서버 실행 (푸시를 끈 경우 일반 Flask 서버)"""
+		if self.socketio is None:
+			app.run(**kwargs)
+		else:
+			self.socketio.run(app, allow_unsafe_werkzeug=True, **kwargs)
+
+	def stats(self):
+		return {'enabled': self.enabled, 'published': self.published, 'long_poll_waiting': self.signals.waiting}
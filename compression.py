@@ -0,0 +1,213 @@
+"""
+응답 압축 (gzip / brotli)
+정적 텍스트 파일(CSS, JS, SVG ...)은 build() 로 미리 <파일>.gz, <파일>.br 을 만들어 두고, static 요청의
+Accept-Encoding 에 맞는 압축 파일을 그대로 보낸다 (요청마다 압축하지 않음). 원본보다 오래된 압축 파일은 쓰지 않는다.
+렌더링한 HTML/JSON 응답은 COMPRESS_MIN_SIZE 바이트 이상일 때만 그 자리에서 압축하고, 공개 페이지 캐시에서 나온
+응답(X-Page-Cache)은 본문이 같으면 압축 결과를 재사용한다. 압축한 응답의 ETag 에는 인코딩(-gzip/-br)을 붙이고,
+돌려받은 If-None-Match 에서는 뷰가 보기 전에 떼어 내므로 뷰의 조건부 요청(채팅 폴링 304 등)은 원래 ETag 로 비교한다.
+
+brotli 모듈이 없으면 .br 은 만들지 않고 gzip 만 쓴다.
+    flask --app app compress-static   # 배포할 때마다 (원본이 바뀐 파일만 다시 압축)
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+
+from flask import request, send_file
+
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+# 미리 압축할 정적 파일 확장자와 압축 파일 확장자 (선호 순서)
+TEXT_EXTENSIONS = ('.css', '.js', '.svg', '.html', '.txt', '.json', '.map')
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+# 그 자리에서 압축할 응답 형식
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+	'application/json', 'image/svg+xml'}
+# _compress 가 ETag 끝에 붙이는 인코딩 표시
+ETAG_ENCODING = re.compile(r'-(%s)"' % '|'.join(ENCODINGS))
+# If-None-Match 에서 뗀 인코딩 (304 응답의 ETag 에 다시 붙인다)
+STRIPPED_ENCODING = 'compression.etag_encoding'
+
+
+def available_encodings():
+	"""현재 환경에서 만들 수 있는 압축 형식"""
+	return tuple(name for name in ENCODINGS if name != 'br' or brotli is not None)
+
+
+def compress(data, encoding, level=6):
+	if encoding == 'br':
+		# brotli 품질 11 은 빌드용, 요청 중에는 gzip 6 과 비슷한 시간인 5 정도를 쓴다
+		return brotli.compress(data, quality=min(11, level))
+	return gzip.compress(data, compresslevel=min(9, level), mtime=0)
+
+
+def build(static_folder, min_size=256):
+	"""static 폴더의 텍스트 파일 옆에 .gz/.br 을 만든다 - {'files', 'written', 'bytes', 'compressed': {형식: 바이트}}
+
+	이미 원본보다 새 압축 파일이 있으면 건너뛰고, 압축해도 줄지 않으면 만들지 않는다 (있던 것은 지운다).
+	"""
+	encodings = available_encodings()
+	stats = {'files': 0, 'written': 0, 'bytes': 0, 'compressed': {name: 0 for name in encodings}}
+	for folder, _, names in os.walk(static_folder):
+		for name in names:
+			if not name.endswith(TEXT_EXTENSIONS):
+				continue
+			path = os.path.join(folder, name)
+			source = os.stat(path)
+			if source.st_size < min_size:
+				continue
+			stats['files'] += 1
+			stats['bytes'] += source.st_size
+			data = None
+			for encoding in encodings:
+				target = path + ENCODINGS[encoding]
+				if not (os.path.exists(target) and os.stat(target).st_mtime_ns >= source.st_mtime_ns):
+					if data is None:
+						with open(path, 'rb') as f:
+							data = f.read()
+					compressed = compress(data, encoding, level=11)
+					if len(compressed) >= len(data):
+						if os.path.exists(target):
+							os.remove(target)
+						continue
+					partial = f'{target}.part'
+					with open(partial, 'wb') as f:
+						f.write(compressed)
+					os.replace(partial, target)
+					stats['written'] += 1
+				stats['compressed'][encoding] += os.path.getsize(target)
+	return stats
+
+
+class Compressor:
+	"""정적 파일은 미리 압축한 파일로, 렌더링한 텍스트 응답은 그 자리에서 압축"""
+
+	def __init__(self, app=None, max_entries=128):
+		self.app = None
+		self.min_size = 1024
+		self.level = 6
+		self.max_entries = max_entries
+		self._memo = {}
+		self._lock = threading.Lock()
+		self._stats = {'precompressed': 0, 'compressed': 0, 'memo_hits': 0, 'skipped_small': 0, 'bytes_in': 0, 'bytes_out': 0}
+		if app is not None:
+			self.init_app(app)
+
+	def init_app(self, app):
+		self.app = app
+		self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+		self.level = app.config.get('COMPRESS_LEVEL', self.level)
+		app.before_request(self._strip_etag_encoding)
+		app.after_request(self._compress)
+		app.extensions['compression'] = self
+
+	def _count(self, field, bytes_in=0, bytes_out=0):
+		with self._lock:
+			self._stats[field] += 1
+			self._stats['bytes_in'] += bytes_in
+			self._stats['bytes_out'] += bytes_out
+
+	@staticmethod
+	def _accepted(encodings):
+		"""encodings 중 클라이언트가 받는 것 (q 값이 높은 것, 같으면 encodings 순서)"""
+		accepted = [(request.accept_encodings[name], -i, name) for i, name in enumerate(encodings)
+			if request.accept_encodings[name] > 0]
+		return max(accepted)[2] if accepted else None
+
+	def _strip_etag_encoding(self):
+		"""If-None-Match 의 "<etag>-gzip" 을 "<etag>" 로 - 뷰가 자기 ETag 와 비교할 수 있도록"""
+		header = request.environ.get('HTTP_IF_NONE_MATCH')
+		if not header or request.endpoint == 'static':
+			return
+		encodings = ETAG_ENCODING.findall(header)
+		if encodings:
+			request.environ['HTTP_IF_NONE_MATCH'] = ETAG_ENCODING.sub('"', header)
+			request.environ[STRIPPED_ENCODING] = encodings[-1]
+
+	def _compress(self, response):
+		encoding = request.environ.get(STRIPPED_ENCODING)
+		if response.status_code == 304 and encoding and response.get_etag()[0]:
+			# 클라이언트가 가진 (압축한) 응답의 ETag 그대로 돌려준다
+			response.set_etag(f'{response.get_etag()[0]}-{encoding}', weak=response.get_etag()[1])
+			response.vary.add('Accept-Encoding')
+			return response
+		if response.status_code != 200 or 'Content-Encoding' in response.headers or request.method not in ('GET', 'HEAD'):
+			return response
+		if request.endpoint == 'static':
+			return self._precompressed(response)
+		if response.direct_passthrough or response.is_streamed or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+			return response
+
+		response.vary.add('Accept-Encoding')
+		body = response.get_data()
+		if len(body) < self.min_size:
+			self._count('skipped_small')
+			return response
+		encoding = self._accepted(available_encodings())
+		if encoding is None:
+			return response
+
+		# 페이지 캐시 응답은 본문이 같으면 같은 압축 결과를 쓴다
+		key = (encoding, hashlib.sha1(body).digest()) if 'X-Page-Cache' in response.headers else None
+		compressed = self._memo.get(key) if key else None
+		if compressed is not None:
+			self._count('memo_hits', len(body), len(compressed))
+		else:
+			compressed = compress(body, encoding, self.level if encoding == 'gzip' else min(5, self.level))
+			self._count('compressed', len(body), len(compressed))
+			if key:
+				with self._lock:
+					if len(self._memo) >= self.max_entries:
+						self._memo.pop(next(iter(self._memo)))
+					self._memo[key] = compressed
+		response.set_data(compressed)
+		response.headers['Content-Encoding'] = encoding
+		if response.get_etag()[0]:
+			response.set_etag(f'{response.get_etag()[0]}-{encoding}', weak=response.get_etag()[1])
+		return response
+
+	def _precompressed(self, response):
+		"""static 응답을 Accept-Encoding 에 맞는 .br/.gz 파일로 바꾼다 (캐시 헤더는 그대로)"""
+		filename = (request.view_args or {}).get('filename', '')
+		if not filename.endswith(TEXT_EXTENSIONS) or 'Range' in request.headers:
+			return response
+		path = os.path.join(self.app.static_folder, filename)
+		try:
+			source_mtime = os.stat(path).st_mtime_ns
+		except OSError:
+			return response
+		ready = []
+		for encoding, ext in ENCODINGS.items():
+			try:
+				if os.stat(path + ext).st_mtime_ns >= source_mtime:
+					ready.append(encoding)
+			except OSError:
+				pass
+		response.vary.add('Accept-Encoding')
+		encoding = self._accepted(ready)
+		if encoding is None:
+			return response
+
+		compressed = send_file(path + ENCODINGS[encoding], mimetype=response.mimetype, conditional=True)
+		compressed.headers['Content-Encoding'] = encoding
+		compressed.headers.pop('Content-Disposition', None)  # send_file 이 붙이는 .gz 파일 이름
+		if 'Cache-Control' in response.headers:
+			compressed.headers['Cache-Control'] = response.headers['Cache-Control']
+		compressed.vary.add('Accept-Encoding')
+		response.close()
+		if compressed.status_code == 200:
+			self._count('precompressed', response.content_length or 0, compressed.content_length or 0)
+		return compressed
+
+	def stats(self):
+		with self._lock:
+			stats = dict(self._stats)
+			stats['memo_entries'] = len(self._memo)
+		stats['encodings'] = list(available_encodings())
+		return stats
@@ -0,0 +1,446 @@
+"""
+SQLite 연결 관리
+워커(프로세스)마다 작은 연결 풀을 두고, 하나의 요청(app context) 동안에는
+같은 연결을 flask.g 에 묶어 재사용한다. 요청이 끝나면 teardown 에서 풀로 반납한다.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from flask import g
+
+
+# 연결을 새로 열 때 한 번만 적용하는 PRAGMA
+DEFAULT_PRAGMAS = (
+	'PRAGMA temp_store = MEMORY',
+)
+
+# 저장 모드 프리셋 (DB_STORAGE_MODE)
+# - wal: 읽기와 쓰기가 서로 막지 않음. synchronous=NORMAL 로도 WAL 에서는 손상 위험이 없다
+# - rollback: 기존 rollback journal 방식 (네트워크 파일시스템 등 WAL 을 쓸 수 없는 환경용)
+STORAGE_MODES = {
+	'wal': {
+		'journal_mode': 'WAL',
+		'synchronous': 'NORMAL',
+		'cache_size': -16000,        # 음수는 KiB 단위 (약 16MB)
+		'mmap_size': 128 * 1024 * 1024,
+		'busy_timeout': 5000,        # ms
+	},
+	'rollback': {
+		'journal_mode': 'DELETE',
+		'synchronous': 'FULL',
+		'cache_size': -2000,
+		'mmap_size': 0,
+		'busy_timeout': 5000,
+	},
+}
+
+
+def storage_settings(mode='wal', **overrides):
+	"""저장 모드 프리셋에 개별 설정(None 이 아닌 값)을 덮어쓴 결과"""
+	if mode not in STORAGE_MODES:
+		raise ValueError(f'알 수 없는 저장 모드: {mode} (가능: {", ".join(STORAGE_MODES)})')
+	settings = dict(STORAGE_MODES[mode])
+	settings.update({k: v for k, v in overrides.items() if v is not None})
+	return settings
+
+
+def connection_pragmas(settings):
+	"""연결마다 적용할 PRAGMA 목록 (journal_mode 는 파일 단위라 시작 시 한 번만 설정)"""
+	return DEFAULT_PRAGMAS + (
+		f"PRAGMA synchronous = {settings['synchronous']}",
+		f"PRAGMA cache_size = {int(settings['cache_size'])}",
+		f"PRAGMA mmap_size = {int(settings['mmap_size'])}",
+		f"PRAGMA busy_timeout = {int(settings['busy_timeout'])}",
+	)
+
+
+class PoolTimeout(sqlite3.OperationalError):
+	"""풀의 모든 연결이 사용 중이고 대기 시간이 초과된 경우"""
+
+
+class PooledConnection:
+	"""풀에서 빌려준 연결
+
+	기존 라우트 코드가 끝에서 conn.close() 를 호출하므로, close() 는 실제로 연결을
+	닫지 않는다. 연결 반납은 app context 종료 시점(teardown)에 이루어진다.
+	"""
+
+	def __init__(self, conn):
+		self._conn = conn
+
+	@property
+	def raw(self):
+		return self._conn
+
+	def close(self):
+		# 커밋하지 않은 변경은 반납 시점에 롤백된다
+		pass
+
+	def __enter__(self):
+		return self._conn.__enter__()
+
+	def __exit__(self, *exc_info):
+		return self._conn.__exit__(*exc_info)
+
+	def __getattr__(self, name):
+		return getattr(self._conn, name)
+
+
+class ConnectionPool:
+	"""프로세스 단위 SQLite 연결 풀"""
+
+	def __init__(self, database, max_size=8, timeout=10.0, pragmas=DEFAULT_PRAGMAS):
+		self.database = database
+		self.max_size = max_size
+		self.timeout = timeout
+		self.pragmas = tuple(pragmas)
+		self._lock = threading.Lock()
+		self._reset()
+
+	def _reset(self):
+		# gunicorn 이 preload 후 fork 한 경우 부모의 연결을 물려받지 않도록 새로 시작
+		self._pid = os.getpid()
+		self._idle = queue.LifoQueue()
+		self._size = 0
+		self._stats = {
+			'checkouts': 0,
+			'waits': 0,
+			'wait_time_total': 0.0,
+			'timeouts': 0,
+			'connections_opened': 0,
+			'connections_discarded': 0,
+		}
+
+	def _connect(self):
+		conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False)
+		conn.row_factory = sqlite3.Row
+		for pragma in self.pragmas:
+			conn.execute(pragma)
+		return conn
+
+	def acquire(self):
+		"""연결 하나를 빌린다 (유휴 연결 우선, 없으면 새로 열고, 한도에 걸리면 대기)"""
+		with self._lock:
+			if self._pid != os.getpid():
+				self._reset()
+			self._stats['checkouts'] += 1
+
+		try:
+			return self._idle.get_nowait()
+		except queue.Empty:
+			pass
+
+		with self._lock:
+			can_open = self._size < self.max_size
+			if can_open:
+				self._size += 1
+
+		if can_open:
+			try:
+				conn = self._connect()
+			except Exception:
+				with self._lock:
+					self._size -= 1
+				raise
+			with self._lock:
+				self._stats['connections_opened'] += 1
+			return conn
+
+		started = time.monotonic()
+		try:
+			conn = self._idle.get(timeout=self.timeout)
+		except queue.Empty:
+			with self._lock:
+				self._stats['waits'] += 1
+				self._stats['timeouts'] += 1
+			raise PoolTimeout(f'데이터베이스 연결 풀 대기 시간 초과 ({self.max_size}개 모두 사용 중)')
+		with self._lock:
+			self._stats['waits'] += 1
+			self._stats['wait_time_total'] += time.monotonic() - started
+		return conn
+
+	def release(self, conn):
+		"""연결을 풀로 돌려준다 (미완료 트랜잭션은 롤백)"""
+		if self._pid != os.getpid():
+			return
+		try:
+			if conn.in_transaction:
+				conn.rollback()
+		except sqlite3.Error:
+			self._discard(conn)
+			return
+		self._idle.put(conn)
+
+	def _discard(self, conn):
+		try:
+			conn.close()
+		except sqlite3.Error:
+			pass
+		with self._lock:
+			self._size -= 1
+			self._stats['connections_discarded'] += 1
+
+	def close_all(self):
+		"""유휴 연결을 모두 닫는다"""
+		while True:
+			try:
+				conn = self._idle.get_nowait()
+			except queue.Empty:
+				break
+			self._discard(conn)
+
+	def stats(self):
+		"""풀 사용 통계 (풀 크기 조정용)"""
+		with self._lock:
+			stats = dict(self._stats)
+			size = self._size
+		idle = self._idle.qsize()
+		stats.update({
+			'pid': self._pid,
+			'max_size': self.max_size,
+			'size': size,
+			'idle': idle,
+			'in_use': size - idle,
+		})
+		stats['wait_time_total'] = round(stats['wait_time_total'], 6)
+		return stats
+
+
+class WriteQueue:
+	"""프로세스당 하나의 쓰기 전용 스레드로 쓰기를 직렬화한다
+
+	제출된 작업(conn 을 받는 callable)은 도착 순서대로 실행되며, 대기 중인 작은 쓰기들은
+	하나의 트랜잭션으로 묶어 커밋한다. 작업마다 SAVEPOINT 를 두므로 한 작업이 실패해도
+	같은 배치의 다른 작업은 영향을 받지 않는다.
+	연결을 열 수 없거나 배치 처리 중 연결이 깨지면 그 배치의 작업에 예외를 넘기고, 다음 배치에서 다시 연결한다.
+	"""
+
+	def __init__(self, database, pragmas=DEFAULT_PRAGMAS, max_batch=64, timeout=10.0):
+		self.database = database
+		self.pragmas = tuple(pragmas)
+		self.max_batch = max_batch
+		self.timeout = timeout
+		self._lock = threading.Lock()
+		self._pid = None
+		self._thread = None
+		self._jobs = None
+		self._stats = {}
+
+	def _start(self):
+		self._pid = os.getpid()
+		self._jobs = queue.Queue()
+		self._stats = {'jobs': 0, 'batches': 0, 'failed_jobs': 0, 'failed_batches': 0, 'cancelled_jobs': 0, 'max_batch': 0}
+		self._spawn()
+
+	def _spawn(self):
+		"""쓰기 스레드 시작 (큐에 쌓인 작업은 그대로 이어서 처리)"""
+		self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+		self._thread.start()
+
+	def submit(self, job):
+		"""쓰기 작업을 큐에 넣고 Future 를 돌려준다"""
+		with self._lock:
+			if self._pid != os.getpid():
+				self._start()
+			elif self._thread is None or not self._thread.is_alive():
+				self._spawn()
+		future = Future()
+		self._jobs.put((job, future))
+		return future
+
+	def execute(self, sql, params=()):
+		"""단일 SQL 쓰기를 제출 (결과는 lastrowid)"""
+		return self.submit(lambda conn: conn.execute(sql, params).lastrowid)
+
+	def _connect(self):
+		conn = sqlite3.connect(self.database, timeout=self.timeout, isolation_level=None,
+			check_same_thread=False)
+		try:
+			conn.row_factory = sqlite3.Row
+			for pragma in self.pragmas:
+				conn.execute(pragma)
+		except Exception:
+			conn.close()
+			raise
+		return conn
+
+	def _run(self):
+		conn = None
+		try:
+			while True:
+				batch = [self._jobs.get()]
+				while len(batch) < self.max_batch:
+					try:
+						batch.append(self._jobs.get_nowait())
+					except queue.Empty:
+						break
+				try:
+					if conn is None:
+						conn = self._connect()
+					self._run_batch(conn, batch)
+				except Exception as e:
+					# 연결 실패, 또는 ROLLBACK 도 못 할 만큼 깨진 연결 - 이 배치는 실패시키고 다음 배치에서 다시 연결
+					if conn is not None:
+						conn.close()
+						conn = None
+					with self._lock:
+						self._stats['failed_batches'] += 1
+					self._fail(batch, e)
+		finally:
+			# 예상하지 못한 이유로 끝나더라도 다음 submit() 이 스레드를 다시 띄운다
+			with self._lock:
+				if self._thread is threading.current_thread():
+					self._thread = None
+
+	@staticmethod
+	def _fail(batch, error):
+		"""배치에서 아직 끝나지 않은 작업에 예외를 넘긴다 (취소된 작업은 건너뜀)"""
+		for job, future in batch:
+			if future.done():
+				continue
+			if future.running() or future.set_running_or_notify_cancel():
+				future.set_exception(error)
+
+	def _run_batch(self, conn, batch):
+		results = []
+		try:
+			conn.execute('BEGIN IMMEDIATE')
+			for job, future in batch:
+				# 호출자가 기다리다 취소한 작업(Database.write 시간 초과)은 실행하지 않는다
+				if not future.set_running_or_notify_cancel():
+					with self._lock:
+						self._stats['cancelled_jobs'] += 1
+					continue
+				conn.execute('SAVEPOINT write_job')
+				try:
+					results.append((future, job(conn), None))
+					conn.execute('RELEASE write_job')
+				except Exception as e:
+					conn.execute('ROLLBACK TO write_job')
+					conn.execute('RELEASE write_job')
+					results.append((future, None, e))
+			conn.execute('COMMIT')
+		except Exception as e:
+			if conn.in_transaction:
+				conn.execute('ROLLBACK')
+			with self._lock:
+				self._stats['failed_batches'] += 1
+			self._fail(batch, e)
+			return
+
+		with self._lock:
+			self._stats['jobs'] += len(results)
+			self._stats['batches'] += 1
+			self._stats['max_batch'] = max(self._stats['max_batch'], len(batch))
+		for future, result, error in results:
+			if error is not None:
+				with self._lock:
+					self._stats['failed_jobs'] += 1
+				future.set_exception(error)
+			else:
+				future.set_result(result)
+
+	def stats(self):
+		with self._lock:
+			stats = dict(self._stats)
+		stats['pending'] = self._jobs.qsize() if self._jobs is not None else 0
+		return stats
+
+
+class Database:
+	"""Flask 확장: app context 마다 풀에서 연결 하나를 빌려 g 에 보관한다"""
+
+	def __init__(self, app=None):
+		self.pool = None
+		self.writer = None
+		self.settings = None
+		if app is not None:
+			self.init_app(app)
+
+	def init_app(self, app):
+		self.settings = storage_settings(
+			app.config.get('DB_STORAGE_MODE', 'wal'),
+			synchronous=app.config.get('DB_SYNCHRONOUS'),
+			cache_size=app.config.get('DB_CACHE_SIZE'),
+			mmap_size=app.config.get('DB_MMAP_SIZE'),
+			busy_timeout=app.config.get('DB_BUSY_TIMEOUT'),
+		)
+		pragmas = connection_pragmas(self.settings)
+		self._apply_journal_mode(app.config['DATABASE'])
+		self.pool = ConnectionPool(
+			app.config['DATABASE'],
+			max_size=app.config.get('DB_POOL_SIZE', 8),
+			timeout=app.config.get('DB_POOL_TIMEOUT', 10.0),
+			pragmas=pragmas,
+		)
+		if app.config.get('DB_WRITE_QUEUE', True):
+			self.writer = WriteQueue(
+				app.config['DATABASE'],
+				pragmas=pragmas,
+				max_batch=app.config.get('DB_WRITE_BATCH', 64),
+				timeout=app.config.get('DB_POOL_TIMEOUT', 10.0),
+			)
+		app.teardown_appcontext(self._teardown)
+		app.extensions['db'] = self
+
+	def _apply_journal_mode(self, database):
+		# journal_mode 는 데이터베이스 파일에 기록되므로 시작 시 한 번만 설정한다
+		conn = sqlite3.connect(database, timeout=self.settings['busy_timeout'] / 1000)
+		try:
+			conn.execute(f"PRAGMA journal_mode = {self.settings['journal_mode']}")
+		finally:
+			conn.close()
+
+	def connection(self):
+		"""현재 app context 에 묶인 연결 (없으면 풀에서 빌려온다)"""
+		if 'db_conn' not in g:
+			g.db_conn = PooledConnection(self.pool.acquire())
+		return g.db_conn
+
+	def release(self):
+		"""요청이 끝나기 전에 연결을 풀에 먼저 반납 (롱폴링처럼 오래 대기하는 요청용)
+
+		이후 connection() 을 다시 부르면 새로 빌려온다.
+		"""
+		conn = g.pop('db_conn', None)
+		if conn is not None:
+			self.pool.release(conn.raw)
+
+	def _teardown(self, exc):
+		self.release()
+
+	def write(self, job, timeout=None):
+		"""쓰기 작업 실행 - 쓰기 큐가 켜져 있으면 큐를 통해, 아니면 현재 연결에서 바로 커밋
+
+		job 은 sqlite3 연결을 인자로 받는 callable 이며, 반환값을 그대로 돌려준다.
+		큐에서 timeout 안에 끝나지 않으면 아직 시작하지 않은 작업은 취소하고 TimeoutError 를 올린다
+		(나중에 기록되지 않으므로 호출자가 다시 시도해도 중복되지 않는다).
+		이미 실행 중인 작업은 배치 커밋까지 기다려 실제 결과를 돌려준다.
+		"""
+		if self.writer is None:
+			conn = self.connection()
+			try:
+				result = job(conn.raw)
+				conn.commit()
+			except Exception:
+				conn.rollback()
+				raise
+			return result
+		future = self.writer.submit(job)
+		try:
+			return future.result(timeout or self.pool.timeout)
+		except FutureTimeoutError:
+			if future.cancel():
+				raise
+		return future.result(self.writer.timeout)
+
+	def stats(self):
+		stats = {'pool': self.pool.stats(), 'storage': dict(self.settings)}
+		if self.writer is not None:
+			stats['write_queue'] = self.writer.stats()
+		return stats
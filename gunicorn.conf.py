@@ -0,0 +1,25 @@
+"""
+gunicorn 설정
+    gunicorn -c gunicorn.conf.py app:app
+
+채팅 푸시(Socket.IO)의 웹소켓 연결과 롱폴링 요청은 끝날 때까지 요청 하나를 붙잡고 있다.
+- gthread (기본): 붙잡힌 요청마다 스레드 하나를 쓰므로 스레드 수를 동시 접속 위젯 수보다 넉넉하게 잡는다.
+- gevent (선택, pip install gevent): GUNICORN_WORKER_CLASS=gevent 로 실행하면 대기 중인 요청이
+  스레드 대신 그린렛을 쓰므로 worker_connections 만큼 적은 비용으로 붙잡아 둘 수 있다.
+워커를 2개 이상 두려면 로드밸런서의 스티키 세션과 SOCKETIO_MESSAGE_QUEUE(예: redis://) 가 필요하다.
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:5001')
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 200))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+# 유휴 연결(keep-alive)과 웹소켓이 오래 열려 있어도 워커를 죽이지 않도록
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+accesslog = os.environ.get('GUNICORN_ACCESSLOG') or None
+
+# Socket.IO 비동기 모드를 워커 종류에 맞춘다 (워커는 이 환경변수를 물려받아 앱을 불러온다)
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'gevent' if worker_class == 'gevent' else 'threading')
@@ -0,0 +1,99 @@
+"""
+반응형 이미지 변형 조회와 <picture> 마크업
+image_variants 테이블(원본 URL → 너비별·형식별 변형)을 워커 메모리에 한 번 읽어 두고,
+템플릿 전역 picture(url, alt, sizes=...) 가 AVIF/WebP <source> 와 JPEG srcset 을 가진
+<picture> 를 만든다. 변형이 없는 이미지(외부 URL, 아직 처리 전)는 기존 <img> 그대로 출력한다.
+다른 워커에서 변형이 추가되면 data_versions 의 image_variants 버전이 바뀐 것을 보고 다시 읽는다.
+"""
+
+import threading
+from types import MappingProxyType
+from urllib.parse import quote
+
+from flask import g
+from markupsafe import Markup, escape
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def _attributes(attrs):
+	parts = []
+	for name, value in attrs.items():
+		if value is None or value is False:
+			continue
+		name = name.rstrip('_').replace('_', '-')
+		parts.append(f' {name}' if value is True else f' {name}="{escape(value)}"')
+	return ''.join(parts)
+
+
+class ImageVariantRegistry:
+	"""원본 URL 별 변형 목록 (프로세스 단위, 읽기 전용 스냅샷)"""
+
+	TABLE = 'image_variants'
+
+	def __init__(self, db, versions):
+		# versions: 현재 요청의 data_versions 값(dict)을 돌려주는 함수
+		self.db = db
+		self.versions = versions
+		self.enabled = True
+		self.asset_url = lambda url: url
+		self._variants = MappingProxyType({})
+		self._version = None
+		self._lock = threading.Lock()
+		self.loads = 0
+
+	def init_app(self, app):
+		self.enabled = app.config.get('RESPONSIVE_IMAGES', True)
+		# 지문 URL 을 쓰는 앱이면 변형 URL 에도 붙인다 (assets.py)
+		if 'assets' in app.extensions:
+			self.asset_url = app.extensions['assets'].url
+		app.add_template_global(self.picture, 'picture')
+
+	def refresh(self, conn=None):
+		conn = conn or self.db.connection()
+		row = conn.execute('SELECT version FROM data_versions WHERE table_name = ?', (self.TABLE,)).fetchone()
+		rows = conn.execute('SELECT source_url, format, width, url FROM image_variants ORDER BY source_url, format, width').fetchall()
+		variants = {}
+		for r in rows:
+			variants.setdefault(r['source_url'], {}).setdefault(r['format'], []).append((r['width'], r['url']))
+		with self._lock:
+			self._variants = MappingProxyType(variants)
+			self._version = row['version'] if row else None
+			self.loads += 1
+
+	def _current(self):
+		"""요청당 한 번만 버전을 확인하고, 바뀌었으면 다시 읽는다"""
+		if not g.get('image_variants_checked'):
+			g.image_variants_checked = True
+			version = self.versions().get(self.TABLE)
+			if self._version is None or version != self._version:
+				self.refresh()
+		return self._variants
+
+	def get(self, url):
+		"""{형식: [(너비, URL), ...]} (없으면 빈 dict)"""
+		if not url or not self.enabled:
+			return {}
+		return self._current().get(url, {})
+
+	def picture(self, url, alt='', sizes='100vw', loading='lazy', **attrs):
+		"""<picture> 마크업 - attrs 는 <img> 에 붙는다 (class_='...' 처럼 예약어는 _ 접미사)"""
+		img_attrs = {'src': self.asset_url(url), 'alt': alt, 'loading': loading, **attrs}
+		variants = self.get(url)
+		if not variants:
+			return Markup(f'<img{_attributes(img_attrs)}>')
+
+		def srcset(candidates):
+			# srcset 은 공백으로 URL 과 너비를 나누므로 경로의 공백 등은 인코딩한다
+			return ', '.join(f"{quote(self.asset_url(candidate_url), safe='/:?=&%')} {width}w" for width, candidate_url in candidates)
+
+		sources = []
+		for name in ('avif', 'webp'):
+			if name in variants:
+				sources.append(f'<source type="{MIME_TYPES[name]}" srcset="{escape(srcset(variants[name]))}" sizes="{escape(sizes)}">')
+		if 'jpeg' in variants:
+			img_attrs.update(srcset=srcset(variants['jpeg']), sizes=sizes)
+		return Markup(f'<picture>{"".join(sources)}<img{_attributes(img_attrs)}></picture>')
+
+	def stats(self):
+		return {'images': len(self._variants), 'version': self._version, 'loads': self.loads, 'enabled': self.enabled}
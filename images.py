@@ -0,0 +1,679 @@
+"""
+관리자 업로드 이미지 처리
+업로드 요청은 원본을 한 번 저장하고 작업(image_jobs)을 등록한 뒤 바로 응답한다.
+EXIF 회전, RGB 변환, 리사이즈, JPEG 재압축은 별도 프로세스 풀에서 실행되고, 그동안 DB 행은
+작업별 자리표시 URL(/static/images/processing.svg?job=<id>)을 가리킨다. 작업이 끝나면
+자리표시 URL 을 최종 URL 로(실패하면 이전 사진으로) 바꾼다.
+
+- IMAGE_WORKERS=0 이면 예전처럼 요청 안에서 바로 처리한다
+- 처리 상태는 /admin/api/image-jobs/<id> 로 확인한다 (관리자 폼이 폴링)
+- 프로세스가 중간에 종료되어 남은 작업은 flask --app app image-jobs --retry 로 다시 처리한다
+
+최적화와 함께 반응형 변형(VARIANT_WIDTHS 너비 × AVIF/WebP/JPEG)을 원본 옆에
+<이름>-<너비>w.<확장자> 로 만들고 image_variants 테이블에 기록한다. 템플릿은
+image_variants.py 의 picture() 로 <picture>/srcset 마크업을 만든다.
+
+업로드 파일 이름은 원본 내용의 해시(<해시>.jpg)다. 같은 사진을 다시 올리면 처리 없이 기존 파일을
+가리키고, 이름이 바뀌지 않는 파일은 내용도 바뀌지 않으므로 assets.py 가 immutable 로 캐시하게 한다.
+"""
+
+import multiprocessing
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from flask import after_this_request, has_request_context
+from PIL import Image, ImageOps, features
+
+from assets import file_hash, is_content_addressed
+from uploads import save_upload
+
+PLACEHOLDER_URL = '/static/images/processing.svg'
+
+# 일괄 업로드에서 사진으로 받는 확장자
+UPLOAD_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# 작업이 끝났을 때 URL 을 바꿀 수 있는 (테이블, 컬럼)
+TARGETS = {
+	('pilots', 'photo_url'),
+	('maintenance_crew', 'photo_url'),
+	('candidates', 'photo_url'),
+	('commander_greeting', 'photo_url'),
+	('site_images', 'image_path'),
+}
+
+# 대상별 최대 크기 (가로/세로, 기본 1200px) - 배너는 넓은 화면을 채우므로 더 크게 둔다
+MAX_SIZES = {('site_images', 'image_path'): 1920}
+DEFAULT_MAX_SIZE = 1200
+
+# 정적 이미지 URL 을 담는 (테이블, 컬럼) - 정적 파일 일괄 최적화가 참조를 새 URL 로 바꾼다
+IMAGE_COLUMNS = TARGETS | {
+	('gallery', 'image_url'),
+	('about_sections', 'image_url'),
+	('page_sections', 'image_url'),
+	('banner_settings', 'background_image'),
+}
+
+# 반응형 변형 너비 (원본보다 작은 것만 만든다) 와 형식별 저장 옵션
+VARIANT_WIDTHS = (320, 640, 1200)
+VARIANT_FORMATS = {
+	'avif': ('AVIF', 'avif', {'quality': 55}),
+	'webp': ('WEBP', 'webp', {'quality': 80, 'method': 6}),
+	'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+# 업로드 최적화 프로필 (IMAGE_PROFILE)
+# - draft: JPEG 를 목표 크기 이상인 범위에서 1/2, 1/4, 1/8 로 줄여 디코딩
+# - reducing_gap: 목표의 이 배수 이상으로 남을 만큼 먼저 정수배 박스 축소(reduce)하고 resample (None 이면 전체 resample)
+OPTIMIZE_PROFILES = {
+	'quality': {'draft': False, 'reducing_gap': None, 'resample': Image.Resampling.LANCZOS, 'quality': 85, 'optimize': True},
+	'balanced': {'draft': True, 'reducing_gap': 2.0, 'resample': Image.Resampling.LANCZOS, 'quality': 85, 'optimize': True},
+	'fast': {'draft': True, 'reducing_gap': 1.0, 'resample': Image.Resampling.BILINEAR, 'quality': 80, 'optimize': False},
+}
+DEFAULT_PROFILE = 'balanced'
+
+
+# 반응형 변형 파일 이름 (<이름>-<너비>w.<확장자>)
+VARIANT_NAME = re.compile(r'-\d+w\.\w+$')
+
+
+def variant_formats():
+	"""현재 Pillow 빌드가 저장할 수 있는 변형 형식 (선호 순서)"""
+	return tuple(name for name in VARIANT_FORMATS if name == 'jpeg' or features.check(name))
+
+
+def _load_rgb(file_path, draft_size=None):
+	"""EXIF 방향을 적용하고 흰 배경 RGB 로 바꾼 이미지
+
+	draft_size 를 주면 JPEG 는 그 크기 이상인 범위에서 1/2, 1/4, 1/8 로 줄여 디코딩한다
+	(4032x3024 원본을 1200px 로 줄일 때 전체 해상도 대신 2016x1512 만 메모리에 올림).
+	"""
+	with Image.open(file_path) as img:
+		if draft_size and img.format == 'JPEG':
+			# 회전(EXIF) 전 크기 기준이므로 가로/세로 중 큰 값으로 정사각형 범위를 요청
+			side = max(draft_size)
+			img.draft(None, (side, side))
+		# EXIF 방향 정보 처리
+		try:
+			img = ImageOps.exif_transpose(img)
+		except Exception:
+			pass  # EXIF 정보가 없는 경우 무시
+
+		# RGB 모드로 변환 (JPEG는 RGBA를 지원하지 않음)
+		if img.mode in ('RGBA', 'LA', 'P'):
+			background = Image.new('RGB', img.size, (255, 255, 255))
+			if img.mode == 'P':
+				img = img.convert('RGBA')
+			background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+			img = background
+		elif img.mode != 'RGB':
+			img = img.convert('RGB')
+		img.load()
+		return img
+
+
+def _optimize(file_path, output_path, max_width=1200, max_height=1200, quality=None, profile=DEFAULT_PROFILE):
+	options = OPTIMIZE_PROFILES[profile]
+	draft_size = (max_width, max_height) if options['draft'] else None
+	img = _load_rgb(file_path, draft_size=draft_size)
+
+	# 비율을 유지하면서 리사이즈 (reducing_gap 이 있으면 정수배 박스 축소 후 resample)
+	img.thumbnail((max_width, max_height), options['resample'], reducing_gap=options['reducing_gap'])
+
+	# 최적화하여 저장
+	img.save(output_path, 'JPEG', quality=quality or options['quality'], optimize=options['optimize'])
+
+
+def optimize_image(file_path, max_width=1200, max_height=1200, quality=None, output_path=None, profile=DEFAULT_PROFILE):
+	"""
+	업로드된 이미지를 최적화합니다.
+	- EXIF 방향 정보를 처리하여 올바른 방향으로 회전
+	- 최대 크기로 리사이즈 (비율 유지, 방식은 OPTIMIZE_PROFILES[profile])
+	- JPEG 포맷으로 압축 저장 (output_path 가 없으면 원본 위치에 덮어씀)
+	"""
+	try:
+		_optimize(file_path, output_path or file_path, max_width, max_height, quality, profile)
+		return True
+	except Exception as e:
+		print(f"이미지 최적화 중 오류 발생: {e}")
+		return False
+
+
+def make_variants(file_path, url, widths=VARIANT_WIDTHS, formats=None):
+	"""file_path(공개 URL 은 url) 옆에 너비별·형식별 변형을 만들고 기록할 항목 목록을 돌려준다
+
+	원본보다 넓은 변형은 만들지 않는다. JPEG 는 원본 파일 자체를 가장 큰 후보로 기록한다.
+	"""
+	formats = formats or variant_formats()
+	img = _load_rgb(file_path)
+	stem, _ = os.path.splitext(file_path)
+	url_stem, _ = os.path.splitext(url)
+	sizes = [width for width in widths if width < img.width] + [min(img.width, max(widths))]
+	variants = []
+	for width in dict.fromkeys(sizes):
+		resized = img if width == img.width else img.resize(
+			(width, max(1, round(img.height * width / img.width))), Image.Resampling.LANCZOS)
+		for name in formats:
+			if name == 'jpeg' and width == img.width and url.lower().endswith(('.jpg', '.jpeg')):
+				variants.append({'source_url': url, 'format': name, 'width': width, 'height': resized.height,
+					'url': url, 'bytes': os.path.getsize(file_path)})
+				continue
+			pil_format, ext, options = VARIANT_FORMATS[name]
+			path = f'{stem}-{width}w.{ext}'
+			partial = f'{path}.{uuid.uuid4().hex}.part'
+			resized.save(partial, pil_format, **options)
+			os.replace(partial, path)
+			variants.append({'source_url': url, 'format': name, 'width': width, 'height': resized.height,
+				'url': f'{url_stem}-{width}w.{ext}', 'bytes': os.path.getsize(path)})
+	return variants
+
+
+def store_variants(conn, source_url, variants):
+	"""source_url 의 변형 목록을 교체 (쓰기 큐 작업 안에서 호출)"""
+	conn.execute('DELETE FROM image_variants WHERE source_url = ?', (source_url,))
+	conn.executemany('''
+		INSERT INTO image_variants (source_url, format, width, height, url, bytes)
+		VALUES (:source_url, :format, :width, :height, :url, :bytes)
+	''', variants)
+
+
+def process_upload(source_path, output_path, output_url=None, profile=DEFAULT_PROFILE, max_size=DEFAULT_MAX_SIZE):
+	"""(풀 프로세스에서 실행) 원본을 profile 로 최적화해 output_path 에 쓰고 원본을 지운다
+
+	output_url 이 있으면 반응형 변형도 만든다.
+	"""
+	started = time.perf_counter()
+	partial = f'{output_path}.{uuid.uuid4().hex}.part'  # 같은 사진이 동시에 처리되어도 겹치지 않게
+	try:
+		_optimize(source_path, partial, max_size, max_size, profile=profile)
+		os.replace(partial, output_path)
+	finally:
+		if os.path.exists(partial):
+			os.remove(partial)
+	os.remove(source_path)
+	variants = make_variants(output_path, output_url) if output_url else []
+	return {'bytes': os.path.getsize(output_path), 'seconds': time.perf_counter() - started, 'variants': variants}
+
+
+def has_transparency(file_path):
+	"""실제로 투명한 픽셀이 있는 이미지인지 (흰 배경 JPEG 로 바꾸면 모양이 달라짐)"""
+	with Image.open(file_path) as img:
+		if img.mode == 'P' and 'transparency' in img.info:
+			img = img.convert('RGBA')
+		if img.mode not in ('RGBA', 'LA'):
+			return False
+		return img.getchannel('A').getextrema()[0] < 255
+
+
+def optimize_asset(source_path, output_path, output_url, profile=DEFAULT_PROFILE, max_size=1920, min_saving=0.1):
+	"""(풀 프로세스에서 실행) 이미 올라가 있는 정적 이미지를 최적화해 output_path 에 쓴다 - 원본은 그대로 둔다
+
+	결과 status 는 done(반응형 변형도 만듦), kept(투명 배경이거나 min_saving 비율만큼 줄지 않아 원본 유지) 중 하나다.
+	output_path 가 이미 있으면(앞선 실행이 파일만 쓰고 중단된 경우) 다시 인코딩하지 않는다.
+	"""
+	started = time.perf_counter()
+	before = os.path.getsize(source_path)
+	result = {'status': 'kept', 'bytes_before': before, 'bytes_after': before, 'variants': [], 'reason': None}
+	if not os.path.exists(output_path):
+		if has_transparency(source_path):
+			result['reason'] = '투명 배경'
+			return result
+		partial = f'{output_path}.{uuid.uuid4().hex}.part'
+		try:
+			_optimize(source_path, partial, max_size, max_size, profile=profile)
+			if os.path.getsize(partial) > before * (1 - min_saving):
+				result['reason'] = '충분히 줄지 않음'
+				return result
+			os.replace(partial, output_path)
+		finally:
+			if os.path.exists(partial):
+				os.remove(partial)
+	result.update(status='done', bytes_after=os.path.getsize(output_path), variants=make_variants(output_path, output_url),
+		seconds=time.perf_counter() - started)
+	return result
+
+
+def store_upload(file, folder, ext):
+	"""업로드 파일을 내용 해시 이름(<해시><ext>)으로 folder 에 저장하고 파일 이름을 돌려준다
+
+	같은 내용의 파일이 이미 있으면 새로 쓰지 않는다.
+	"""
+	os.makedirs(folder, exist_ok=True)
+	partial = os.path.join(folder, f'.{uuid.uuid4().hex}.part')
+	save_upload(file, partial)
+	filename = file_hash(partial) + ext
+	if os.path.exists(os.path.join(folder, filename)):
+		os.remove(partial)
+	else:
+		os.replace(partial, os.path.join(folder, filename))
+	return filename
+
+
+def _extract(archive, info, path):
+	with archive.open(info) as source, open(path, 'wb') as target:
+		shutil.copyfileobj(source, target)
+
+
+def static_path(static_folder, url):
+	"""/static/... URL 의 파일 경로 (외부 URL 이나 정적 폴더 밖이면 None)"""
+	if not url or not url.startswith('/static/'):
+		return None
+	path = os.path.normpath(os.path.join(static_folder, url[len('/static/'):].split('?', 1)[0]))
+	if not path.startswith(os.path.normpath(static_folder) + os.sep):
+		return None
+	return path
+
+
+class ImageJob:
+	"""등록된 처리 작업 하나"""
+
+	def __init__(self, job_id, table, column, source_path, output_path, output_url, fallback_url):
+		self.id = job_id
+		self.table = table
+		self.column = column
+		self.source_path = source_path
+		self.output_path = output_path
+		self.output_url = output_url
+		self.fallback_url = fallback_url
+
+	@property
+	def placeholder(self):
+		return f'{PLACEHOLDER_URL}?job={self.id}'
+
+	@classmethod
+	def from_row(cls, row):
+		return cls(row['id'], row['target_table'], row['target_column'], row['source_path'],
+			row['output_path'], row['output_url'], row['fallback_url'])
+
+
+class ImagePipeline:
+	"""업로드 이미지 처리 작업 등록과 백그라운드 실행"""
+
+	def __init__(self, db, app=None):
+		self.db = db
+		self.database = None
+		self.workers = 0
+		self.batch_workers = 1
+		self.profile = DEFAULT_PROFILE
+		self.incoming_folder = None
+		self._lock = threading.Lock()
+		self._pid = None
+		self._executor = None
+		self._stats = {'submitted': 0, 'deduplicated': 0, 'done': 0, 'failed': 0, 'running': 0, 'processing_seconds': 0.0}
+		if app is not None:
+			self.init_app(app)
+
+	def init_app(self, app):
+		self.database = app.config['DATABASE']
+		self.workers = app.config.get('IMAGE_WORKERS', 2)
+		self.batch_workers = app.config.get('IMAGE_BATCH_WORKERS') or os.cpu_count() or 1
+		self.profile = app.config.get('IMAGE_PROFILE') or DEFAULT_PROFILE
+		if self.profile not in OPTIMIZE_PROFILES:
+			raise ValueError(f'알 수 없는 IMAGE_PROFILE: {self.profile} (가능: {", ".join(OPTIMIZE_PROFILES)})')
+		self.incoming_folder = app.config.get('IMAGE_INCOMING_FOLDER') or os.path.join(app.root_path, 'uploads', 'incoming')
+		app.extensions['image_pipeline'] = self
+
+	def _pool(self):
+		# gunicorn 워커마다 자기 풀을 쓰도록 fork 이후 처음 사용할 때 만든다
+		with self._lock:
+			if self._executor is None or self._pid != os.getpid():
+				context = multiprocessing.get_context('forkserver' if os.name == 'posix' else 'spawn')
+				self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+				self._pid = os.getpid()
+			return self._executor
+
+	def submit(self, file, table, column, output_folder, url_prefix, fallback_url):
+		"""업로드 파일을 받아 두고 처리 작업을 등록한 뒤, DB 에 저장할 자리표시 URL 을 돌려준다
+
+		결과 파일은 output_folder/<원본 해시>.jpg (URL 은 url_prefix/<원본 해시>.jpg) 이다.
+		이미 처리한 적 있는 사진이면 작업 없이 그 URL 을 바로 돌려준다.
+		작업은 현재 요청의 응답 직전(뷰가 행을 커밋한 뒤)에 시작한다. 요청 밖에서는 바로 시작한다.
+		"""
+		if (table, column) not in TARGETS:
+			raise ValueError(f'image target not allowed: {table}.{column}')
+		os.makedirs(output_folder, exist_ok=True)
+		source_path = self.incoming_path()
+		save_upload(file, source_path)
+		filename = file_hash(source_path) + '.jpg'
+		output_path = os.path.join(output_folder, filename)
+		output_url = f'{url_prefix}/{filename}'
+		if os.path.exists(output_path):
+			os.remove(source_path)
+			with self._lock:
+				self._stats['deduplicated'] += 1
+			return output_url
+
+		job = ImageJob(uuid.uuid4().hex, table, column, source_path, output_path, output_url, fallback_url)
+		with self._lock:
+			self._stats['submitted'] += 1
+		self.db.write(lambda conn: conn.execute('''
+			INSERT INTO image_jobs (id, target_table, target_column, source_path, output_path, output_url, fallback_url)
+			VALUES (?, ?, ?, ?, ?, ?, ?)
+		''', (job.id, table, column, job.source_path, output_path, output_url, fallback_url)))
+
+		if self.workers <= 0:
+			# 동기 모드: 요청 안에서 처리하고 최종 URL 을 바로 돌려준다
+			return self._finish(job, *self._run_inline(job), wait=True)
+
+		if has_request_context():
+			@after_this_request
+			def start(response):
+				self.start(job)
+				return response
+		else:
+			self.start(job)
+		return job.placeholder
+
+	def start(self, job):
+		with self._lock:
+			self._stats['running'] += 1
+		future = self._pool().submit(process_upload, job.source_path, job.output_path, job.output_url, self.profile,
+			MAX_SIZES.get((job.table, job.column), DEFAULT_MAX_SIZE))
+		future.add_done_callback(lambda done: self._finish(job, *self._outcome(done)))
+
+	@staticmethod
+	def _outcome(future):
+		try:
+			return future.result(), None
+		except Exception as e:
+			return None, e
+
+	def _run_inline(self, job):
+		try:
+			return process_upload(job.source_path, job.output_path, job.output_url, self.profile,
+				MAX_SIZES.get((job.table, job.column), DEFAULT_MAX_SIZE)), None
+		except Exception as e:
+			return None, e
+
+	def _finish(self, job, result, error, wait=False):
+		"""자리표시 URL 을 최종(또는 이전) URL 로 바꾸고 작업 상태 기록 - 바꾼 URL 을 돌려준다
+
+		행이 그사이 다른 사진으로 바뀌었으면 자리표시 URL 이 아니므로 건드리지 않는다.
+		"""
+		url = job.output_url if error is None else job.fallback_url
+		status = 'done' if error is None else 'failed'
+
+		def write(conn):
+			if result and result['variants']:
+				store_variants(conn, job.output_url, result['variants'])
+			conn.execute(f'UPDATE {job.table} SET {job.column} = ? WHERE {job.column} = ?', (url, job.placeholder))
+			conn.execute('''
+				UPDATE image_jobs SET status = ?, error = ?, finished_at = CURRENT_TIMESTAMP WHERE id = ?
+			''', (status, None if error is None else str(error), job.id))
+
+		with self._lock:
+			if not wait:
+				self._stats['running'] -= 1
+			self._stats[status] += 1
+			if result:
+				self._stats['processing_seconds'] += result['seconds']
+		if error is not None:
+			print(f"이미지 처리 실패 ({job.id}): {error}")
+
+		self._write(write, wait)
+		return url
+
+	def _write(self, write, wait=False):
+		if self.db.writer is not None:
+			future = self.db.writer.submit(write)
+			if wait:
+				future.result(self.db.pool.timeout)
+		else:
+			# 쓰기 큐가 꺼져 있으면 (요청 밖 스레드일 수 있으므로) 별도 연결로 커밋
+			conn = sqlite3.connect(self.database, timeout=30)
+			try:
+				with conn:
+					write(conn)
+			finally:
+				conn.close()
+
+	def incoming_path(self):
+		"""처리 전 원본을 둘 새 경로"""
+		os.makedirs(self.incoming_folder, exist_ok=True)
+		return os.path.join(self.incoming_folder, uuid.uuid4().hex)
+
+	def receive(self, files, max_files):
+		"""업로드 파일들(zip 이면 안의 사진들)을 처리 전 폴더에 저장 - [(원래 이름, 경로), ...]
+
+		zip 은 압축을 한 항목씩 풀어 바로 파일로 쓴다. max_files 장을 넘으면 ValueError.
+		"""
+		received = []
+
+		def add(name, save):
+			if len(received) >= max_files:
+				for _, path in received:
+					os.remove(path)
+				raise ValueError(f'한 번에 {max_files}장까지 올릴 수 있습니다.')
+			path = self.incoming_path()
+			save(path)
+			received.append((name, path))
+
+		for file in files:
+			if not file or not file.filename:
+				continue
+			ext = os.path.splitext(file.filename)[1].lower()
+			if ext == '.zip':
+				with zipfile.ZipFile(file.stream) as archive:
+					for info in archive.infolist():
+						name = os.path.basename(info.filename)
+						if (info.is_dir() or name.startswith('.') or '__MACOSX' in info.filename
+								or os.path.splitext(name)[1].lower() not in UPLOAD_EXTENSIONS):
+							continue
+						add(name, lambda path, info=info: _extract(archive, info, path))
+			elif ext in UPLOAD_EXTENSIONS:
+				add(file.filename, lambda path, file=file: save_upload(file, path))
+		return received
+
+	def process_batch(self, source_paths, output_folder, url_prefix):
+		"""받아 둔 원본 여러 장을 batch_workers 개 프로세스로 동시에 최적화한다 (요청 안에서 끝날 때까지 기다림)
+
+		결과 파일은 output_folder/<원본 해시>.jpg 이며, 이미 있는 사진(같은 배치 안의 중복 포함)은
+		다시 처리하지 않는다. 원본은 처리 후 지운다. 입력 순서대로 (URL 또는 None, 오류 또는 None) 목록을 돌려준다.
+		"""
+		os.makedirs(output_folder, exist_ok=True)
+		results = [None] * len(source_paths)
+		pending = {}  # 처리할 결과 파일 -> (원본, 결과를 기다리는 입력 위치들)
+		for i, source_path in enumerate(source_paths):
+			filename = file_hash(source_path) + '.jpg'
+			output_path = os.path.join(output_folder, filename)
+			if output_path in pending:
+				pending[output_path][1].append(i)
+				os.remove(source_path)
+			elif os.path.exists(output_path):
+				results[i] = (f'{url_prefix}/{filename}', None)
+				os.remove(source_path)
+			else:
+				pending[output_path] = (source_path, [i])
+		with self._lock:
+			self._stats['submitted'] += len(pending)
+			self._stats['deduplicated'] += len(source_paths) - len(pending)
+
+		def record(output_path, outcome):
+			result, error = outcome
+			if error is not None:
+				print(f"이미지 처리 실패 ({pending[output_path][0]}): {error}")
+				source_path = pending[output_path][0]
+				if os.path.exists(source_path):
+					os.remove(source_path)
+			url = f'{url_prefix}/{os.path.basename(output_path)}' if error is None else None
+			for i in pending[output_path][1]:
+				results[i] = (url, error)
+			with self._lock:
+				self._stats['done' if error is None else 'failed'] += 1
+				if result:
+					self._stats['processing_seconds'] += result['seconds']
+
+		if self.batch_workers <= 1 or len(pending) <= 1:
+			for output_path, (source_path, _) in pending.items():
+				try:
+					record(output_path, (process_upload(source_path, output_path, profile=self.profile), None))
+				except Exception as e:
+					record(output_path, (None, e))
+			return results
+
+		# 요청 하나가 코어를 모두 쓰는 짧은 작업이므로 배치마다 풀을 만들고 닫는다
+		context = multiprocessing.get_context('forkserver' if os.name == 'posix' else 'spawn')
+		with ProcessPoolExecutor(max_workers=min(self.batch_workers, len(pending)), mp_context=context) as executor:
+			futures = {executor.submit(process_upload, source_path, output_path, None, self.profile): output_path
+				for output_path, (source_path, _) in pending.items()}
+			for future in as_completed(futures):
+				record(futures[future], self._outcome(future))
+		return results
+
+	def submit_variants(self, file_path, url):
+		"""이미 있는 이미지(갤러리 등)의 반응형 변형만 만든다 - 끝나면 image_variants 에 기록"""
+		def store(result, error):
+			if error is not None:
+				print(f"이미지 변형 생성 실패 ({url}): {error}")
+			elif result:
+				self._write(lambda conn: store_variants(conn, url, result))
+
+		if self.workers <= 0:
+			try:
+				store(make_variants(file_path, url), None)
+			except Exception as e:
+				store(None, e)
+			return
+		future = self._pool().submit(make_variants, file_path, url)
+		future.add_done_callback(lambda done: store(*self._outcome(done)))
+
+	def backfill_variants(self, conn, static_folder, sources, force=False):
+		"""sources(URL 목록) 중 변형이 없는 로컬 정적 이미지의 변형을 만든다 - (생성 수, 건너뜀 수)"""
+		existing = {row['source_url'] for row in conn.execute('SELECT DISTINCT source_url FROM image_variants')}
+		made = skipped = 0
+		for url in dict.fromkeys(sources):
+			path = static_path(static_folder, url)
+			if not path or not os.path.exists(path) or (url in existing and not force):
+				skipped += 1
+				continue
+			try:
+				variants = make_variants(path, url)
+			except Exception as e:
+				print(f"이미지 변형 생성 실패 ({url}): {e}")
+				skipped += 1
+				continue
+			self._write(lambda c, url=url, variants=variants: store_variants(c, url, variants), wait=True)
+			made += 1
+		return made, skipped
+
+	def static_candidates(self, conn, static_folder, folders, min_bytes):
+		"""일괄 최적화할 정적 이미지 - [(URL, 경로, 바이트), ...]
+
+		min_bytes 보다 작은 파일, 내용 해시 이름(이미 최적화한 업로드·결과), 반응형 변형,
+		이전 실행에서 끝난(static_backfill 에 done/kept 로 기록된) 파일은 뺀다.
+		"""
+		finished = {row['source_url'] for row in conn.execute(
+			"SELECT source_url FROM static_backfill WHERE status IN ('done', 'kept')")}
+		candidates = []
+		for folder in folders:
+			directory = os.path.join(static_folder, folder)
+			for name in sorted(os.listdir(directory)):
+				path = os.path.join(directory, name)
+				url = f"/static/{folder.strip('/')}/{name}"
+				if (os.path.splitext(name)[1].lower() not in ('.jpg', '.jpeg', '.png') or is_content_addressed(name)
+						or VARIANT_NAME.search(name) or url in finished or not os.path.isfile(path)):
+					continue
+				size = os.path.getsize(path)
+				if size >= min_bytes:
+					candidates.append((url, path, size))
+		return candidates
+
+	def backfill_static(self, candidates, max_size=1920, min_saving=0.1, on_result=None):
+		"""candidates 를 batch_workers 개 프로세스로 최적화하고, 한 장씩 끝나는 대로 DB 에 반영한다
+
+		결과 파일은 원본 옆의 <원본 해시>.jpg 이다. 한 장의 반영(IMAGE_COLUMNS 의 참조를 새 URL 로 바꾸기,
+		변형 기록, static_backfill 기록)은 한 트랜잭션이므로 중간에 멈춰도 다시 실행하면 남은 파일부터 이어 간다.
+		on_result(url, result, error) 는 파일마다 호출된다.
+		"""
+		def record(url, output_url, outcome):
+			result, error = outcome
+			if error is not None:
+				print(f"정적 이미지 최적화 실패 ({url}): {error}")
+
+			def write(conn):
+				if result and result['status'] == 'done':
+					for table, column in sorted(IMAGE_COLUMNS):
+						conn.execute(f'UPDATE {table} SET {column} = ? WHERE {column} = ?', (output_url, url))
+					store_variants(conn, output_url, result['variants'])
+				conn.execute('''
+					INSERT OR REPLACE INTO static_backfill (source_url, output_url, status, bytes_before, bytes_after, error, finished_at)
+					VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+				''', (url, output_url if result and result['status'] == 'done' else None, result['status'] if result else 'failed',
+					result['bytes_before'] if result else None, result['bytes_after'] if result else None,
+					str(error) if error is not None else result['reason']))
+
+			self._write(write, wait=True)
+			if on_result:
+				on_result(url, result, error)
+
+		jobs = {}
+		for url, path, _ in candidates:
+			filename = file_hash(path) + '.jpg'
+			jobs[url] = (path, os.path.join(os.path.dirname(path), filename), url.rsplit('/', 1)[0] + '/' + filename)
+
+		if self.batch_workers <= 1 or len(jobs) <= 1:
+			for url, (path, output_path, output_url) in jobs.items():
+				try:
+					outcome = optimize_asset(path, output_path, output_url, self.profile, max_size, min_saving), None
+				except Exception as e:
+					outcome = None, e
+				record(url, output_url, outcome)
+			return
+
+		context = multiprocessing.get_context('forkserver' if os.name == 'posix' else 'spawn')
+		with ProcessPoolExecutor(max_workers=min(self.batch_workers, len(jobs)), mp_context=context) as executor:
+			futures = {executor.submit(optimize_asset, path, output_path, output_url, self.profile, max_size, min_saving): url
+				for url, (path, output_path, output_url) in jobs.items()}
+			for future in as_completed(futures):
+				url = futures[future]
+				record(url, jobs[url][2], self._outcome(future))
+
+	def status(self, conn, job_id):
+		"""작업 상태 (없으면 None) - url 은 끝난 뒤 행에 들어간 URL"""
+		row = conn.execute('SELECT status, output_url, fallback_url, error FROM image_jobs WHERE id = ?', (job_id,)).fetchone()
+		if row is None:
+			return None
+		url = {'done': row['output_url'], 'failed': row['fallback_url']}.get(row['status'])
+		return {'status': row['status'], 'url': url, 'error': row['error']}
+
+	def retry(self, conn, stale_minutes=5):
+		"""끝나지 않은(queued) 작업을 현재 프로세스에서 다시 처리 - 결과 (성공 수, 실패 수)
+
+		워커가 아직 처리 중일 수 있는 최근 작업(stale_minutes 이내)은 건너뛴다.
+		"""
+		rows = conn.execute('''
+			SELECT * FROM image_jobs
+			WHERE status = 'queued' AND created_at < datetime('now', ?)
+			ORDER BY created_at
+		''', (f'-{int(stale_minutes)} minutes',)).fetchall()
+		done = failed = 0
+		for row in rows:
+			job = ImageJob.from_row(row)
+			if os.path.exists(job.source_path):
+				result, error = self._run_inline(job)
+			else:
+				result, error = None, FileNotFoundError(job.source_path)
+			self._finish(job, result, error, wait=True)
+			done, failed = (done + 1, failed) if error is None else (done, failed + 1)
+		return done, failed
+
+	def shutdown(self, wait=True):
+		"""프로세스 풀 종료 (진행 중인 작업은 wait=True 면 끝날 때까지 기다린다)"""
+		with self._lock:
+			executor, self._executor = self._executor, None
+		if executor is not None:
+			executor.shutdown(wait=wait)
+
+	def stats(self):
+		with self._lock:
+			stats = dict(self._stats)
+		stats['workers'] = self.workers
+		stats['processing_seconds'] = round(stats['processing_seconds'], 3)
+		return stats
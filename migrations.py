@@ -0,0 +1,665 @@
+"""
+스키마 마이그레이션
+schema_version 테이블에 적용된 버전을 기록하고, 순서대로 정의된 마이그레이션 중
+아직 적용되지 않은 것만 실행한다. 데이터베이스가 최신이면 버전 확인 한 번으로 끝난다.
+
+새 마이그레이션은 파일 끝에 다음 버전 번호로 추가한다. 이미 배포된 마이그레이션은 수정하지 않는다.
+"""
+
+import logging
+import sqlite3
+
+import schedule_repo
+import search
+
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+	"""마이그레이션 등록 데코레이터 (함수는 cursor 를 인자로 받는다)"""
+	def register(func):
+		if MIGRATIONS and version != MIGRATIONS[-1][0] + 1:
+			raise ValueError(f'마이그레이션 버전은 순서대로 증가해야 합니다: {version}')
+		MIGRATIONS.append((version, description, func))
+		return func
+	return register
+
+
+def _has_column(cursor, table, column):
+	return any(row[1] == column for row in cursor.execute(f'PRAGMA table_info({table})'))
+
+
+def _add_column(cursor, table, column, definition):
+	"""컬럼이 없을 때만 추가"""
+	if not _has_column(cursor, table, column):
+		cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def latest_version():
+	"""정의된 마이그레이션 중 가장 높은 버전"""
+	return MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+	"""적용된 스키마 버전 (schema_version 테이블이 없으면 0)"""
+	try:
+		row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+	except sqlite3.OperationalError:
+		return 0
+	return row[0] or 0
+
+
+def migrate(conn, target=None):
+	"""적용되지 않은 마이그레이션을 순서대로 실행하고, 적용한 (버전, 설명) 목록을 돌려준다
+
+	BEGIN IMMEDIATE 로 쓰기 잠금을 잡은 뒤 버전을 다시 확인하므로, 여러 프로세스가
+	동시에 호출해도 한 번만 적용된다. 전체가 하나의 트랜잭션이라 실패하면 모두 롤백된다.
+	"""
+	target = latest_version() if target is None else target
+	if current_version(conn) >= target:
+		return []
+
+	applied = []
+	cursor = conn.cursor()
+	cursor.execute('BEGIN IMMEDIATE')
+	try:
+		cursor.execute('''
+			CREATE TABLE IF NOT EXISTS schema_version (
+				version INTEGER PRIMARY KEY,
+				description TEXT NOT NULL,
+				applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+			)
+		''')
+		version = current_version(conn)
+		for number, description, func in MIGRATIONS:
+			if version < number <= target:
+				func(cursor)
+				cursor.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+					(number, description))
+				applied.append((number, description))
+		conn.commit()
+	except Exception:
+		conn.rollback()
+		raise
+	return applied
+
+
+@migration(1, '기본 스키마 및 기본 데이터')
+def _initial_schema(cursor):
+	"""기존 init_db() 의 테이블 생성, 컬럼 추가, 기본 데이터"""
+	# 공지사항 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS notices (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			title TEXT NOT NULL,
+			content TEXT NOT NULL,
+			author TEXT NOT NULL,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 일정 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS schedules (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			title TEXT NOT NULL,
+			location TEXT,
+			event_date DATE NOT NULL,
+			description TEXT,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 문의 메시지 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS contact_messages (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			name TEXT,
+			email TEXT NOT NULL,
+			message TEXT NOT NULL,
+			type TEXT DEFAULT 'contact',
+			is_read INTEGER DEFAULT 0,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 페이지 섹션 테이블 (개선된 버전)
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS page_sections (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			page_name TEXT NOT NULL,
+			section_id TEXT NOT NULL,
+			section_type TEXT NOT NULL,
+			title TEXT,
+			content TEXT,
+			image_url TEXT,
+			link_url TEXT,
+			link_text TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			UNIQUE(page_name, section_id)
+		)
+	''')
+	
+	# 기본 페이지 섹션 생성
+	default_sections = [
+		('home', 'about', 'text', 'About Us', '가상블랙이글스는 대한민국 블랙이글스의 다양한 특수비행을 통해 고도의 비행기량을 뽐내는 대한민국 가상 특수비행팀입니다.', None, None, None, 1, 1),
+		('about', 'intro', 'text', '팀 소개', '블랙이글스는 대한민국 공군의 자랑입니다.', None, None, None, 1, 1),
+		('contact', 'discord', 'text', 'Contact Us', 'Discord ㅣ Johnson#4553', None, None, None, 1, 1),
+	]
+	
+	for section in default_sections:
+		cursor.execute('''
+			INSERT OR IGNORE INTO page_sections 
+			(page_name, section_id, section_type, title, content, image_url, link_url, link_text, order_num, is_active)
+			VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+		''', section)
+	
+	# 배너 설정 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS banner_settings (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			page_name TEXT UNIQUE NOT NULL,
+			background_image TEXT,
+			title TEXT NOT NULL,
+			subtitle TEXT,
+			description TEXT,
+			button_text TEXT,
+			button_link TEXT,
+			title_font TEXT DEFAULT 'Arial, sans-serif',
+			title_color TEXT DEFAULT '#ffffff',
+			subtitle_color TEXT DEFAULT '#ffffff',
+			description_color TEXT DEFAULT '#ffffff',
+			vertical_position TEXT DEFAULT 'center',
+			padding_top INTEGER DEFAULT 250,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 기존 테이블에 컬럼 추가 (이미 있으면 무시)
+	_add_column(cursor, 'banner_settings', 'vertical_position', "TEXT DEFAULT 'center'")
+	_add_column(cursor, 'banner_settings', 'padding_top', 'INTEGER DEFAULT 250')
+	
+	# 기본 홈페이지 배너 설정
+	cursor.execute('''
+		INSERT OR IGNORE INTO banner_settings (page_name, background_image, title, subtitle, description, button_text, button_link)
+		VALUES ('home', '/static/images/hero.jpg', 'Black Eagles', 'Republic Of Korea AirForce', 
+		        '가상블랙이글스는 대한민국 블랙이글스의 다양한 특수비행을 통해 고도의 비행기량을 뽐내는 대한민국 가상 특수비행팀입니다.', 
+		        'more', '#about')
+	''')
+	
+	# 조종사 정보 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS pilots (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			number INTEGER NOT NULL,
+			position TEXT NOT NULL,
+			callsign TEXT NOT NULL,
+			generation TEXT NOT NULL,
+			aircraft TEXT NOT NULL,
+			photo_url TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 기본 조종사 데이터 삽입 (중복 방지)
+	default_pilots = [
+		(1, 'LEADER', 'Bulta', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 1, 1),
+		(2, 'LEFT WING', 'Fox9', 'VBE 2기', 'F-18', '/static/members/moon.jpeg', 2, 1),
+		(3, 'RIGHT WING', 'Ace', 'VBE 1기', 'F-18', '/static/members/moon.jpeg', 3, 1),
+		(4, 'Slot', 'Moon', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 4, 1),
+		(5, 'SYNCHRO-1', 'ZeroDistance', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 5, 1),
+		(6, 'SYNCHRO-2', 'Lewis', 'VBE 1기', 'F-5', '/static/members/Lewis.jpg', 6, 1),
+		(7, 'SOLO-1', 'Sonic', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 7, 1),
+		(8, 'SOLO-2', 'Strike', 'VBE 1기', 'F-5', '/static/members/moon.jpeg', 8, 1),
+	]
+	
+	# 이미 데이터가 있는지 확인
+	existing_count = cursor.execute('SELECT COUNT(*) FROM pilots').fetchone()[0]
+	
+	# 데이터가 없을 때만 기본 데이터 삽입
+	if existing_count == 0:
+		for pilot in default_pilots:
+			cursor.execute('''
+				INSERT INTO pilots 
+				(number, position, callsign, generation, aircraft, photo_url, order_num, is_active)
+				VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+			''', pilot)
+	
+	# 홈 콘텐츠 테이블 (유튜브, SNS 피드 등)
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS home_contents (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			content_type TEXT NOT NULL,
+			title TEXT,
+			content_data TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 기본 유튜브 콘텐츠 삽입
+	cursor.execute('''
+		INSERT OR IGNORE INTO home_contents (id, content_type, title, content_data, order_num, is_active)
+		VALUES (1, 'youtube', 'Latest Video', 'https://www.youtube.com/embed/dQw4w9WgXcQ', 1, 1)
+	''')
+	
+	# 팀소개 섹션 테이블 (개요, 항공기 등)
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS about_sections (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			section_type TEXT NOT NULL,
+			title TEXT,
+			content TEXT,
+			-- 언어 구분 (ko / en). 기존 DB에는 없을 수 있으므로 아래에서 ALTER TABLE 로 추가
+			-- lang TEXT NOT NULL DEFAULT 'ko',
+			image_url TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# about_sections 테이블에 lang 컬럼이 없을 수 있으므로 동적으로 추가
+	_add_column(cursor, 'about_sections', 'lang', "TEXT DEFAULT 'ko'")
+	
+	# 기본 개요 섹션 추가
+	cursor.execute('''
+		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
+		VALUES (1, 'overview', '가상 블랙이글스 소개', 
+		'가상 블랙이글스는 DCS World에서 활동하는 대한민국 가상 공군 특수비행팀입니다. 실제 블랙이글스의 정신과 전통을 계승하며, 정교한 편대비행과 에어쇼를 통해 뛰어난 비행실력을 선보입니다.', 
+		0, 1)
+	''')
+	
+	cursor.execute('''
+		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
+		VALUES (2, 'mission', '임무', 
+		'우리의 임무는 대한민국 공군의 우수성을 전 세계에 알리고, 가상 비행 시뮬레이션을 통해 항공에 대한 관심과 이해를 높이는 것입니다. 또한 팀원들의 비행 실력 향상과 팀워크 강화를 목표로 합니다.', 
+		1, 1)
+	''')
+	
+	cursor.execute('''
+		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
+		VALUES (3, 'aircraft_intro', 'T-50B 골든이글', 
+		'T-50B는 대한민국이 자체 개발한 초음속 고등훈련기로, 블랙이글스 팀이 사용하는 항공기입니다. 우수한 기동성과 안정성을 자랑하며, 다양한 편대비행 기동을 수행할 수 있습니다.', 
+		2, 1)
+	''')
+	
+	cursor.execute('''
+		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, image_url, order_num, is_active)
+		VALUES (4, 'aircraft_specs', 'T-50B 제원', 
+		'최대속도: 마하 1.5|전투행동반경: 1,851km|최대이륙중량: 12,300kg|엔진: F404-GE-102 터보팬|승무원: 2명|무장: 20mm 기관포, 공대공 미사일',
+		'/static/images/t50b.jpg', 
+		3, 1)
+	''')
+	
+	cursor.execute('''
+		INSERT OR IGNORE INTO about_sections (id, section_type, title, content, order_num, is_active)
+		VALUES (5, 'aircraft_features', '특징', 
+		'우수한 기동성|높은 안정성|효율적인 연료 소비|조종사 친화적 설계|다목적 운용 가능', 
+		4, 1)
+	''')
+	
+	# 전대장 인사말 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS commander_greeting (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			name TEXT NOT NULL,
+			-- 언어 구분 (ko / en). 기존 DB에는 없을 수 있으므로 아래에서 ALTER TABLE 로 추가
+			-- lang TEXT NOT NULL DEFAULT 'ko',
+			rank TEXT NOT NULL,
+			callsign TEXT NOT NULL,
+			generation TEXT NOT NULL,
+			aircraft TEXT NOT NULL,
+			photo_url TEXT,
+			greeting_text TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# commander_greeting 테이블에 lang 컬럼이 없을 수 있으므로 동적으로 추가
+	_add_column(cursor, 'commander_greeting', 'lang', "TEXT DEFAULT 'ko'")
+	
+	# 기본 전대장 데이터 삽입 (데이터가 없을 때만)
+	existing_commanders = cursor.execute('SELECT COUNT(*) as count FROM commander_greeting').fetchone()[0]
+	if existing_commanders == 0:
+		cursor.execute('''
+			INSERT INTO commander_greeting (name, rank, callsign, generation, aircraft, photo_url, greeting_text, order_num, is_active)
+			VALUES ('Bulta', 'COMMANDER', '#1 Bulta', 'VBE 1기', 'F-5', '/static/images/default-pilot.jpg', 
+			'안녕하십니까. 가상 블랙이글스 전대장입니다. 우리 팀은 대한민국 공군의 자랑스러운 전통을 계승하며, 최고의 비행 실력을 갖춘 정예 조종사들로 구성되어 있습니다.', 
+			1, 1)
+		''')
+
+	# 정비사 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS maintenance_crew (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			name TEXT NOT NULL,
+			role TEXT,
+			callsign TEXT,
+			photo_url TEXT,
+			bio TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+
+	# 후보자 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS candidates (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			name TEXT NOT NULL,
+			callsign TEXT,
+			photo_url TEXT,
+			bio TEXT,
+			order_num INTEGER DEFAULT 0,
+			is_active INTEGER DEFAULT 1,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+
+	# 사진 게시판 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS gallery (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			title TEXT NOT NULL,
+			description TEXT,
+			image_url TEXT NOT NULL,
+			upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			is_active INTEGER DEFAULT 1,
+			order_num INTEGER DEFAULT 0,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 기본 샘플 이미지 추가
+	cursor.execute('''
+		INSERT OR IGNORE INTO gallery (id, title, description, image_url, order_num, is_active)
+		VALUES (1, '편대비행 훈련', 'T-50B 4기 편대비행 훈련 모습', '/static/Picture/20251207_173919_section_formation.png', 1, 1)
+	''')
+	
+	cursor.execute('''
+		INSERT OR IGNORE INTO gallery (id, title, description, image_url, order_num, is_active)
+		VALUES (2, '에어쇼 공연', '2024 서울 에어쇼 블랙이글스 공연', '/static/Picture/Formation.png', 2, 1)
+	''')
+	
+	# 사이트 이미지 관리 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS site_images (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			image_key TEXT UNIQUE NOT NULL,
+			image_name TEXT NOT NULL,
+			image_path TEXT NOT NULL,
+			description TEXT,
+			category TEXT NOT NULL,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	# 기본 이미지 키 등록
+	default_images = [
+		('hero_banner', '홈 배너 이미지', '/static/images/hero.jpg', '메인 페이지 상단 배너', 'home'),
+		('about_banner', '팀소개 배너 이미지', '/static/images/hero.jpg', '팀소개 페이지 상단 배너', 'about'),
+		('default_pilot', '기본 파일럿 이미지', '/static/members/moon.jpeg', '파일럿 기본 프로필', 'about'),
+		('t50b_main', 'T-50B 메인 이미지', '/static/Picture/Formation.png', '항공기 소개 이미지', 'about'),
+	]
+	
+	for img_key, img_name, img_path, desc, cat in default_images:
+		cursor.execute('''
+			INSERT OR IGNORE INTO site_images (image_key, image_name, image_path, description, category)
+			VALUES (?, ?, ?, ?, ?)
+		''', (img_key, img_name, img_path, desc, cat))
+	
+	# 기존 DB에 이미 t50b_main 이 있다면 경로를 실제 존재하는 이미지로 교체
+	cursor.execute('''
+		UPDATE site_images
+		SET image_path = '/static/Picture/Formation.png'
+		WHERE image_key = 't50b_main'
+	''')
+	
+	# 실시간 채팅 테이블
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS chat_sessions (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			session_id TEXT UNIQUE NOT NULL,
+			user_name TEXT,
+			user_email TEXT,
+			status TEXT DEFAULT 'active',
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS chat_messages (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			session_id TEXT NOT NULL,
+			sender_type TEXT NOT NULL,
+			sender_name TEXT,
+			message TEXT NOT NULL,
+			is_read INTEGER DEFAULT 0,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			FOREIGN KEY (session_id) REFERENCES chat_sessions(session_id)
+		)
+	''')
+
+
+@migration(2, '조회용 보조 인덱스')
+def _secondary_indexes(cursor):
+	"""자주 쓰는 조회용 보조 인덱스"""
+	# scripts/audit_query_plans.py 로 실행 계획 확인
+	indexes = [
+		'CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created ON chat_messages (session_id, created_at)',
+		'CREATE INDEX IF NOT EXISTS idx_chat_messages_sender_read ON chat_messages (sender_type, is_read)',
+		'CREATE INDEX IF NOT EXISTS idx_chat_sessions_updated ON chat_sessions (updated_at)',
+		'CREATE INDEX IF NOT EXISTS idx_chat_sessions_status ON chat_sessions (status)',
+		'CREATE INDEX IF NOT EXISTS idx_contact_messages_type_created ON contact_messages (type, created_at)',
+		'CREATE INDEX IF NOT EXISTS idx_contact_messages_created ON contact_messages (created_at)',
+		'CREATE INDEX IF NOT EXISTS idx_contact_messages_is_read ON contact_messages (is_read)',
+		'CREATE INDEX IF NOT EXISTS idx_page_sections_page_active_order ON page_sections (page_name, is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_pilots_active_order ON pilots (is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_maintenance_crew_active_order ON maintenance_crew (is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_candidates_active_order ON candidates (is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_commander_greeting_lang_active_order ON commander_greeting (lang, is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_about_sections_lang_active_order ON about_sections (lang, is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_home_contents_active_order ON home_contents (is_active, order_num)',
+		'CREATE INDEX IF NOT EXISTS idx_gallery_active_order ON gallery (is_active, order_num, upload_date)',
+		'CREATE INDEX IF NOT EXISTS idx_notices_created ON notices (created_at)',
+		'CREATE INDEX IF NOT EXISTS idx_schedules_event_date ON schedules (event_date)',
+	]
+	for statement in indexes:
+		cursor.execute(statement)
+
+
+
+# 내용이 바뀌면 공개 페이지 캐시를 무효화해야 하는 테이블
+VERSIONED_TABLES = (
+	'banner_settings', 'page_sections', 'home_contents', 'site_images', 'pilots',
+	'maintenance_crew', 'candidates', 'commander_greeting', 'about_sections',
+	'notices', 'schedules', 'gallery',
+)
+
+
+@migration(3, '테이블 변경 버전(data_versions)과 갱신 트리거')
+def _data_versions(cursor):
+	"""테이블마다 변경 버전을 두고 INSERT/UPDATE/DELETE 트리거로 증가시킨다
+
+	쓰기와 같은 트랜잭션에서 증가하므로, 어느 워커(또는 CLI)에서 바꾸든 모든 워커가
+	다음 요청에서 버전 비교만으로 변경을 알아챌 수 있다.
+	"""
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS data_versions (
+			table_name TEXT PRIMARY KEY,
+			version INTEGER NOT NULL DEFAULT 0
+		)
+	''')
+	for table in VERSIONED_TABLES:
+		_version_triggers(cursor, table)
+
+
+def _version_triggers(cursor, table):
+	"""table 의 INSERT/UPDATE/DELETE 마다 data_versions 버전을 올리는 트리거"""
+	cursor.execute('INSERT OR IGNORE INTO data_versions (table_name, version) VALUES (?, 0)', (table,))
+	for event in ('INSERT', 'UPDATE', 'DELETE'):
+		cursor.execute(f'''
+			CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+			AFTER {event} ON {table}
+			BEGIN
+				UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}';
+			END
+		''')
+
+
+@migration(4, '채팅 세션 요약 컬럼(읽지 않은 수, 마지막 메시지, 메시지 수)')
+def _chat_session_summary(cursor):
+	"""관리자 채팅 목록이 세션마다 메시지를 다시 세지 않도록 요약 값을 세션 행에 둔다
+
+	값은 메시지를 쓰는 핸들러가 같은 트랜잭션에서 갱신한다. 여기서는 기존 데이터로 한 번 채운다.
+	"""
+	_add_column(cursor, 'chat_sessions', 'unread_user_count', 'INTEGER NOT NULL DEFAULT 0')
+	_add_column(cursor, 'chat_sessions', 'message_count', 'INTEGER NOT NULL DEFAULT 0')
+	_add_column(cursor, 'chat_sessions', 'last_message', 'TEXT')
+	_add_column(cursor, 'chat_sessions', 'last_message_at', 'TIMESTAMP')
+	cursor.execute('''
+		UPDATE chat_sessions SET
+			unread_user_count = (SELECT COUNT(*) FROM chat_messages
+				WHERE session_id = chat_sessions.session_id AND sender_type = 'user' AND is_read = 0),
+			message_count = (SELECT COUNT(*) FROM chat_messages WHERE session_id = chat_sessions.session_id),
+			last_message = (SELECT message FROM chat_messages WHERE session_id = chat_sessions.session_id
+				ORDER BY created_at DESC, id DESC LIMIT 1),
+			last_message_at = (SELECT created_at FROM chat_messages WHERE session_id = chat_sessions.session_id
+				ORDER BY created_at DESC, id DESC LIMIT 1)
+	''')
+	# 목록의 키셋 페이지네이션 (updated_at, id) 은 idx_chat_sessions_updated 가 그대로 쓰인다 (id 는 rowid)
+
+
+@migration(5, '목록 키셋 페이지네이션용 정렬 인덱스')
+def _pagination_indexes(cursor):
+	"""목록 정렬 순서와 같은 인덱스 - 페이지마다 전체를 정렬하지 않고 인덱스에서 바로 잘라 읽는다
+
+	갤러리는 order_num ASC, upload_date DESC 로 방향이 섞여 있어 내림차순 컬럼을 가진 인덱스가 필요하다.
+	공지(created_at), 일정(event_date), 문의(created_at / type, created_at), 채팅 세션(updated_at) 은
+	기존 인덱스 + rowid(id) 로 충분하다.
+	"""
+	# 예전 행의 type NULL 을 기본값으로 맞춰 문의 필터가 (type, created_at) 인덱스 범위 하나로 끝나게 한다
+	cursor.execute("UPDATE contact_messages SET type = 'contact' WHERE type IS NULL")
+	cursor.execute('DROP INDEX IF EXISTS idx_gallery_active_order')
+	cursor.execute('CREATE INDEX IF NOT EXISTS idx_gallery_active_order ON gallery (is_active, order_num, upload_date DESC, id DESC)')
+	cursor.execute('CREATE INDEX IF NOT EXISTS idx_gallery_order ON gallery (order_num, upload_date DESC, id DESC)')
+
+
+@migration(6, '업로드 사진 처리 작업(image_jobs)')
+def _image_jobs(cursor):
+	"""관리자 업로드 사진의 백그라운드 최적화 작업 - 처리 중에는 행이 작업별 자리표시 URL 을 가리킨다"""
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS image_jobs (
+			id TEXT PRIMARY KEY,
+			target_table TEXT NOT NULL,
+			target_column TEXT NOT NULL,
+			source_path TEXT NOT NULL,
+			output_path TEXT NOT NULL,
+			output_url TEXT NOT NULL,
+			fallback_url TEXT,
+			status TEXT NOT NULL DEFAULT 'queued',
+			error TEXT,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			finished_at TIMESTAMP
+		)
+	''')
+	cursor.execute('CREATE INDEX IF NOT EXISTS idx_image_jobs_status_created ON image_jobs (status, created_at)')
+
+
+@migration(7, '반응형 이미지 변형(image_variants)')
+def _image_variants(cursor):
+	"""원본 이미지 URL 별 너비·형식 변형 - 템플릿의 picture() 가 srcset 을 만들 때 사용"""
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS image_variants (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			source_url TEXT NOT NULL,
+			format TEXT NOT NULL,
+			width INTEGER NOT NULL,
+			height INTEGER NOT NULL,
+			url TEXT NOT NULL,
+			bytes INTEGER NOT NULL,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			UNIQUE (source_url, format, width)
+		)
+	''')
+	# 변형이 추가되면 사진을 보여주는 공개 페이지 캐시와 워커의 변형 조회 테이블을 갱신
+	_version_triggers(cursor, 'image_variants')
+
+
+@migration(8, '정적 이미지 일괄 최적화 기록(static_backfill)')
+def _static_backfill(cursor):
+	"""flask image-backfill 이 처리한 정적 이미지 - 다시 실행하면 끝난 파일은 건너뛴다"""
+	cursor.execute('''
+		CREATE TABLE IF NOT EXISTS static_backfill (
+			source_url TEXT PRIMARY KEY,
+			output_url TEXT,
+			status TEXT NOT NULL,
+			bytes_before INTEGER,
+			bytes_after INTEGER,
+			error TEXT,
+			finished_at TIMESTAMP
+		)
+	''')
+
+
+@migration(9, '전문 검색 색인(notices_fts, schedules_fts, contact_messages_fts)')
+def _search_indexes(cursor):
+	"""공지사항·일정·문의 메시지의 FTS5 trigram 색인과 동기화 트리거 - 기존 행도 색인한다"""
+	for table in ('notices', 'schedules', 'contact_messages'):
+		search.create_index(cursor, table)
+
+
+@migration(10, '일정 표준 스키마(event_date TEXT, 장소 인덱스) - schedule.py CLI 와 공유')
+def _canonical_schedules(cursor):
+	"""schedules 를 schedule_repo.SCHEMA 로 다시 만든다 (id, 등록/수정 시각 유지)
+
+	예전 event_date DATE 컬럼은 NUMERIC 선호 타입이라 CLI 의 TEXT 스키마와 달랐다. 테이블을 바꾸면
+	트리거와 인덱스가 함께 지워지므로 data_versions 트리거, 검색 색인 트리거, 인덱스를 다시 만든다.
+	예전 관리자 폼은 날짜를 검증하지 않았으므로 날짜는 schedule_repo.normalize_date() 로 'YYYY-MM-DD' 로 바꾸고,
+	바꿀 수 없는 값은 그대로 두고 일정 id 를 경고로 남긴다 (정렬/범위 조회/통계에서 어긋나므로 직접 고쳐야 한다).
+	"""
+	schedule_repo.register_functions(cursor.connection)
+	declared = {row[1]: row[2] for row in cursor.execute('PRAGMA table_info(schedules)')}
+	if declared.get('event_date', '').upper() != 'TEXT':
+		cursor.execute(schedule_repo.SCHEMA.replace('schedules', 'schedules_canonical', 1))
+		selected = ['COALESCE(normalize_date(event_date), event_date)' if column == 'event_date' else column
+			for column in schedule_repo.COLUMNS]
+		cursor.execute(f'''
+			INSERT INTO schedules_canonical ({', '.join(schedule_repo.COLUMNS)})
+			SELECT {', '.join(selected)} FROM schedules
+		''')
+		cursor.execute('DROP TABLE schedules')
+		cursor.execute('ALTER TABLE schedules_canonical RENAME TO schedules')
+		_version_triggers(cursor, 'schedules')
+		search.create_index(cursor, 'schedules')
+	else:
+		# 한 번뿐인 전체 갱신 (마이그레이션 4 의 백필과 같음)
+		cursor.execute('UPDATE schedules SET event_date = COALESCE(normalize_date(event_date), event_date)')
+	for statement in schedule_repo.INDEXES:
+		cursor.execute(statement)
+	invalid = cursor.execute('SELECT id, event_date FROM schedules WHERE normalize_date(event_date) IS NULL').fetchall()
+	if invalid:
+		logger.warning('schedules: YYYY-MM-DD 로 바꿀 수 없는 event_date %d건 (id, 값): %s', len(invalid), invalid)
@@ -0,0 +1,94 @@
+"""
+공개 페이지 응답 캐시
+관리자가 내용을 바꿀 때만 달라지는 공개 페이지(/, /about, /gallery ...)의 렌더링 결과를
+(라우트, 언어, 페이지 커서) 단위로 보관한다. 각 페이지가 읽는 테이블을 선언해 두고, 저장 당시의
+data_versions 값과 현재 값을 비교해 하나라도 바뀌었으면 다시 렌더링한다.
+버전은 트리거로 쓰기와 같은 트랜잭션에서 증가하므로 관리자 추가/수정/삭제가 커밋되는 즉시,
+그리고 모든 워커에서 해당 테이블을 읽는 페이지만 정확히 무효화된다.
+"""
+
+import threading
+from functools import wraps
+
+from flask import current_app, g, make_response, request, session
+
+
+class PageCache:
+	"""프로세스(워커) 단위 전체 응답 캐시"""
+
+	def __init__(self, db, max_entries=256):
+		self.db = db
+		self.max_entries = max_entries
+		self._entries = {}
+		self._stats = {}
+		self._lock = threading.Lock()
+
+	def table_versions(self):
+		"""현재 요청에서 한 번만 읽는 테이블별 변경 버전"""
+		if 'data_versions' not in g:
+			rows = self.db.connection().execute('SELECT table_name, version FROM data_versions').fetchall()
+			g.data_versions = {row['table_name']: row['version'] for row in rows}
+		return g.data_versions
+
+	def _count(self, endpoint, field):
+		with self._lock:
+			stats = self._stats.setdefault(endpoint, {'hits': 0, 'misses': 0, 'stale': 0, 'bypass': 0})
+			stats[field] += 1
+
+	def cached(self, *tables, query_args=()):
+		"""뷰 데코레이터 - tables 는 해당 페이지가 읽는 테이블 목록,
+		query_args 는 응답을 바꾸는 쿼리 인자(페이지 커서 등)로 캐시 키에 포함된다"""
+		def decorator(view):
+			@wraps(view)
+			def wrapper(*args, **kwargs):
+				endpoint = request.endpoint
+				# 일회성 flash 메시지가 있는 응답은 캐시하지 않는다
+				if request.method != 'GET' or session.get('_flashes'):
+					self._count(endpoint, 'bypass')
+					return view(*args, **kwargs)
+
+				lang = 'en' if request.args.get('lang') == 'en' else 'ko'
+				key = (endpoint, lang, tuple(sorted(kwargs.items())),
+					tuple(request.args.get(name) for name in query_args))
+				current = self.table_versions()
+				versions = tuple(current.get(table) for table in tables)
+
+				entry = self._entries.get(key)
+				if entry is not None and entry[0] == versions:
+					self._count(endpoint, 'hits')
+					response = self._build(entry)
+					response.headers['X-Page-Cache'] = 'HIT'
+					return response
+
+				self._count(endpoint, 'stale' if entry is not None else 'misses')
+				response = make_response(view(*args, **kwargs))
+				if response.status_code == 200 and not response.direct_passthrough and 'Set-Cookie' not in response.headers:
+					self._store(key, (versions, response.status_code, list(response.headers.items()), response.get_data()))
+				response.headers['X-Page-Cache'] = 'MISS'
+				return response
+			return wrapper
+		return decorator
+
+	def _build(self, entry):
+		_, status, headers, body = entry
+		return current_app.response_class(body, status=status, headers=headers)
+
+	def _store(self, key, entry):
+		with self._lock:
+			if key not in self._entries and len(self._entries) >= self.max_entries:
+				self._entries.pop(next(iter(self._entries)))
+			self._entries[key] = entry
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+
+	def stats(self):
+		"""라우트별 적중/미스 통계와 적중률"""
+		with self._lock:
+			routes = {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+			entries = len(self._entries)
+		for stats in routes.values():
+			lookups = stats['hits'] + stats['misses'] + stats['stale']
+			stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+		return {'entries': entries, 'routes': routes}
@@ -0,0 +1,171 @@
+"""
+키셋(seek) 페이지네이션
+OFFSET 없이 정렬 키 값으로 다음/이전 페이지의 시작 위치를 찾는다. 페이지를 넘겨도
+정렬 키 인덱스에서 바로 시작 위치를 찾으므로, 테이블이 커져도 요청마다 읽는 행 수와
+렌더링 시간은 페이지 크기만큼으로 일정하다.
+
+- 정렬 키는 NULL 이 없는 컬럼이어야 하고, 마지막 키는 유일한 값(id)이어야 한다
+- 커서는 페이지 경계 행의 정렬 키 값을 URL-safe base64(JSON) 로 담는다
+- ?after=<커서> 는 다음 페이지, ?before=<커서> 는 이전 페이지
+"""
+
+import base64
+import json
+
+from flask import request, url_for
+
+PAGE_ARGS = ('after', 'before')
+
+
+def encode_cursor(values):
+	raw = json.dumps(list(values), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+	return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+	"""잘못된 커서는 None (첫 페이지로 처리)"""
+	try:
+		values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+	except (ValueError, TypeError):
+		return None
+	if not isinstance(values, list) or len(values) != size:
+		return None
+	return values
+
+
+def _column_name(column):
+	# 'cs.updated_at' -> 'updated_at' (행에서 값을 꺼낼 때의 이름)
+	return column.rsplit('.', 1)[-1]
+
+
+def _seek_condition(order, forward):
+	"""정렬 순서에서 커서 행 '뒤'(forward) 또는 '앞'에 오는 행의 조건"""
+	def operator(direction):
+		descending = direction == 'DESC'
+		return '<' if descending == forward else '>'
+
+	directions = {direction for _, direction in order}
+	if len(directions) == 1:
+		# 방향이 모두 같으면 행 값 비교 하나로 인덱스 범위 탐색
+		columns = ', '.join(column for column, _ in order)
+		marks = ', '.join('?' for _ in order)
+		return f'({columns}) {operator(order[0][1])} ({marks})', lambda values: list(values)
+
+	# 방향이 섞여 있으면 (a > ?) OR (a = ? AND b < ?) ... 로 풀어 쓰고,
+	# 첫 키의 범위 조건을 따로 붙여 인덱스에서 시작 위치를 찾게 한다
+	first_column, first_direction = order[0]
+	bound = '<=' if operator(first_direction) == '<' else '>='
+	terms = []
+	for i, (column, direction) in enumerate(order):
+		equals = [f'{prev} = ?' for prev, _ in order[:i]]
+		terms.append('(' + ' AND '.join(equals + [f'{column} {operator(direction)} ?']) + ')')
+	sql = f'{first_column} {bound} ? AND (' + ' OR '.join(terms) + ')'
+
+	def params(values):
+		expanded = [values[0]]
+		for i in range(len(order)):
+			expanded.extend(values[:i + 1])
+		return expanded
+	return sql, params
+
+
+class Page:
+	"""한 페이지의 행과 이전/다음 커서"""
+
+	def __init__(self, items, next_cursor=None, prev_cursor=None, size=0):
+		self.items = items
+		self.next_cursor = next_cursor
+		self.prev_cursor = prev_cursor
+		self.size = size
+
+	@property
+	def is_first(self):
+		return self.prev_cursor is None
+
+	@property
+	def has_pages(self):
+		return self.next_cursor is not None or self.prev_cursor is not None
+
+	def url(self, which):
+		"""현재 요청의 다른 쿼리 인자(type, lang 등)를 유지한 이전/다음 페이지 URL"""
+		cursor = self.next_cursor if which == 'next' else self.prev_cursor
+		if cursor is None:
+			return None
+		args = {key: value for key, value in request.args.items() if key not in PAGE_ARGS}
+		args['after' if which == 'next' else 'before'] = cursor
+		return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+	def __iter__(self):
+		return iter(self.items)
+
+	def __len__(self):
+		return len(self.items)
+
+	def __bool__(self):
+		return bool(self.items)
+
+
+def keyset_sql(select, order, where=None, seek=False, backward=False):
+	"""페이지 조회 SQL 과 커서 값 → 자리표시자 값 변환 함수
+
+	자리표시자 순서: where 의 값, (seek 이면) 커서 값, LIMIT
+	"""
+	conditions = [where] if where else []
+	seek_params = None
+	if seek:
+		seek_sql, seek_params = _seek_condition(order, forward=not backward)
+		conditions.append(seek_sql)
+
+	# 이전 페이지는 정렬을 뒤집어 가져온 뒤 다시 뒤집는다
+	flip = {'ASC': 'DESC', 'DESC': 'ASC'}
+	order_sql = ', '.join(f'{column} {flip[direction] if backward else direction}' for column, direction in order)
+	sql = select
+	if conditions:
+		sql += ' WHERE ' + ' AND '.join(f'({condition})' for condition in conditions)
+	sql += f' ORDER BY {order_sql} LIMIT ?'
+	return sql, seek_params
+
+
+def paginate(conn, select, order, where=None, params=(), page_size=30, after=None, before=None):
+	"""select 문(ORDER BY/LIMIT 없이)을 order 순서로 한 페이지만 조회
+
+	order: [(컬럼, 'ASC' | 'DESC'), ...] - 마지막은 유일한 키(id)
+	after/before: 이전 응답의 next_cursor/prev_cursor (생략하면 첫 페이지)
+	"""
+	order = [(column, direction.upper()) for column, direction in order]
+	names = [_column_name(column) for column, _ in order]
+	after = decode_cursor(after, len(order)) if after else None
+	before = decode_cursor(before, len(order)) if before and after is None else None
+	backward = before is not None
+	cursor = before if backward else after
+
+	sql, seek_params = keyset_sql(select, order, where, seek=cursor is not None, backward=backward)
+	values = list(params)
+	if cursor is not None:
+		values.extend(seek_params(cursor))
+	rows = conn.execute(sql, values + [page_size + 1]).fetchall()
+
+	more = len(rows) > page_size
+	rows = rows[:page_size]
+	if backward:
+		rows.reverse()
+
+	def key(row):
+		return encode_cursor(row[name] for name in names)
+
+	next_cursor = prev_cursor = None
+	if rows:
+		# 앞으로 넘길 때: 더 있으면 다음, 커서로 왔으면 이전이 있다 (뒤로 넘길 때는 반대)
+		has_next = more or backward
+		has_prev = more if backward else cursor is not None
+		if has_next:
+			next_cursor = key(rows[-1])
+		if has_prev:
+			prev_cursor = key(rows[0])
+	return Page(rows, next_cursor=next_cursor, prev_cursor=prev_cursor, size=page_size)
+
+
+def paginate_request(conn, select, order, where=None, params=(), page_size=30):
+	"""현재 요청의 ?after= / ?before= 로 paginate()"""
+	return paginate(conn, select, order, where=where, params=params, page_size=page_size,
+		after=request.args.get('after'), before=request.args.get('before'))
@@ -3,19 +3,51 @@
 """
 비행 스케줄 관리 프로그램
 Virtual Black Eagles 팀의 비행 일정을 관리합니다.
+웹 사이트와 같은 DB(DATABASE 환경 변수, 기본 blackeagles.db)의 schedules 테이블을 schedule_repo 로 다루므로
+여기서 바꾼 일정이 /schedule 페이지에 바로 반영됩니다. 예전 flight_schedules.db 의 일정은 sync 명령으로 옮깁니다.
 """
 
+import argparse
+import contextlib
+import csv
+import json
+import os
 import sqlite3
 from datetime import datetime, timedelta
 import sys
 from tabulate import tabulate
 
+import migrations
+import schedule_repo
+import search
+
+# 가져오기/내보내기 파일 형식과 내보낼 컬럼
+FILE_FORMATS = ('csv', 'json')
+EXPORT_COLUMNS = schedule_repo.COLUMNS
+# 목록 필터 → (조건, 날짜 정렬 방향) - event_date 인덱스 범위로 찾고 인덱스 순서대로 읽는다
+LIST_FILTERS = {
+    'all': ('', 'DESC'),
+    'upcoming': ('WHERE event_date >= :today', 'ASC'),
+    'past': ('WHERE event_date < :today', 'DESC'),
+    'today': ('WHERE event_date = :today', 'ASC'),
+    'week': ('WHERE event_date BETWEEN :today AND :week', 'ASC'),
+    'month': ('WHERE event_date BETWEEN :today AND :month', 'ASC'),
+}
+# 목록을 한 번에 가져와 출력할 행 수
+LIST_PAGE_SIZE = 100
+# 가져오기 오류를 몇 개까지 보여줄지
+MAX_IMPORT_ERRORS = 20
+# 기본 DB - 웹 앱(app.py)과 같은 파일
+DEFAULT_DB = os.environ.get('DATABASE', 'blackeagles.db')
+# 예전 CLI 전용 DB (sync 명령의 기본 원본)
+LEGACY_DB = 'flight_schedules.db'
+
 
 class FlightScheduleManager:
     """비행 스케줄 관리 클래스"""
     
-    def __init__(self, db_path='flight_schedules.db'):
-        """초기화 - 독립 데이터베이스 사용"""
+    def __init__(self, db_path=DEFAULT_DB):
+        """초기화 - 기본은 웹 앱과 같은 데이터베이스"""
         self.db_path = db_path
         self.conn = None
         self.cursor = None
@@ -24,7 +56,8 @@ class FlightScheduleManager:
     def connect(self):
         """데이터베이스 연결"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # 웹 앱이 쓰는 중이면 잠금이 풀릴 때까지 기다린다
+            self.conn = sqlite3.connect(self.db_path, timeout=30)
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
             return True
@@ -38,25 +71,19 @@ class FlightScheduleManager:
             self.conn.close()
     
     def _initialize_database(self):
-        """데이터베이스 초기화 - 테이블 생성"""
+        """데이터베이스 초기화 - 표준 일정 테이블, 인덱스, 검색 색인 (schedule_repo)
+        
+        웹 DB 인데 스키마가 뒤처져 있으면 (예전 DATE 컬럼 일정 테이블) 마이그레이션을 먼저 하라고 알리고 끝낸다.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # schedules 테이블 생성
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS schedules (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    location TEXT,
-                    event_date TEXT NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            version = migrations.current_version(conn)
+            if 0 < version < migrations.latest_version():
+                conn.close()
+                print(f"❌ 데이터베이스 스키마 버전 {version} / 최신 {migrations.latest_version()}. "
+                      "먼저 'flask --app app migrate' 를 실행하세요.")
+                sys.exit(1)
+            schedule_repo.ensure_schema(conn)
             conn.close()
             
         except sqlite3.Error as e:
@@ -66,101 +93,80 @@ class FlightScheduleManager:
     def add_schedule(self, title, location, event_date, description=''):
         """새로운 일정 추가"""
         try:
-            # 날짜 형식 검증
-            try:
-                datetime.strptime(event_date, '%Y-%m-%d')
-            except ValueError:
-                print("❌ 날짜 형식 오류. YYYY-MM-DD 형식으로 입력하세요.")
-                return False
-            
-            self.cursor.execute('''
-                INSERT INTO schedules (title, location, event_date, description)
-                VALUES (?, ?, ?, ?)
-            ''', (title, location, event_date, description))
+            schedule_repo.add(self.conn, title, location, event_date, description)
             self.conn.commit()
             print(f"✅ 일정이 추가되었습니다: {title}")
             return True
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
         except sqlite3.Error as e:
             print(f"❌ 일정 추가 실패: {e}")
             return False
     
-    def list_schedules(self, filter_type='all', days=30):
-        """일정 목록 조회
+    def list_schedules(self, filter_type='all', days=30, limit=None, offset=0, page_size=LIST_PAGE_SIZE):
+        """일정 목록 조회 - 출력한 일정 수
+        
+        D-Day(오늘과의 날짜 차이)와 설명 줄임은 SQL 에서 계산하고(오늘 날짜는 호출마다 한 번),
+        결과를 page_size 행씩 가져오는 대로 표로 출력하므로 전체 목록을 메모리에 모으지 않는다.
         
         Args:
-            filter_type: 'all' (전체), 'upcoming' (다가오는), 'past' (지난), 'today' (오늘)
-            days: upcoming 조회 시 기준 일수
+            filter_type: 'all' (전체), 'upcoming' (다가오는), 'past' (지난), 'today' (오늘),
+                         'week' (7일 이내), 'month' (days 일 이내)
+            days: month 조회 시 기준 일수
+            limit: 최대 출력 수 (None 이면 전부)
+            offset: 건너뛸 일정 수
+            page_size: 한 번에 가져와 출력할 행 수
         """
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            future = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
-            
-            if filter_type == 'upcoming':
-                query = 'SELECT * FROM schedules WHERE event_date >= ? ORDER BY event_date ASC'
-                self.cursor.execute(query, (today,))
-            elif filter_type == 'past':
-                query = 'SELECT * FROM schedules WHERE event_date < ? ORDER BY event_date DESC'
-                self.cursor.execute(query, (today,))
-            elif filter_type == 'today':
-                query = 'SELECT * FROM schedules WHERE event_date = ? ORDER BY event_date ASC'
-                self.cursor.execute(query, (today,))
-            elif filter_type == 'week':
-                week_future = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-                query = 'SELECT * FROM schedules WHERE event_date >= ? AND event_date <= ? ORDER BY event_date ASC'
-                self.cursor.execute(query, (today, week_future))
-            elif filter_type == 'month':
-                month_future = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-                query = 'SELECT * FROM schedules WHERE event_date >= ? AND event_date <= ? ORDER BY event_date ASC'
-                self.cursor.execute(query, (today, month_future))
-            else:  # all
-                query = 'SELECT * FROM schedules ORDER BY event_date DESC'
-                self.cursor.execute(query)
-            
-            schedules = self.cursor.fetchall()
-            
-            if not schedules:
-                print("📭 등록된 일정이 없습니다.")
-                return []
-            
-            # 테이블 형식으로 출력
-            table_data = []
-            for schedule in schedules:
-                # D-Day 계산
-                event_date = datetime.strptime(schedule['event_date'], '%Y-%m-%d')
-                today_date = datetime.now()
-                delta = (event_date.date() - today_date.date()).days
-                
-                if delta < 0:
-                    d_day = f"D+{abs(delta)}"
-                elif delta == 0:
-                    d_day = "D-Day"
-                else:
-                    d_day = f"D-{delta}"
-                
-                table_data.append([
-                    schedule['id'],
-                    schedule['title'],
-                    schedule['location'] or '-',
-                    schedule['event_date'],
-                    d_day,
-                    schedule['description'][:30] + '...' if schedule['description'] and len(schedule['description']) > 30 else schedule['description'] or '-'
-                ])
+            now = datetime.now()
+            today = now.strftime('%Y-%m-%d')
+            bounds = {
+                'today': today,
+                'week': (now + timedelta(days=7)).strftime('%Y-%m-%d'),
+                'month': (now + timedelta(days=days)).strftime('%Y-%m-%d'),
+            }
+            where, order = LIST_FILTERS.get(filter_type, LIST_FILTERS['all'])
+            
+            self.cursor.execute(f'''
+                SELECT id, title, location, event_date,
+                       CAST(julianday(event_date) - julianday(:today) AS INTEGER) AS delta,
+                       CASE WHEN length(description) > 30 THEN substr(description, 1, 30) || '...'
+                            ELSE COALESCE(NULLIF(description, ''), '-') END AS summary
+                FROM schedules
+                {where}
+                ORDER BY event_date {order}, id {order}
+                LIMIT :limit OFFSET :offset
+            ''', {**bounds, 'limit': -1 if limit is None else limit, 'offset': offset})
             
             headers = ['ID', '제목', '장소', '날짜', 'D-Day', '설명']
-            print("\n" + "="*100)
-            print(tabulate(table_data, headers=headers, tablefmt='grid'))
-            print("="*100 + "\n")
+            count = 0
+            while True:
+                rows = self.cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                if not count:
+                    print("\n" + "="*100)
+                # 제목 등의 숫자 모양 문자열('007')을 숫자로 바꾸지 않도록 (행마다 숫자 판별도 하지 않아 두 배 빠르다)
+                print(tabulate([[row['id'], row['title'], row['location'] or '-', row['event_date'], _d_day(row['delta']), row['summary']]
+                                for row in rows], headers=headers, tablefmt='grid', disable_numparse=True))
+                count += len(rows)
+            
+            if not count:
+                print("📭 등록된 일정이 없습니다.")
+                return 0
             
-            return schedules
+            print("="*100)
+            print(f"{offset + 1}~{offset + count}번째 일정 ({count}건)\n" if limit is not None or offset else f"{count}건\n")
+            return count
         except sqlite3.Error as e:
             print(f"❌ 일정 조회 실패: {e}")
-            return []
+            return 0
     
     def get_schedule(self, schedule_id):
         """특정 일정 상세 조회"""
         try:
-            self.cursor.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,))
-            schedule = self.cursor.fetchone()
+            schedule = schedule_repo.get(self.conn, schedule_id)
             
             if not schedule:
                 print(f"❌ ID {schedule_id}번 일정을 찾을 수 없습니다.")
@@ -178,12 +184,13 @@ class FlightScheduleManager:
             print(f"등록일: {schedule['created_at']}")
             print(f"수정일: {schedule['updated_at']}")
             
-            # D-Day 계산
-            event_date = datetime.strptime(schedule['event_date'], '%Y-%m-%d')
-            today_date = datetime.now()
-            delta = (event_date.date() - today_date.date()).days
+            # D-Day 계산 - 목록과 같이 SQL 에서 (날짜로 읽을 수 없는 값이면 NULL)
+            delta = self.conn.execute('SELECT CAST(julianday(?) - julianday(?) AS INTEGER)',
+                                      (schedule['event_date'], datetime.now().strftime('%Y-%m-%d'))).fetchone()[0]
             
-            if delta < 0:
+            if delta is None:
+                print("상태: - (날짜 형식 오류, YYYY-MM-DD 로 수정하세요)")
+            elif delta < 0:
                 print(f"상태: 종료됨 (D+{abs(delta)})")
             elif delta == 0:
                 print(f"상태: 🔥 오늘 진행!")
@@ -198,51 +205,21 @@ class FlightScheduleManager:
     
     def update_schedule(self, schedule_id, title=None, location=None, event_date=None, description=None):
         """일정 수정"""
+        if title is None and location is None and event_date is None and description is None:
+            print("⚠️  수정할 내용이 없습니다.")
+            return False
         try:
-            # 기존 일정 확인
-            self.cursor.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,))
-            schedule = self.cursor.fetchone()
-            
-            if not schedule:
+            # 주어진 필드만 바꾼다 (나머지는 기존 값)
+            if not schedule_repo.update(self.conn, schedule_id, title, location, event_date, description):
                 print(f"❌ ID {schedule_id}번 일정을 찾을 수 없습니다.")
                 return False
-            
-            # 수정할 필드만 업데이트
-            updates = []
-            params = []
-            
-            if title is not None:
-                updates.append('title = ?')
-                params.append(title)
-            if location is not None:
-                updates.append('location = ?')
-                params.append(location)
-            if event_date is not None:
-                # 날짜 형식 검증
-                try:
-                    datetime.strptime(event_date, '%Y-%m-%d')
-                    updates.append('event_date = ?')
-                    params.append(event_date)
-                except ValueError:
-                    print("❌ 날짜 형식 오류. YYYY-MM-DD 형식으로 입력하세요.")
-                    return False
-            if description is not None:
-                updates.append('description = ?')
-                params.append(description)
-            
-            if not updates:
-                print("⚠️  수정할 내용이 없습니다.")
-                return False
-            
-            updates.append('updated_at = CURRENT_TIMESTAMP')
-            params.append(schedule_id)
-            
-            query = f"UPDATE schedules SET {', '.join(updates)} WHERE id = ?"
-            self.cursor.execute(query, params)
             self.conn.commit()
             
             print(f"✅ ID {schedule_id}번 일정이 수정되었습니다.")
             return True
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
         except sqlite3.Error as e:
             print(f"❌ 일정 수정 실패: {e}")
             return False
@@ -250,15 +227,12 @@ class FlightScheduleManager:
     def delete_schedule(self, schedule_id):
         """일정 삭제"""
         try:
-            # 기존 일정 확인
-            self.cursor.execute('SELECT * FROM schedules WHERE id = ?', (schedule_id,))
-            schedule = self.cursor.fetchone()
+            schedule = schedule_repo.delete(self.conn, schedule_id)
             
             if not schedule:
                 print(f"❌ ID {schedule_id}번 일정을 찾을 수 없습니다.")
                 return False
             
-            self.cursor.execute('DELETE FROM schedules WHERE id = ?', (schedule_id,))
             self.conn.commit()
             
             print(f"✅ ID {schedule_id}번 일정이 삭제되었습니다: {schedule['title']}")
@@ -267,23 +241,16 @@ class FlightScheduleManager:
             print(f"❌ 일정 삭제 실패: {e}")
             return False
     
-    def search_schedules(self, keyword):
-        """일정 검색 (제목, 장소, 설명)"""
+    def search_schedules(self, keyword, limit=50):
+        """일정 검색 (제목, 장소, 설명) - 관련도 순, 웹 검색과 같은 search.search() 사용"""
         try:
-            query = '''
-                SELECT * FROM schedules 
-                WHERE title LIKE ? OR location LIKE ? OR description LIKE ?
-                ORDER BY event_date DESC
-            '''
-            search_term = f'%{keyword}%'
-            self.cursor.execute(query, (search_term, search_term, search_term))
-            schedules = self.cursor.fetchall()
+            schedules, more = search.search(self.conn, 'schedules', keyword, limit=limit)
             
             if not schedules:
                 print(f"🔍 '{keyword}' 검색 결과가 없습니다.")
                 return []
             
-            print(f"\n🔍 '{keyword}' 검색 결과: {len(schedules)}건")
+            print(f"\n🔍 '{keyword}' 검색 결과: {len(schedules)}건{f' (상위 {limit}건, 더 있음)' if more else ''}")
             
             # 테이블 형식으로 출력
             table_data = []
@@ -293,10 +260,10 @@ class FlightScheduleManager:
                     schedule['title'],
                     schedule['location'] or '-',
                     schedule['event_date'],
-                    schedule['description'][:30] + '...' if schedule['description'] and len(schedule['description']) > 30 else schedule['description'] or '-'
+                    search.plain(schedule['snippet']) or '-'
                 ])
             
-            headers = ['ID', '제목', '장소', '날짜', '설명']
+            headers = ['ID', '제목', '장소', '날짜', '일치 부분']
             print(tabulate(table_data, headers=headers, tablefmt='grid'))
             print()
             
@@ -305,45 +272,292 @@ class FlightScheduleManager:
             print(f"❌ 검색 실패: {e}")
             return []
     
-    def get_statistics(self):
-        """일정 통계"""
+    def get_statistics(self, as_json=False, top=10, histograms=True):
+        """일정 통계 - 날짜 구간별 건수, 장소별/월별 건수
+        
+        건수는 쿼리 하나로 구한다. 각 건수는 event_date 인덱스의 해당 범위만 세고
+        (행마다 조건을 계산하는 SUM(event_date >= ?) 집계보다 빠르다), 지난 일정은 전체 - 다가오는 일정이다.
+        월별/장소별 건수는 각 인덱스를 한 번씩 순서대로 훑어 묶는다 (임시 정렬 없음).
+        
+        Args:
+            as_json: True 면 표 대신 JSON 출력 (운영 스크립트용)
+            top: 장소별 건수 상위 개수
+            histograms: False 면 월별/장소별 건수 생략
+        """
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            # 전체 일정 수
-            self.cursor.execute('SELECT COUNT(*) as total FROM schedules')
-            total = self.cursor.fetchone()['total']
-            
-            # 다가오는 일정 수
-            self.cursor.execute('SELECT COUNT(*) as upcoming FROM schedules WHERE event_date >= ?', (today,))
-            upcoming = self.cursor.fetchone()['upcoming']
-            
-            # 지난 일정 수
-            self.cursor.execute('SELECT COUNT(*) as past FROM schedules WHERE event_date < ?', (today,))
-            past = self.cursor.fetchone()['past']
-            
-            # 이번 주 일정 수
-            week_future = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            self.cursor.execute('SELECT COUNT(*) as week FROM schedules WHERE event_date >= ? AND event_date <= ?', (today, week_future))
-            week = self.cursor.fetchone()['week']
+            now = datetime.now()
+            today = now.strftime('%Y-%m-%d')
+            week_future = (now + timedelta(days=7)).strftime('%Y-%m-%d')
+            month_future = (now + timedelta(days=30)).strftime('%Y-%m-%d')
             
-            # 이번 달 일정 수
-            month_future = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-            self.cursor.execute('SELECT COUNT(*) as month FROM schedules WHERE event_date >= ? AND event_date <= ?', (today, month_future))
-            month = self.cursor.fetchone()['month']
+            self.cursor.execute('''
+                SELECT (SELECT COUNT(*) FROM schedules) AS total,
+                       (SELECT COUNT(*) FROM schedules WHERE event_date >= :today) AS upcoming,
+                       (SELECT COUNT(*) FROM schedules WHERE event_date = :today) AS today,
+                       (SELECT COUNT(*) FROM schedules WHERE event_date BETWEEN :today AND :week) AS week,
+                       (SELECT COUNT(*) FROM schedules WHERE event_date BETWEEN :today AND :month) AS month,
+                       (SELECT MIN(event_date) FROM schedules) AS first_date,
+                       (SELECT MAX(event_date) FROM schedules) AS last_date
+            ''', {'today': today, 'week': week_future, 'month': month_future})
+            row = self.cursor.fetchone()
+            stats = {
+                'total': row['total'],
+                'upcoming': row['upcoming'],
+                'past': row['total'] - row['upcoming'],
+                'today': row['today'],
+                'week': row['week'],
+                'month': row['month'],
+                'first_date': row['first_date'],
+                'last_date': row['last_date'],
+            }
+            
+            by_month, by_location = {}, {}
+            if histograms:
+                # 날짜별로 묶으면 event_date 인덱스 순서 그대로라 정렬 없이 월별로 더할 수 있다
+                self.cursor.execute('SELECT event_date, COUNT(*) AS count FROM schedules GROUP BY event_date')
+                for row in self.cursor:
+                    month = row['event_date'][:7]
+                    by_month[month] = by_month.get(month, 0) + row['count']
+                
+                # 장소 없음(NULL, '')은 '-' 하나로 합친다
+                self.cursor.execute('SELECT location, COUNT(*) AS count FROM schedules GROUP BY location')
+                places = {}
+                for row in self.cursor:
+                    place = row['location'] or '-'
+                    places[place] = places.get(place, 0) + row['count']
+                by_location = dict(sorted(places.items(), key=lambda item: (-item[1], item[0]))[:top])
+            
+            stats.update({
+                'generated_at': now.isoformat(timespec='seconds'),
+                'range': {'today': today, 'week_end': week_future, 'month_end': month_future},
+                'by_location': by_location,
+                'by_month': by_month,
+            })
+            
+            if as_json:
+                print(json.dumps(stats, ensure_ascii=False, indent=2))
+                return stats
             
             print("\n" + "="*60)
             print("📊 비행 스케줄 통계")
             print("="*60)
-            print(f"전체 일정: {total}건")
-            print(f"다가오는 일정: {upcoming}건")
-            print(f"지난 일정: {past}건")
-            print(f"이번 주 일정: {week}건")
-            print(f"이번 달 일정: {month}건")
+            print(f"전체 일정: {stats['total']}건")
+            print(f"다가오는 일정: {stats['upcoming']}건")
+            print(f"지난 일정: {stats['past']}건")
+            print(f"이번 주 일정: {stats['week']}건")
+            print(f"이번 달 일정: {stats['month']}건")
+            if stats['total']:
+                print(f"기간: {stats['first_date']} ~ {stats['last_date']}")
+            if stats['total'] and histograms:
+                print(f"\n📍 장소별 (상위 {top})")
+                print(tabulate(_histogram(by_location), headers=['장소', '건수', ''], tablefmt='simple'))
+                year = now.strftime('%Y')
+                print(f"\n📅 {year}년 월별")
+                months = {f'{year}-{m:02d}': by_month.get(f'{year}-{m:02d}', 0) for m in range(1, 13)}
+                print(tabulate(_histogram(months), headers=['월', '건수', ''], tablefmt='simple'))
             print("="*60 + "\n")
+            return stats
             
         except sqlite3.Error as e:
             print(f"❌ 통계 조회 실패: {e}")
+            return None
+
+    
+    def import_schedules(self, source, file_format=None, skip_invalid=False):
+        """CSV/JSON 파일의 일정을 한 트랜잭션으로 추가 (source 가 '-' 면 표준 입력)
+        
+        파일을 한 행씩 읽어 검증하고 executemany 로 넣으므로 파일 전체를 메모리에 올리지 않는다.
+        CSV 는 머리글(title, location, event_date, description)이 있어야 하고, JSON 은 객체 배열이나
+        한 줄에 객체 하나(JSON Lines)다. 내보낸 파일의 id/created_at 등 다른 필드는 무시한다.
+        잘못된 행이 있으면 전부 되돌린다 (skip_invalid=True 면 그 행만 건너뛴다).
+        
+        Returns:
+            {'imported': 추가한 수, 'invalid': 잘못된 행 수, 'errors': 오류 메시지 일부} 또는 실패 시 None
+        """
+        file_format = file_format or _guess_format(source)
+        errors = []
+        invalid = 0
+        
+        def values(records):
+            nonlocal invalid
+            for where, record in records:
+                row, reason = _schedule_values(record)
+                if reason:
+                    invalid += 1
+                    if len(errors) < MAX_IMPORT_ERRORS:
+                        errors.append(f"{where}: {reason}")
+                elif skip_invalid or not invalid:
+                    # 잘못된 행이 나오면 (되돌릴 것이므로) 검증만 계속한다
+                    yield row
+        
+        try:
+            with _open(source, 'r') as f:
+                records = _read_csv(f) if file_format == 'csv' else _read_json(f)
+                # 검색 색인은 행마다 트리거로 하지 않고 끝나고 한 번에 (트리거 삭제/복구도 같은 트랜잭션)
+                self.conn.execute('BEGIN')
+                with search.deferred_index(self.conn, 'schedules'):
+                    self.cursor.executemany(schedule_repo.INSERT, values(records))
+                    imported = self.cursor.rowcount
+            if invalid and not skip_invalid:
+                self.conn.rollback()
+                imported = 0
+            else:
+                self.conn.commit()
+        except (OSError, ValueError, csv.Error, sqlite3.Error) as e:
+            self.conn.rollback()
+            print(f"❌ 일정 가져오기 실패: {e}")
+            return None
+        
+        for error in errors:
+            print(f"  ⚠️  {error}")
+        if invalid > len(errors):
+            print(f"  ... 외 {invalid - len(errors)}건")
+        if invalid and not skip_invalid:
+            print(f"❌ 잘못된 행 {invalid}건 - 아무것도 추가하지 않았습니다. (--skip-invalid 로 건너뛰기)")
+        else:
+            print(f"✅ 일정 {imported}건을 가져왔습니다." + (f" (잘못된 행 {invalid}건 건너뜀)" if invalid else ""))
+        return {'imported': imported, 'invalid': invalid, 'errors': errors}
+    
+    def export_schedules(self, target, file_format=None):
+        """일정을 날짜순으로 CSV/JSON 파일에 쓴다 (target 이 '-' 면 표준 출력) - 쓴 행 수, 실패 시 None
+        
+        커서에서 한 행씩 바로 쓰므로 테이블 전체를 메모리에 올리지 않는다.
+        """
+        file_format = file_format or _guess_format(target)
+        count = 0
+        try:
+            # event_date 인덱스 순서 그대로라 정렬이 필요 없다
+            cursor = self.conn.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM schedules ORDER BY event_date, id")
+            with _open(target, 'w') as f:
+                if file_format == 'csv':
+                    writer = csv.writer(f)
+                    writer.writerow(EXPORT_COLUMNS)
+                    for row in cursor:
+                        writer.writerow(row)
+                        count += 1
+                else:
+                    f.write('[')
+                    for row in cursor:
+                        f.write(',\n' if count else '\n')
+                        f.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+                        count += 1
+                    f.write('\n]\n')
+        except (OSError, sqlite3.Error) as e:
+            print(f"❌ 일정 내보내기 실패: {e}", file=sys.stderr)
+            return None
+        # 표준 출력으로 내보낼 때는 안내를 데이터와 섞지 않는다
+        print(f"✅ 일정 {count}건을 내보냈습니다.", file=sys.stderr if target == '-' else sys.stdout)
+        return count
+
+    def sync_schedules(self, source=LEGACY_DB):
+        """다른 DB 파일의 일정을 이 DB 로 옮긴다 - (옮긴 수, 이미 있던 수), 실패 시 None
+
+        (제목, 날짜, 장소)가 같은 일정은 건너뛰므로 여러 번 실행해도 된다 (schedule_repo.sync).
+        날짜는 YYYY-MM-DD 로 바꿔 넣고, 날짜로 읽을 수 없는 일정은 건너뛰고 알린다.
+        """
+        if not os.path.isfile(source):
+            print(f"❌ 원본 파일이 없습니다: {source}")
+            return None
+        if os.path.samefile(source, self.db_path):
+            print("❌ 원본과 대상이 같은 파일입니다.")
+            return None
+        try:
+            copied, skipped, invalid = schedule_repo.sync(self.conn, source)
+        except sqlite3.Error as e:
+            print(f"❌ 일정 옮기기 실패: {e}")
+            return None
+        for schedule_id, event_date in invalid[:MAX_IMPORT_ERRORS]:
+            print(f"  ⚠️  원본 ID {schedule_id}: 날짜 형식 오류 '{event_date}' (YYYY-MM-DD)")
+        if len(invalid) > MAX_IMPORT_ERRORS:
+            print(f"  ... 외 {len(invalid) - MAX_IMPORT_ERRORS}건")
+        print(f"✅ {source} 에서 일정 {copied}건을 옮겼습니다."
+              + (f" (이미 있는 일정 {skipped}건 건너뜀)" if skipped else "")
+              + (f" (날짜 형식 오류 {len(invalid)}건 건너뜀)" if invalid else ""))
+        return copied, skipped, invalid
+
+
+def _guess_format(path):
+    """파일 확장자로 형식 추측 (.json/.jsonl → json, 나머지 csv)"""
+    return 'json' if os.path.splitext(path)[1].lower() in ('.json', '.jsonl') else 'csv'
+
+
+def _open(path, mode):
+    """'-' 는 표준 입출력 (닫지 않음)"""
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin if mode == 'r' else sys.stdout)
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _read_csv(f):
+    """(위치, 행 dict) - 머리글 이름은 앞뒤 공백/대소문자 무시"""
+    reader = csv.reader(f)
+    header = [name.strip().lower() for name in next(reader, [])]
+    for row in reader:
+        if row:
+            yield f"{reader.line_num}행", dict(zip(header, row))
+
+
+def _read_json(f, chunk_size=1 << 16):
+    """(위치, 값) - JSON 배열이나 JSON Lines 를 조금씩 읽어 원소를 하나씩 돌려준다"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    opened = False
+    index = 0
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,\ufeff')
+        if not opened and buffer.startswith('['):
+            opened = True
+            buffer = buffer[1:]
+            continue
+        if opened and buffer.startswith(']'):
+            return
+        if buffer:
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # 원소가 읽은 부분에서 잘렸으면 더 읽는다
+                if eof:
+                    raise
+            else:
+                index += 1
+                yield f"{index}번째 항목", value
+                buffer = buffer[end:]
+                continue
+        elif eof:
+            return
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def _schedule_values(record):
+    """가져올 레코드 → ((title, location, event_date, description), None) 또는 (None, 오류)"""
+    if not isinstance(record, dict):
+        return None, "객체가 아닙니다"
+    text = {key: '' if record.get(key) is None else str(record.get(key)).strip()
+        for key in ('title', 'location', 'event_date', 'description')}
+    if not text['title']:
+        return None, "제목이 없습니다"
+    if not schedule_repo.valid_date(text['event_date']):
+        return None, f"날짜 형식 오류 '{text['event_date']}' (YYYY-MM-DD)"
+    return (text['title'], text['location'], text['event_date'], text['description']), None
+
+def _d_day(delta):
+    """오늘과의 날짜 차이 → D-3 / D-Day / D+2 (날짜가 잘못되어 계산할 수 없으면 '-')"""
+    if delta is None:
+        return '-'
+    if delta < 0:
+        return f"D+{abs(delta)}"
+    if delta == 0:
+        return "D-Day"
+    return f"D-{delta}"
+
+
+def _histogram(counts, width=30):
+    """{이름: 건수} → 막대가 붙은 표 행"""
+    largest = max(counts.values(), default=0) or 1
+    return [[name, count, '█' * round(count / largest * width)] for name, count in counts.items()]
 
 
 def print_menu():
@@ -362,12 +576,91 @@ def print_menu():
     print("="*60)
 
 
-def main():
+def build_parser():
+    """명령행 인자 - 하위 명령 없이 실행하면 메뉴 모드"""
+    parser = argparse.ArgumentParser(description='Virtual Black Eagles 비행 스케줄 관리 (하위 명령 없이 실행하면 메뉴)')
+    parser.add_argument('--db', default=DEFAULT_DB, help='데이터베이스 파일 (기본: 웹 앱과 같은 DATABASE)')
+    commands = parser.add_subparsers(dest='command', metavar='명령')
+    
+    add_parser = commands.add_parser('add', help='일정 추가')
+    add_parser.add_argument('title', help='제목')
+    add_parser.add_argument('event_date', help='날짜 (YYYY-MM-DD)')
+    add_parser.add_argument('--location', default='', help='장소')
+    add_parser.add_argument('--description', default='', help='설명')
+    
+    list_parser = commands.add_parser('list', help='일정 목록')
+    list_parser.add_argument('--filter', dest='filter_type', default='all',
+                             choices=tuple(LIST_FILTERS))
+    list_parser.add_argument('--limit', type=int, help='최대 출력 수 (기본: 전부)')
+    list_parser.add_argument('--offset', type=int, default=0, help='건너뛸 일정 수')
+    list_parser.add_argument('--page-size', type=int, default=LIST_PAGE_SIZE, help='한 번에 가져와 출력할 행 수')
+    
+    show_parser = commands.add_parser('show', help='일정 상세')
+    show_parser.add_argument('id', type=int, help='일정 ID')
+    
+    search_parser = commands.add_parser('search', help='일정 검색 (제목, 장소, 설명)')
+    search_parser.add_argument('keyword', help='검색어')
+    search_parser.add_argument('--limit', type=int, default=50, help='최대 결과 수')
+    
+    stats_parser = commands.add_parser('stats', help='일정 통계')
+    stats_parser.add_argument('--json', action='store_true', help='JSON 으로 출력')
+    stats_parser.add_argument('--top', type=int, default=10, help='장소별 건수 상위 개수')
+    stats_parser.add_argument('--no-histograms', dest='histograms', action='store_false', help='월별/장소별 건수 생략')
+    
+    import_parser = commands.add_parser('import', help='CSV/JSON 파일의 일정을 한 번에 추가')
+    import_parser.add_argument('file', help="가져올 파일 ('-' 는 표준 입력)")
+    import_parser.add_argument('--format', dest='file_format', choices=FILE_FORMATS, help='파일 형식 (기본: 확장자로 추측)')
+    import_parser.add_argument('--skip-invalid', action='store_true', help='잘못된 행만 건너뛰고 나머지는 추가')
+    
+    export_parser = commands.add_parser('export', help='일정을 CSV/JSON 파일로 내보내기')
+    export_parser.add_argument('file', help="내보낼 파일 ('-' 는 표준 출력)")
+    export_parser.add_argument('--format', dest='file_format', choices=FILE_FORMATS, help='파일 형식 (기본: 확장자로 추측)')
+    
+    sync_parser = commands.add_parser('sync', help='다른 DB 파일(예전 flight_schedules.db)의 일정을 옮기기')
+    sync_parser.add_argument('--from', dest='source', default=LEGACY_DB, help=f'원본 DB 파일 (기본: {LEGACY_DB})')
+    return parser
+
+
+def run_command(manager, args):
+    """하위 명령 실행 - 성공 여부"""
+    if args.command == 'add':
+        return manager.add_schedule(args.title, args.location, args.event_date, args.description)
+    if args.command == 'list':
+        manager.list_schedules(args.filter_type, limit=args.limit, offset=args.offset, page_size=args.page_size)
+        return True
+    if args.command == 'show':
+        return manager.get_schedule(args.id) is not None
+    if args.command == 'search':
+        manager.search_schedules(args.keyword, limit=args.limit)
+        return True
+    if args.command == 'stats':
+        return manager.get_statistics(as_json=args.json, top=args.top, histograms=args.histograms) is not None
+    if args.command == 'import':
+        result = manager.import_schedules(args.file, args.file_format, skip_invalid=args.skip_invalid)
+        return bool(result) and not (result['invalid'] and not args.skip_invalid)
+    if args.command == 'export':
+        return manager.export_schedules(args.file, args.file_format) is not None
+    if args.command == 'sync':
+        return manager.sync_schedules(args.source) is not None
+    raise ValueError(args.command)
+
+
+def main(argv=None):
     """메인 함수"""
-    manager = FlightScheduleManager()
+    args = build_parser().parse_args(argv)
+    manager = FlightScheduleManager(args.db)
     
     if not manager.connect():
         print("데이터베이스 연결에 실패했습니다.")
+        sys.exit(1)
+    
+    if args.command:
+        try:
+            ok = run_command(manager, args)
+        finally:
+            manager.close()
+        if not ok:
+            sys.exit(1)
         return
     
     try:
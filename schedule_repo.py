@@ -0,0 +1,165 @@
+"""
+일정(schedules) 데이터 접근
+웹(/schedule, /admin/schedules)과 schedule.py CLI 가 같은 스키마, 같은 SQL 로 같은 DB(웹의 DATABASE)를 쓴다.
+
+- 표준 스키마: event_date 는 'YYYY-MM-DD' TEXT (문자열 비교가 날짜 순서와 같다), event_date/location 인덱스,
+  검색 색인(search.py). 웹 DB 는 마이그레이션 10 이 예전 DATE 컬럼 테이블을 이 스키마로 바꾼다
+- SQL 은 모듈 상수로 두어 연결마다 준비된 문장(sqlite3 문장 캐시)을 재사용한다
+- 웹 DB 의 data_versions 트리거가 CLI 에서 바꾼 일정도 공개 페이지 캐시에 바로 반영한다
+- 예전 CLI 전용 파일(flight_schedules.db)의 일정은 sync() 로 한 번 옮긴다
+
+함수는 커밋하지 않는다 (호출하는 쪽이 커밋).
+"""
+
+from datetime import date, datetime
+
+import search
+
+SCHEMA = '''
+	CREATE TABLE IF NOT EXISTS schedules (
+		id INTEGER PRIMARY KEY AUTOINCREMENT,
+		title TEXT NOT NULL,
+		location TEXT,
+		event_date TEXT NOT NULL,
+		description TEXT,
+		created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+		updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+	)
+'''
+INDEXES = (
+	# 날짜 구간 조회, 목록 정렬(event_date, id), 통계
+	'CREATE INDEX IF NOT EXISTS idx_schedules_event_date ON schedules (event_date)',
+	# 장소별 통계
+	'CREATE INDEX IF NOT EXISTS idx_schedules_location ON schedules (location)',
+)
+COLUMNS = ('id', 'title', 'location', 'event_date', 'description', 'created_at', 'updated_at')
+
+# 목록 페이지 (pagination.paginate_request 용)
+LIST_SELECT = 'SELECT * FROM schedules'
+LIST_ORDER = [('event_date', 'DESC'), ('id', 'DESC')]
+
+SELECT_ONE = 'SELECT * FROM schedules WHERE id = ?'
+INSERT = 'INSERT INTO schedules (title, location, event_date, description) VALUES (?, ?, ?, ?)'
+UPDATE = ('UPDATE schedules SET title = ?, location = ?, event_date = ?, description = ?, updated_at = CURRENT_TIMESTAMP '
+	'WHERE id = ?')
+DELETE = 'DELETE FROM schedules WHERE id = ?'
+# sync(): 원본 파일에서 날짜를 표준 형식으로 바꿀 수 있고 (제목, 날짜, 장소)가 같은 일정이 없는 것만 옮긴다
+SYNC = '''
+	INSERT INTO schedules (title, location, event_date, description, created_at, updated_at)
+	SELECT s.title, s.location, s.event_date, s.description, s.created_at, s.updated_at
+	FROM (
+		SELECT id, title, location, normalize_date(event_date) AS event_date, description, created_at, updated_at
+		FROM source.schedules
+	) AS s
+	WHERE s.event_date IS NOT NULL AND NOT EXISTS (
+		SELECT 1 FROM schedules AS t
+		WHERE t.event_date = s.event_date AND t.title = s.title AND t.location IS s.location
+	)
+	ORDER BY s.event_date, s.id
+'''
+# 날짜를 표준 형식으로 바꿀 수 없는 원본 일정
+SYNC_INVALID = 'SELECT id, event_date FROM source.schedules WHERE normalize_date(event_date) IS NULL ORDER BY id'
+
+
+def ensure_schema(conn):
+	"""일정 테이블, 인덱스, 검색 색인이 없으면 만든다 (마이그레이션을 쓰지 않는 DB 용)"""
+	conn.execute(SCHEMA)
+	for statement in INDEXES:
+		conn.execute(statement)
+	conn.commit()
+	search.ensure_index(conn, 'schedules')
+
+
+def valid_date(value):
+	"""YYYY-MM-DD (0 채움) 형식의 실제 날짜인지 - 문자열 비교로 날짜 순서가 맞아야 한다"""
+	if not isinstance(value, str) or len(value) != 10 or value[4] != '-' or value[7] != '-':
+		return False
+	try:
+		date.fromisoformat(value)
+	except ValueError:
+		return False
+	return True
+
+
+def normalize_date(value):
+	"""날짜 값 → 'YYYY-MM-DD' (0 채움), 날짜로 읽을 수 없으면 None
+
+	예전 CLI(strptime '%Y-%m-%d')가 받던 '2026-1-5' 와 시각이 붙은 '2026-01-05 10:00:00' 도 바꾼다.
+	SQL 에서는 register_functions() 뒤 normalize_date(event_date) 로 쓴다.
+	"""
+	if not isinstance(value, str):
+		return None
+	text = value.strip().split(' ', 1)[0].split('T', 1)[0]
+	try:
+		return datetime.strptime(text, '%Y-%m-%d').date().isoformat()
+	except ValueError:
+		return None
+
+
+def register_functions(conn):
+	"""SQL 에서 쓰는 normalize_date() 등록 (연결마다)"""
+	conn.create_function('normalize_date', 1, normalize_date, deterministic=True)
+
+
+def validate(title, event_date):
+	"""저장할 수 없는 값이면 ValueError (메시지는 그대로 사용자에게 보여준다)"""
+	if not title:
+		raise ValueError('제목을 입력해주세요.')
+	if not valid_date(event_date):
+		raise ValueError('날짜 형식 오류. YYYY-MM-DD 형식으로 입력하세요.')
+
+
+def get(conn, schedule_id):
+	return conn.execute(SELECT_ONE, (schedule_id,)).fetchone()
+
+
+def add(conn, title, location, event_date, description=''):
+	"""일정 추가 - 새 id"""
+	validate(title, event_date)
+	return conn.execute(INSERT, (title, location, event_date, description)).lastrowid
+
+
+def update(conn, schedule_id, title=None, location=None, event_date=None, description=None):
+	"""주어진 값만 바꾼다 (None 은 그대로) - 일정이 없으면 False"""
+	schedule = get(conn, schedule_id)
+	if schedule is None:
+		return False
+	values = [schedule[column] if value is None else value
+		for column, value in (('title', title), ('location', location), ('event_date', event_date), ('description', description))]
+	validate(values[0], values[2])
+	conn.execute(UPDATE, (*values, schedule_id))
+	return True
+
+
+def delete(conn, schedule_id):
+	"""일정 삭제 - 지운 행 (없으면 None)"""
+	schedule = get(conn, schedule_id)
+	if schedule is not None:
+		conn.execute(DELETE, (schedule_id,))
+	return schedule
+
+
+def sync(conn, source_path):
+	"""다른 DB 파일(예전 flight_schedules.db)의 일정을 한 트랜잭션으로 옮긴다
+	- (옮긴 수, 이미 있던 수, 날짜를 바꿀 수 없어 건너뛴 [(원본 id, event_date), ...])
+
+	날짜는 normalize_date() 로 표준 형식으로 바꿔 넣고, 바꿀 수 없는 일정은 옮기지 않는다.
+	(제목, 날짜, 장소)가 같은 일정은 건너뛰므로 여러 번 실행해도 중복되지 않는다.
+	id 는 새로 매기고 등록/수정 시각은 원본 값을 유지한다. 검색 색인은 끝에서 한 번에 추가한다.
+	"""
+	register_functions(conn)
+	conn.execute('ATTACH DATABASE ? AS source', (source_path,))
+	try:
+		conn.execute('BEGIN IMMEDIATE')
+		try:
+			total = conn.execute('SELECT COUNT(*) FROM source.schedules').fetchone()[0]
+			invalid = [tuple(row) for row in conn.execute(SYNC_INVALID)]
+			with search.deferred_index(conn, 'schedules'):
+				copied = conn.execute(SYNC).rowcount
+			conn.commit()
+		except BaseException:
+			conn.rollback()
+			raise
+	finally:
+		conn.execute('DETACH DATABASE source')
+	return copied, total - len(invalid) - copied, invalid
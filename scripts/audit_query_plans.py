@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+쿼리 실행 계획 점검
+app.py 등(SOURCE_FILES) 안의 모든 execute() SQL 을 찾아, 대량 데이터를 채운 임시 데이터베이스에서
+EXPLAIN QUERY PLAN 을 실행한다. 데이터가 계속 늘어나는 테이블을 WHERE 조건이 있는데도
+인덱스 없이 전체 스캔하는 쿼리가 있으면 실패(종료 코드 1)한다.
+paginate_request() 목록 조회는 첫/다음/이전 페이지 SQL 을 만들어 같은 기준으로 보고,
+정렬을 인덱스 대신 임시 B-tree 로 하는 경우(페이지마다 전체 정렬)도 실패로 본다.
+SQL 이 모듈 상수면(schedule_repo.INSERT 등) 소스 파일의 최상위 문자열 상수에서 찾는다.
+
+사용법:
+    python scripts/audit_query_plans.py [--scale 1.0] [--verbose]
+"""
+
+import argparse
+import ast
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pagination import keyset_sql  # noqa: E402
+import schedule_repo  # noqa: E402
+
+# SQL 을 수집할 소스 파일
+SOURCE_FILES = ['app.py', 'migrations.py', 'schedule_repo.py']
+
+# 행 수가 계속 늘어나는(전체 스캔이 곧 장애가 되는) 테이블
+HOT_TABLES = {
+	'chat_messages', 'chat_sessions', 'contact_messages', 'notices', 'schedules',
+	'gallery', 'page_sections', 'pilots',
+}
+
+# 시드 데이터 행 수 (--scale 로 배수 조정)
+SEED_ROWS = {
+	'chat_sessions': 20000,
+	'chat_messages': 200000,
+	'contact_messages': 50000,
+	'notices': 20000,
+	'schedules': 20000,
+	'gallery': 10000,
+	'page_sections': 2000,
+	'pilots': 500,
+}
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SQL_KEYWORDS = {'where', 'order', 'group', 'limit', 'set', 'values', 'join', 'left', 'inner', 'on', 'select'}
+
+
+def collect_statements(paths):
+	"""소스에서 execute()/executemany() 의 첫 인자가 문자열 리터럴(또는 모듈 상수)인 SQL 을 모은다"""
+	trees = {}
+	for path in paths:
+		with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+			trees[path] = ast.parse(f.read(), filename=path)
+	constants = {os.path.splitext(path)[0]: module_constants(tree) for path, tree in trees.items()}
+
+	statements = []
+	for path, tree in trees.items():
+		def resolve(node):
+			return literal(node, constants, os.path.splitext(path)[0])
+
+		for node in ast.walk(tree):
+			if not isinstance(node, ast.Call):
+				continue
+			if isinstance(node.func, ast.Name) and node.func.id in ('paginate', 'paginate_request'):
+				statements.extend(paginated_statements(path, node, resolve))
+				continue
+			if not isinstance(node.func, ast.Attribute):
+				continue
+			if node.func.attr not in ('execute', 'executemany') or not node.args:
+				continue
+			sql = resolve(node.args[0])
+			if isinstance(sql, str):
+				statements.append((path, node.lineno, ' '.join(sql.split())))
+	return statements
+
+
+def module_constants(tree):
+	"""모듈 최상위의 NAME = 리터럴 대입 → {이름: 값}"""
+	constants = {}
+	for node in tree.body:
+		if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+			try:
+				constants[node.targets[0].id] = ast.literal_eval(node.value)
+			except ValueError:
+				pass
+	return constants
+
+
+def literal(node, constants, module):
+	"""리터럴, 같은 모듈의 상수(NAME), 다른 소스 모듈의 상수(module.NAME) 값 (모르면 None)"""
+	if isinstance(node, ast.Name):
+		return constants.get(module, {}).get(node.id)
+	if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+		return constants.get(node.value.id, {}).get(node.attr)
+	try:
+		return ast.literal_eval(node)
+	except ValueError:
+		return None
+
+
+def paginated_statements(path, node, resolve):
+	"""paginate_request(conn, select, order, where=...) 호출에서 첫/다음/이전 페이지 SQL 을 만든다
+
+	where 가 변수면(필터 선택 등) 조건 없이 만든다.
+	"""
+	if len(node.args) < 3:
+		return []
+	select = resolve(node.args[1])
+	order = resolve(node.args[2])
+	if not isinstance(select, str) or not order:
+		return []
+	where = None
+	for keyword in node.keywords:
+		if keyword.arg == 'where' and isinstance(keyword.value, ast.Constant):
+			where = keyword.value.value
+	variants = [(False, False), (True, False), (True, True)]
+	return [
+		(path, node.lineno, ' '.join(keyset_sql(select, order, where, seek=seek, backward=backward)[0].split()))
+		for seek, backward in variants
+	]
+
+
+def seed(conn, scale):
+	"""대량 시드 데이터 삽입"""
+	rng = random.Random(42)
+	rows = {table: max(1, int(count * scale)) for table, count in SEED_ROWS.items()}
+
+	def day(i):
+		return f'20{20 + i % 8:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}'
+
+	def ts(i):
+		return f'{day(i)} {i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}'
+
+	sessions = [f'session-{i}' for i in range(rows['chat_sessions'])]
+	conn.executemany(
+		'INSERT INTO chat_sessions (session_id, user_name, user_email, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+		((sid, f'user{i}', '', 'active' if i % 10 == 0 else 'closed', ts(i), ts(i + 1)) for i, sid in enumerate(sessions)))
+	conn.executemany(
+		'INSERT INTO chat_messages (session_id, sender_type, sender_name, message, is_read, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+		((rng.choice(sessions), 'user' if i % 2 else 'admin', 'name', 'message body', int(i % 50 != 0), ts(i))
+		 for i in range(rows['chat_messages'])))
+	conn.executemany(
+		'INSERT INTO contact_messages (name, email, message, type, is_read, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+		((f'name{i}', 'a@b.c', 'message', 'donate' if i % 5 == 0 else 'contact', int(i % 20 != 0), ts(i))
+		 for i in range(rows['contact_messages'])))
+	conn.executemany(
+		'INSERT INTO notices (title, content, author, created_at) VALUES (?, ?, ?, ?)',
+		((f'notice {i}', 'content', 'admin', ts(i)) for i in range(rows['notices'])))
+	conn.executemany(
+		'INSERT INTO schedules (title, location, event_date, description) VALUES (?, ?, ?, ?)',
+		((f'airshow {i}', f'base {i % 30}', day(i), 'description') for i in range(rows['schedules'])))
+	conn.executemany(
+		'INSERT INTO gallery (title, description, image_url, order_num, is_active, upload_date) VALUES (?, ?, ?, ?, ?, ?)',
+		((f'photo {i}', '', f'/static/Picture/{i}.jpg', i, int(i % 10 != 0), ts(i)) for i in range(rows['gallery'])))
+	conn.executemany(
+		'INSERT OR IGNORE INTO page_sections (page_name, section_id, section_type, order_num, is_active) VALUES (?, ?, ?, ?, ?)',
+		((f'page{i % 20}', f'section{i}', 'text', i, int(i % 3 != 0)) for i in range(rows['page_sections'])))
+	conn.executemany(
+		'INSERT INTO pilots (number, position, callsign, generation, aircraft, order_num, is_active) VALUES (?, ?, ?, ?, ?, ?, ?)',
+		((i, 'WING', f'call{i}', 'VBE', 'F-5', i, int(i % 4 != 0)) for i in range(rows['pilots'])))
+	conn.commit()
+	conn.execute('ANALYZE')
+	return rows
+
+
+def outer_statement(sql):
+	"""괄호 안(서브쿼리)을 지운 바깥 문장 - 바깥 문장 자체에 WHERE 가 있는지 판단할 때 사용"""
+	depth, kept = 0, []
+	for char in sql:
+		if char == '(':
+			depth += 1
+		elif char == ')':
+			depth -= 1
+		elif depth == 0:
+			kept.append(char)
+	return ''.join(kept)
+
+
+def table_aliases(sql):
+	aliases = {}
+	for table, alias in TABLE_REF.findall(sql):
+		aliases[table.lower()] = table.lower()
+		if alias and alias.lower() not in SQL_KEYWORDS:
+			aliases[alias.lower()] = table.lower()
+	return aliases
+
+
+def audit(conn, statements, verbose=False):
+	"""각 SQL 의 실행 계획을 검사해 (실패 목록, 경고 목록) 을 돌려준다"""
+	failures, warnings = [], []
+	seen = set()
+	for path, lineno, sql in statements:
+		keyword = sql.split(None, 1)[0].upper()
+		if keyword not in ('SELECT', 'UPDATE', 'DELETE', 'INSERT') or sql in seen:
+			continue
+		seen.add(sql)
+		params = [None] * sql.count('?')
+		try:
+			plan = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+		except sqlite3.Error as e:
+			warnings.append((path, lineno, sql, f'계획 조회 실패: {e}'))
+			continue
+
+		aliases = table_aliases(sql)
+		details = [row[3] for row in plan]
+		# 서브쿼리에만 조건이 있는 전체 갱신(마이그레이션 백필 등)은 의도된 전체 스캔이므로 경고로 분류
+		has_filter = bool(re.search(r'\bWHERE\b', outer_statement(sql), re.IGNORECASE))
+		# 페이지 조회(LIMIT 이 붙은 키셋 쿼리)가 정렬에 임시 B-tree 를 쓰면 페이지마다 전체를 정렬한다
+		if sql.endswith('LIMIT ?') and any('TEMP B-TREE FOR' in detail and 'ORDER BY' in detail for detail in details):
+			failures.append((path, lineno, sql, ' / '.join(details)))
+			continue
+		for detail in details:
+			match = re.match(r'SCAN (\w+)(.*)', detail)
+			if not match or 'USING' in match.group(2):
+				continue
+			table = aliases.get(match.group(1).lower(), match.group(1).lower())
+			if table not in HOT_TABLES:
+				continue
+			entry = (path, lineno, sql, ' / '.join(details))
+			if has_filter:
+				failures.append(entry)
+			else:
+				warnings.append(entry)
+			break
+		if verbose:
+			print(f'{path}:{lineno}: {sql[:100]}')
+			for detail in details:
+				print(f'    {detail}')
+	return failures, warnings
+
+
+def main():
+	parser = argparse.ArgumentParser(description='SQL 실행 계획 점검')
+	parser.add_argument('--scale', type=float, default=1.0, help='시드 데이터 행 수 배율')
+	parser.add_argument('--verbose', action='store_true', help='모든 쿼리의 실행 계획 출력')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-audit-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'audit.db')
+	import app  # 스키마 생성 (마이그레이션 자동 적용)
+
+	conn = sqlite3.connect(os.environ['DATABASE'])
+	rows = seed(conn, args.scale)
+	# schedule_repo.SYNC 가 읽는 원본 DB (빈 일정 테이블)와 SQL 함수
+	schedule_repo.register_functions(conn)
+	conn.execute("ATTACH DATABASE ':memory:' AS source")
+	conn.execute(schedule_repo.SCHEMA.replace('schedules', 'source.schedules', 1))
+	print('시드 데이터: ' + ', '.join(f'{table} {count:,}' for table, count in rows.items()))
+
+	statements = collect_statements(SOURCE_FILES)
+	failures, warnings = audit(conn, statements, verbose=args.verbose)
+	print(f'검사한 SQL: {len(statements)}개 (중복 제외 후 SELECT/UPDATE/DELETE/INSERT 만 검사)\n')
+
+	for path, lineno, sql, plan in warnings:
+		print(f'[경고] {path}:{lineno} 조건 없는 전체 조회: {sql[:90]}\n        {plan}')
+	for path, lineno, sql, plan in failures:
+		print(f'[실패] {path}:{lineno} 인덱스 없이 전체 스캔: {sql[:90]}\n        {plan}')
+
+	if failures:
+		print(f'\n❌ 전체 스캔 쿼리 {len(failures)}개')
+		sys.exit(1)
+	print('\n✅ WHERE 조건이 있는 쿼리 중 전체 스캔 없음')
+
+
+if __name__ == '__main__':
+	main()
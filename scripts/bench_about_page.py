@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+/about 데이터 로딩 비교
+기존 방식(테이블별 8번 쿼리 + site_images dict 구성)과 about_page.load_about_page()
+의 단일 쿼리 경로, 스냅샷 경로(data_versions 확인 1회)의 지연 시간을 비교한다.
+페이지 캐시의 영향을 받지 않도록 라우트 대신 로더와 템플릿 렌더링을 직접 호출한다.
+
+사용법:
+    python scripts/bench_about_page.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_load(conn, lang):
+	"""변경 전 about() 의 조회 방식"""
+	lang_param = 'en' if lang == 'en' else 'ko'
+	site_images = {}
+	for img in conn.execute('SELECT image_key, image_path FROM site_images').fetchall():
+		site_images[img['image_key']] = img['image_path']
+	return {
+		'banner': conn.execute('SELECT * FROM banner_settings WHERE page_name = ?', ('about',)).fetchone(),
+		'sections': conn.execute('SELECT * FROM page_sections WHERE page_name = ? AND is_active = 1 ORDER BY order_num', ('about',)).fetchall(),
+		'pilots': conn.execute('SELECT * FROM pilots WHERE is_active = 1 ORDER BY order_num').fetchall(),
+		'maintenance_crew': conn.execute('SELECT * FROM maintenance_crew WHERE is_active = 1 ORDER BY order_num').fetchall(),
+		'candidates': conn.execute('SELECT * FROM candidates WHERE is_active = 1 ORDER BY order_num').fetchall(),
+		'commanders': conn.execute('SELECT * FROM commander_greeting WHERE is_active = 1 AND lang = ? ORDER BY order_num', (lang_param,)).fetchall(),
+		'overview_sections': conn.execute('SELECT * FROM about_sections WHERE section_type IN (?, ?, ?) AND is_active = 1 AND lang = ? ORDER BY order_num', ('mission', 'selection', 'formation', lang_param)).fetchall(),
+		'site_images': site_images,
+	}
+
+
+def measure(func, iterations):
+	timings = []
+	for _ in range(iterations):
+		started = time.perf_counter()
+		func()
+		timings.append((time.perf_counter() - started) * 1000)
+	timings.sort()
+	return {
+		'mean': statistics.mean(timings),
+		'p50': timings[len(timings) // 2],
+		'p95': timings[int(len(timings) * 0.95)],
+		'p99': timings[int(len(timings) * 0.99)],
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description='/about 데이터 로딩 비교')
+	parser.add_argument('--iterations', type=int, default=2000)
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	database = os.path.join(workdir, 'blackeagles.db')
+	shutil.copy(os.path.join(ROOT, 'blackeagles.db'), database)
+	os.environ['DATABASE'] = database
+	sys.path.insert(0, ROOT)
+	os.chdir(ROOT)
+	from flask import render_template
+	from app import app, get_db
+	from about_page import load_about_page
+
+	def versions(conn):
+		return {row['table_name']: row['version'] for row in conn.execute('SELECT table_name, version FROM data_versions')}
+
+	results = {}
+	with app.test_request_context('/about'):
+		conn = get_db()
+		legacy_html = render_template('about.html', **legacy_load(conn, 'ko'))
+		single_html = render_template('about.html', **load_about_page(conn, 'ko')._asdict())
+		print('렌더링 결과 동일' if legacy_html == single_html else '⚠️ 렌더링 결과가 다릅니다')
+
+		results['기존 8개 쿼리 (조회만)'] = measure(lambda: legacy_load(conn, 'ko'), args.iterations)
+		results['단일 쿼리 (조회만)'] = measure(lambda: load_about_page(conn, 'ko'), args.iterations)
+		results['스냅샷 (버전 확인만)'] = measure(
+			lambda: load_about_page(conn, 'ko', versions=versions(conn)), args.iterations)
+		results['기존 8개 쿼리 + 렌더링'] = measure(
+			lambda: render_template('about.html', **legacy_load(conn, 'ko')), args.iterations)
+		results['단일 쿼리 + 렌더링'] = measure(
+			lambda: render_template('about.html', **load_about_page(conn, 'ko')._asdict()), args.iterations)
+		results['스냅샷 + 렌더링'] = measure(
+			lambda: render_template('about.html', **load_about_page(conn, 'ko', versions=versions(conn))._asdict()),
+			args.iterations)
+
+	print(f'\n반복 {args.iterations}회 (단위 ms)')
+	header = f"{'경로':<24}{'평균':>10}{'p50':>10}{'p95':>10}{'p99':>10}"
+	print(header)
+	print('-' * len(header))
+	for name, stats in results.items():
+		print(f"{name:<24}{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}")
+	shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관리자 채팅 목록(/admin/chats) 조회 비교
+세션 10,000개, 메시지 500,000개를 넣은 임시 DB 에서 기존 쿼리(세션마다 상관 서브쿼리 2개, 전체 목록)와
+세션 요약 컬럼 + (updated_at, id) 키셋 페이지 조회의 지연 시간을 비교한다.
+요약 컬럼을 채우는 마이그레이션(4번)의 백필 시간도 함께 출력한다.
+
+사용법:
+    python scripts/bench_admin_chats.py [--sessions 10000] [--messages 500000] [--iterations 20]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import migrations  # noqa: E402
+
+PAGE_SIZE = 50
+
+LEGACY_QUERY = '''
+	SELECT
+		cs.*,
+		(SELECT COUNT(*) FROM chat_messages
+		 WHERE session_id = cs.session_id AND sender_type = 'user' AND is_read = 0) as unread_count,
+		(SELECT message FROM chat_messages
+		 WHERE session_id = cs.session_id
+		 ORDER BY created_at DESC LIMIT 1) as last_message
+	FROM chat_sessions cs
+	ORDER BY cs.updated_at DESC
+'''
+
+FIRST_PAGE_QUERY = '''
+	SELECT cs.*, cs.unread_user_count AS unread_count
+	FROM chat_sessions cs
+	ORDER BY cs.updated_at DESC, cs.id DESC
+	LIMIT ?
+'''
+
+NEXT_PAGE_QUERY = '''
+	SELECT cs.*, cs.unread_user_count AS unread_count
+	FROM chat_sessions cs
+	WHERE (cs.updated_at, cs.id) < (?, ?)
+	ORDER BY cs.updated_at DESC, cs.id DESC
+	LIMIT ?
+'''
+
+
+def seed(conn, sessions, messages):
+	rng = random.Random(7)
+	base = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+
+	def ts(seconds):
+		return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(base + seconds))
+
+	session_ids = [f'bench-{i:06d}' for i in range(sessions)]
+	conn.executemany(
+		'INSERT INTO chat_sessions (session_id, user_name, user_email, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+		((sid, f'user{i}', '', 'active' if i % 5 == 0 else 'closed', ts(i * 60), ts(i * 60)) for i, sid in enumerate(session_ids)))
+	rows = []
+	for i in range(messages):
+		sid = session_ids[rng.randrange(sessions)]
+		sender = 'user' if rng.random() < 0.6 else 'admin'
+		rows.append((sid, sender, 'name', f'message {i}', int(rng.random() < 0.9), ts(i * 3)))
+	conn.executemany(
+		'INSERT INTO chat_messages (session_id, sender_type, sender_name, message, is_read, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+		rows)
+	# 마지막 메시지 시각으로 세션 업데이트 시간 맞추기 (실제 서비스와 같은 분포)
+	conn.execute('''
+		UPDATE chat_sessions SET updated_at = COALESCE(
+			(SELECT MAX(created_at) FROM chat_messages WHERE session_id = chat_sessions.session_id), updated_at)
+	''')
+	conn.commit()
+	conn.execute('ANALYZE')
+
+
+def measure(func, iterations):
+	timings = []
+	for _ in range(iterations):
+		started = time.perf_counter()
+		func()
+		timings.append((time.perf_counter() - started) * 1000)
+	timings.sort()
+	return {
+		'mean': statistics.mean(timings),
+		'p50': timings[len(timings) // 2],
+		'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description='관리자 채팅 목록 조회 비교')
+	parser.add_argument('--sessions', type=int, default=10000)
+	parser.add_argument('--messages', type=int, default=500000)
+	parser.add_argument('--iterations', type=int, default=20)
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		conn = sqlite3.connect(os.path.join(workdir, 'bench.db'))
+		conn.row_factory = sqlite3.Row
+		migrations.migrate(conn, target=3)
+
+		started = time.perf_counter()
+		seed(conn, args.sessions, args.messages)
+		print(f'시드: 세션 {args.sessions:,}개, 메시지 {args.messages:,}개 ({time.perf_counter() - started:.1f}초)')
+
+		started = time.perf_counter()
+		migrations.migrate(conn, target=4)
+		print(f'요약 컬럼 백필 (마이그레이션 4): {time.perf_counter() - started:.2f}초\n')
+
+		# 요약 값이 기존 서브쿼리 결과와 같은지 확인 (첫 페이지)
+		legacy = {row['session_id']: (row['unread_count'], row['last_message']) for row in conn.execute(LEGACY_QUERY)}
+		first_page = conn.execute(FIRST_PAGE_QUERY, (PAGE_SIZE + 1,)).fetchall()
+		same = all(legacy[row['session_id']] == (row['unread_count'], row['last_message']) for row in first_page)
+		print('첫 페이지 요약 값 일치' if same else '⚠️ 요약 값이 기존 쿼리 결과와 다릅니다')
+
+		middle = conn.execute(FIRST_PAGE_QUERY, (args.sessions // 2,)).fetchall()[-1]
+		results = {
+			'기존 (전체 목록, 상관 서브쿼리)': measure(lambda: conn.execute(LEGACY_QUERY).fetchall(), args.iterations),
+			'요약 컬럼 첫 페이지': measure(
+				lambda: conn.execute(FIRST_PAGE_QUERY, (PAGE_SIZE + 1,)).fetchall(), args.iterations),
+			'요약 컬럼 중간 페이지 (키셋)': measure(
+				lambda: conn.execute(NEXT_PAGE_QUERY, (middle['updated_at'], middle['id'], PAGE_SIZE + 1)).fetchall(),
+				args.iterations),
+		}
+
+		print(f'\n반복 {args.iterations}회 (단위 ms, 페이지 크기 {PAGE_SIZE})')
+		header = f"{'조회':<30}{'평균':>10}{'p50':>10}{'p95':>10}"
+		print(header)
+		print('-' * len(header))
+		for name, stats in results.items():
+			print(f"{name:<30}{stats['mean']:>10.2f}{stats['p50']:>10.2f}{stats['p95']:>10.2f}")
+		conn.close()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
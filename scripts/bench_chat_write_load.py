@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+채팅 쓰기 부하 중 읽기 지연 측정
+/chat/send 를 여러 스레드로 계속 호출하는 동안 /about 응답 시간을 측정한다.
+저장 모드(rollback / wal)와 쓰기 큐 사용 여부별로 각각 별도 프로세스에서 실행한다.
+
+사용법:
+    python scripts/bench_chat_write_load.py [--seconds 10] [--writers 8] [--readers 4]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+	('rollback, 큐 없음 (기존 방식)', {'DB_STORAGE_MODE': 'rollback', 'DB_WRITE_QUEUE': 'false'}),
+	('wal, 큐 없음', {'DB_STORAGE_MODE': 'wal', 'DB_WRITE_QUEUE': 'false'}),
+	('wal + 쓰기 큐', {'DB_STORAGE_MODE': 'wal', 'DB_WRITE_QUEUE': 'true'}),
+]
+
+
+def percentile(values, pct):
+	if not values:
+		return 0.0
+	values = sorted(values)
+	index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+	return values[index]
+
+
+def run_worker(seconds, writers, readers):
+	"""하위 프로세스: 환경변수로 설정된 앱을 띄워 부하를 건 뒤 결과를 JSON 으로 출력"""
+	sys.path.insert(0, ROOT)
+	os.chdir(ROOT)
+	from app import app
+
+	stop = threading.Event()
+	read_latencies = []
+	counters = {'writes': 0, 'write_errors': 0, 'read_errors': 0}
+	lock = threading.Lock()
+
+	def writer(index):
+		client = app.test_client()
+		session_id = f'bench-{index}'
+		while not stop.is_set():
+			try:
+				response = client.post('/chat/send', json={
+					'session_id': session_id, 'message': 'load test message', 'sender_name': 'bench'})
+				ok = response.status_code == 200
+			except Exception:
+				ok = False
+			with lock:
+				counters['writes' if ok else 'write_errors'] += 1
+
+	def reader():
+		client = app.test_client()
+		while not stop.is_set():
+			started = time.perf_counter()
+			try:
+				ok = client.get('/about').status_code == 200
+			except Exception:
+				ok = False
+			elapsed = (time.perf_counter() - started) * 1000
+			with lock:
+				if ok:
+					read_latencies.append(elapsed)
+				else:
+					counters['read_errors'] += 1
+
+	threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+	threads += [threading.Thread(target=reader) for _ in range(readers)]
+	for thread in threads:
+		thread.start()
+	time.sleep(seconds)
+	stop.set()
+	for thread in threads:
+		thread.join()
+
+	print(json.dumps({
+		'reads': len(read_latencies),
+		'read_p50_ms': percentile(read_latencies, 50),
+		'read_p95_ms': percentile(read_latencies, 95),
+		'read_p99_ms': percentile(read_latencies, 99),
+		'read_mean_ms': statistics.mean(read_latencies) if read_latencies else 0.0,
+		'writes_per_sec': counters['writes'] / seconds,
+		'write_errors': counters['write_errors'],
+		'read_errors': counters['read_errors'],
+	}))
+
+
+def main():
+	parser = argparse.ArgumentParser(description='채팅 쓰기 부하 중 /about 읽기 지연 측정')
+	parser.add_argument('--seconds', type=float, default=10)
+	parser.add_argument('--writers', type=int, default=8)
+	parser.add_argument('--readers', type=int, default=4)
+	parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.worker:
+		run_worker(args.seconds, args.writers, args.readers)
+		return
+
+	print(f'쓰기 스레드 {args.writers}개, 읽기 스레드 {args.readers}개, {args.seconds:g}초씩 측정\n')
+	header = f"{'시나리오':<28}{'읽기 수':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'쓰기/s':>10}{'쓰기 실패':>10}{'읽기 실패':>10}"
+	print(header)
+	print('-' * len(header))
+	for name, overrides in SCENARIOS:
+		workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+		database = os.path.join(workdir, 'blackeagles.db')
+		shutil.copy(os.path.join(ROOT, 'blackeagles.db'), database)
+		env = dict(os.environ, DATABASE=database, **overrides)
+		output = subprocess.run(
+			[sys.executable, __file__, '--worker', '--seconds', str(args.seconds),
+			 '--writers', str(args.writers), '--readers', str(args.readers)],
+			env=env, capture_output=True, text=True, check=True,
+		).stdout
+		result = json.loads(output.strip().splitlines()[-1])
+		print(f"{name:<28}{result['reads']:>8}{result['read_p50_ms']:>10.1f}{result['read_p95_ms']:>10.1f}"
+			f"{result['read_p99_ms']:>10.1f}{result['writes_per_sec']:>10.0f}{result['write_errors']:>10}{result['read_errors']:>10}")
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
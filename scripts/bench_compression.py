@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+응답 압축 전후 페이지 전송량과 느린 회선 로딩 시간
+페이지(기본 /about)와 그 페이지가 불러오는 CSS/JS 를 Accept-Encoding 별(identity, gzip, br)로 요청해
+전송 바이트와 서버 처리 시간(페이지 캐시 적중 상태의 중앙값)을 재고, 느린 회선에서의 로딩 시간을
+  HTML: 왕복 지연 + 서버 시간 + 바이트/대역폭,  CSS/JS: HTML 뒤에 동시에 왕복 지연 + 합계 바이트/대역폭
+으로 계산한다. 정적 파일의 .gz/.br 은 static 폴더의 임시 복사본에 만든다 (저장소 파일은 바뀌지 않음).
+
+사용법:
+    python scripts/bench_compression.py [--pages /about,/] [--repeat 50]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from check_static_caching import ResourceCollector  # noqa: E402
+
+# (이름, 내려받기 대역폭 kbps, 왕복 지연 ms)
+LINKS = (('slow 3G', 400, 400), ('3G', 1600, 150), ('LTE', 12000, 50))
+TEXT_ASSETS = ('.css', '.js')
+
+
+def fetch(client, url, encoding, repeat=1):
+	"""(응답, 서버 처리 시간 중앙값 s)"""
+	timings = []
+	for _ in range(repeat):
+		started = time.perf_counter()
+		response = client.get(url, headers={'Accept-Encoding': encoding})
+		response.get_data()
+		timings.append(time.perf_counter() - started)
+		assert response.status_code == 200, (url, response.status_code)
+	return response, statistics.median(timings)
+
+
+def load_time(html_bytes, server, asset_bytes, kbps, rtt_ms):
+	rtt = rtt_ms / 1000
+	seconds = rtt + server + html_bytes * 8 / (kbps * 1000)
+	if asset_bytes:
+		seconds += rtt + asset_bytes * 8 / (kbps * 1000)
+	return seconds
+
+
+def main():
+	parser = argparse.ArgumentParser(description='응답 압축 전후 전송량과 느린 회선 로딩 시간')
+	parser.add_argument('--pages', default='/about')
+	parser.add_argument('--repeat', type=int, default=50, help='서버 시간을 잴 요청 수')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'bench.db')
+	shutil.copy(os.path.join(ROOT, 'blackeagles.db'), os.environ['DATABASE'])
+	try:
+		import app as webapp
+		from compression import available_encodings, build
+
+		webapp.app.static_folder = os.path.join(workdir, 'static')
+		shutil.copytree(os.path.join(ROOT, 'static'), webapp.app.static_folder)
+		stats = build(webapp.app.static_folder)
+		client = webapp.app.test_client()
+		encodings = ('identity',) + available_encodings()
+		print(f"정적 텍스트 파일 {stats['files']}개 {stats['bytes'] / 1024:.0f} KB 미리 압축: "
+			+ ', '.join(f'{name} {size / 1024:.0f} KB' for name, size in stats['compressed'].items()))
+		print(f"HTML 압축 기준 COMPRESS_MIN_SIZE={webapp.app.config['COMPRESS_MIN_SIZE']}B, gzip 수준 {webapp.app.config['COMPRESS_LEVEL']}\n")
+
+		for page in args.pages.split(','):
+			collector = ResourceCollector()
+			collector.feed(fetch(client, page, 'identity')[0].get_data(as_text=True))
+			assets = sorted(url for url in collector.urls if url.split('?', 1)[0].endswith(TEXT_ASSETS))
+
+			header = (f"{'Accept-Encoding':<16}{'HTML B':>10}{'CSS/JS B':>10}{'서버 ms':>10}"
+				+ ''.join(f'{name + " s":>12}' for name, _, _ in LINKS))
+			print(f'{page} (CSS/JS {len(assets)}개)')
+			print(header)
+			print('-' * (len(header) + 4))
+			for encoding in encodings:
+				fetch(client, page, encoding)  # 페이지 캐시와 압축 결과 재사용 준비
+				response, server = fetch(client, page, encoding, args.repeat)
+				assert response.headers.get('Content-Encoding', 'identity') == encoding, response.headers
+				html_bytes = len(response.get_data())
+				asset_bytes = sum(len(fetch(client, url, encoding)[0].get_data()) for url in assets)
+				times = ''.join(f'{load_time(html_bytes, server, asset_bytes, kbps, rtt):>12.2f}' for _, kbps, rtt in LINKS)
+				print(f'{encoding:<16}{html_bytes:>10}{asset_bytes:>10}{server * 1000:>10.2f}{times}')
+			print()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+갤러리 일괄 업로드 처리량 (장/초)
+휴대폰 사진 크기 JPEG 여러 장을 /admin/gallery/upload 한 요청으로 올리고(--zip 이면 zip 하나로),
+요청이 끝날 때까지(저장 + 최적화 + 갤러리 행 추가) 걸린 시간으로 초당 처리한 사진 수를 구한다.
+IMAGE_BATCH_WORKERS 값별로 비교하며, 코어 수만큼 늘릴 때 처리량이 거의 비례해서 늘어야 한다.
+반응형 변형 생성은 응답 뒤 백그라운드에서 하므로 시간에 넣지 않는다 (실행 사이에 끝날 때까지 기다림).
+
+사용법:
+    python scripts/bench_gallery_upload.py [--photos 200] [--workers 1,2,4] [--size 4032x3024] [--zip]
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_image_uploads import make_photo  # noqa: E402
+
+
+def upload(client, photos, as_zip):
+	if as_zip:
+		buf = io.BytesIO()
+		with zipfile.ZipFile(buf, 'w', zipfile.ZIP_STORED) as archive:
+			for i, data in enumerate(photos):
+				archive.writestr(f'airshow/{i:04d}.jpg', data)
+		files = [(io.BytesIO(buf.getvalue()), 'airshow.zip')]
+	else:
+		files = [(io.BytesIO(data), f'{i:04d}.jpg') for i, data in enumerate(photos)]
+	return client.post('/admin/gallery/upload', data={'title': 'bench', 'is_active': '1', 'photos': files},
+		content_type='multipart/form-data')
+
+
+def main():
+	parser = argparse.ArgumentParser(description='갤러리 일괄 업로드 처리량')
+	parser.add_argument('--photos', type=int, default=200)
+	parser.add_argument('--workers', default='1,2,4', help='비교할 IMAGE_BATCH_WORKERS 값 (쉼표 구분)')
+	parser.add_argument('--size', default='4032x3024')
+	parser.add_argument('--zip', action='store_true', help='사진을 zip 하나로 묶어 올린다')
+	args = parser.parse_args()
+	width, height = (int(v) for v in args.size.split('x'))
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'bench.db')
+	try:
+		import app as webapp
+		webapp.app.static_folder = os.path.join(workdir, 'static')
+		webapp.image_pipeline.incoming_folder = os.path.join(workdir, 'incoming')
+		client = webapp.app.test_client()
+		with client.session_transaction() as sess:
+			sess['logged_in'] = True
+
+		photos = [make_photo(width, height, i) for i in range(args.photos)]
+		size_mb = sum(len(p) for p in photos) / 1024 / 1024
+		print(f'사진 {args.photos}장 ({width}x{height}, 합계 {size_mb:.0f}MB), CPU 코어 {os.cpu_count()}개, '
+			f'{"zip 하나" if args.zip else "파일 여러 개"}로 업로드\n')
+
+		header = f"{'IMAGE_BATCH_WORKERS':>20}{'요청 s':>10}{'장/초':>10}{'추가된 행':>12}"
+		print(header)
+		print('-' * (len(header) + 4))
+		for workers in (int(v) for v in args.workers.split(',')):
+			# 같은 사진은 다시 처리하지 않으므로 실행마다 결과 폴더와 행을 비운다
+			shutil.rmtree(os.path.join(workdir, 'static', 'gallery'), ignore_errors=True)
+			webapp.db.write(lambda conn: conn.execute('DELETE FROM gallery'))
+			webapp.image_pipeline.batch_workers = workers
+
+			started = time.perf_counter()
+			response = upload(client, photos, args.zip)
+			elapsed = time.perf_counter() - started
+			assert response.status_code == 302, response.status_code
+			with webapp.app.app_context():
+				rows = webapp.get_db().execute('SELECT COUNT(*) FROM gallery').fetchone()[0]
+			print(f'{workers:>20}{elapsed:>10.2f}{args.photos / elapsed:>10.2f}{rows:>12}')
+			# 백그라운드 변형 생성이 다음 실행과 CPU 를 다투지 않게 끝날 때까지 기다린다
+			webapp.image_pipeline.shutdown()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관리자 사진 일괄 업로드 중 워커 점유 시간 비교
+휴대폰 사진 크기(기본 4032x3024) JPEG 50장을 /admin/pilots/new 로 차례로 올리면서
+요청 하나가 워커(스레드)를 붙잡고 있는 시간과, 모든 사진이 최종 URL 로 바뀔 때까지 걸린 시간을
+IMAGE_WORKERS 값별로 비교한다. 0 은 예전처럼 요청 안에서 최적화하는 방식이다.
+
+사용법:
+    python scripts/bench_image_uploads.py [--photos 50] [--workers 0,2,4] [--size 4032x3024]
+"""
+
+import argparse
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image  # noqa: E402
+
+
+def make_photo(width, height, seed):
+	"""노이즈 + 그라데이션으로 실제 사진과 비슷한 압축률의 JPEG 생성"""
+	noise = Image.effect_noise((width // 4, height // 4), 40 + seed % 20).resize((width, height))
+	gradient = Image.linear_gradient('L').resize((width, height))
+	img = Image.merge('RGB', (noise, gradient, Image.blend(noise, gradient, 0.5)))
+	buf = io.BytesIO()
+	img.save(buf, 'JPEG', quality=92)
+	return buf.getvalue()
+
+
+def pending(webapp):
+	with webapp.app.app_context():
+		return webapp.get_db().execute("SELECT COUNT(*) FROM image_jobs WHERE status = 'queued'").fetchone()[0]
+
+
+def run(webapp, client, photos, workers):
+	webapp.image_pipeline.shutdown()
+	webapp.image_pipeline.workers = workers
+	# 프로세스 풀 준비 (gunicorn 워커가 첫 업로드 전에 이미 떠 있는 상태와 맞추기 위해 시간에서 제외)
+	if workers:
+		webapp.image_pipeline._pool().submit(time.sleep, 0).result()
+
+	held = []
+	started = time.perf_counter()
+	for i, data in enumerate(photos):
+		form = {'number': str(i), 'position': 'WING', 'callsign': f'bench{workers}_{i}', 'generation': '1',
+			'aircraft': 'T-50', 'order_num': '0', 'is_active': '1', 'photo': (io.BytesIO(data), f'{i}.jpg')}
+		request_started = time.perf_counter()
+		response = client.post('/admin/pilots/new', data=form, content_type='multipart/form-data')
+		held.append((time.perf_counter() - request_started) * 1000)
+		assert response.status_code == 302, response.status_code
+	uploaded = time.perf_counter() - started
+	while pending(webapp):
+		time.sleep(0.05)
+	finished = time.perf_counter() - started
+	return {
+		'held_mean': statistics.mean(held),
+		'held_p95': sorted(held)[int(len(held) * 0.95) - 1],
+		'held_total': sum(held) / 1000,
+		'uploaded': uploaded,
+		'finished': finished,
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description='사진 일괄 업로드 중 워커 점유 시간 비교')
+	parser.add_argument('--photos', type=int, default=50)
+	parser.add_argument('--workers', default='0,2,4', help='비교할 IMAGE_WORKERS 값 (쉼표 구분)')
+	parser.add_argument('--size', default='4032x3024')
+	args = parser.parse_args()
+	width, height = (int(v) for v in args.size.split('x'))
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'bench.db')
+	try:
+		import app as webapp
+		webapp.app.static_folder = os.path.join(workdir, 'static')
+		webapp.image_pipeline.incoming_folder = os.path.join(workdir, 'incoming')
+		client = webapp.app.test_client()
+		with client.session_transaction() as sess:
+			sess['logged_in'] = True
+
+		photos = [make_photo(width, height, i) for i in range(args.photos)]
+		size_mb = sum(len(p) for p in photos) / len(photos) / 1024 / 1024
+		print(f'사진 {args.photos}장, {width}x{height}, 평균 {size_mb:.1f}MB\n')
+
+		header = (f"{'IMAGE_WORKERS':>14}{'요청 평균 ms':>14}{'요청 p95 ms':>14}{'점유 합계 s':>13}"
+			f"{'업로드 완료 s':>15}{'처리 완료 s':>13}")
+		print(header)
+		print('-' * (len(header) + 8))
+		for workers in (int(v) for v in args.workers.split(',')):
+			result = run(webapp, client, photos, workers)
+			print(f"{workers:>14}{result['held_mean']:>14.1f}{result['held_p95']:>14.1f}{result['held_total']:>13.2f}"
+				f"{result['uploaded']:>15.2f}{result['finished']:>13.2f}")
+		webapp.image_pipeline.shutdown()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+목록 페이지 응답 시간/메모리 비교
+공지·갤러리·문의 행 수를 늘려 가며 목록 페이지(첫 페이지, 마지막 쪽 근처 페이지)를
+Flask 테스트 클라이언트로 요청하고, 요청당 응답 시간과 파이썬 할당 최대치(tracemalloc)를 출력한다.
+키셋 페이지네이션이면 행 수가 늘어도 두 값이 거의 변하지 않아야 한다.
+기존 방식(전체 fetchall)과 비교하려면 --legacy 로 같은 SQL 의 전체 조회 시간을 함께 본다.
+
+사용법:
+    python scripts/bench_list_pages.py [--sizes 1000,10000,100000] [--iterations 10] [--legacy]
+"""
+
+import argparse
+import html
+import os
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = [
+	('/notice', 'SELECT * FROM notices ORDER BY created_at DESC'),
+	('/gallery', 'SELECT * FROM gallery WHERE is_active = 1 ORDER BY order_num, upload_date DESC'),
+	('/admin/messages', 'SELECT * FROM contact_messages ORDER BY created_at DESC'),
+]
+
+
+def seed(path, rows):
+	conn = sqlite3.connect(path)
+	conn.execute('DELETE FROM notices')
+	conn.execute('DELETE FROM gallery')
+	conn.execute('DELETE FROM contact_messages')
+
+	def ts(i):
+		return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(1_600_000_000 + i * 60))
+
+	conn.executemany('INSERT INTO notices (title, content, author, created_at) VALUES (?, ?, ?, ?)',
+		((f'notice {i}', 'content ' * 20, 'admin', ts(i)) for i in range(rows)))
+	conn.executemany('INSERT INTO gallery (title, image_url, order_num, is_active, upload_date) VALUES (?, ?, ?, ?, ?)',
+		((f'photo {i}', f'/static/Picture/{i}.jpg', 0, 1, ts(i)) for i in range(rows)))
+	conn.executemany('INSERT INTO contact_messages (name, email, message, type, created_at) VALUES (?, ?, ?, ?, ?)',
+		((f'name{i}', 'a@b.c', 'message ' * 20, 'contact', ts(i)) for i in range(rows)))
+	conn.commit()
+	conn.execute('ANALYZE')
+	conn.close()
+
+
+def deep_url(client, path, hops):
+	"""다음 페이지 링크를 hops 번 따라간 URL (중간 이후 페이지)"""
+	url = path
+	for _ in range(hops):
+		found = re.search(rb'class="pager-next" href="([^"]+)"', client.get(url).data)
+		if not found:
+			break
+		url = html.unescape(found.group(1).decode())
+	return url
+
+
+def measure(client, url, iterations, reset):
+	"""reset: 매 요청 전에 공개 페이지 캐시를 비워 매번 실제로 조회/렌더링하게 한다"""
+	timings, peaks = [], []
+	for _ in range(iterations):
+		reset()
+		tracemalloc.start()
+		started = time.perf_counter()
+		response = client.get(url)
+		timings.append((time.perf_counter() - started) * 1000)
+		peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+		tracemalloc.stop()
+		assert response.status_code == 200, (url, response.status_code)
+	return statistics.median(timings), max(peaks)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='목록 페이지 응답 시간/메모리 비교')
+	parser.add_argument('--sizes', default='1000,10000,100000')
+	parser.add_argument('--iterations', type=int, default=10)
+	parser.add_argument('--hops', type=int, default=5, help='깊은 페이지까지 따라갈 다음 링크 수')
+	parser.add_argument('--legacy', action='store_true', help='전체 fetchall 조회 시간도 출력')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'bench.db')
+	try:
+		import app as webapp
+		app = webapp.app
+		client = app.test_client()
+		with client.session_transaction() as sess:
+			sess['logged_in'] = True
+
+		print(f"페이지 크기 {app.config['LIST_PAGE_SIZE']}, 반복 {args.iterations}회 (응답 ms 는 중앙값, 메모리는 요청당 최대 KB)\n")
+		header = f"{'행 수':>10}  {'페이지':<28}{'첫 페이지 ms':>14}{'KB':>10}{'깊은 페이지 ms':>16}{'KB':>10}"
+		if args.legacy:
+			header += f"{'전체 조회 ms':>14}"
+		print(header)
+		print('-' * (len(header) + 6))
+		for rows in (int(size) for size in args.sizes.split(',')):
+			seed(os.environ['DATABASE'], rows)
+			for path, legacy_sql in PAGES:
+				first_ms, first_kb = measure(client, path, args.iterations, webapp.page_cache.clear)
+				deep_ms, deep_kb = measure(
+					client, deep_url(client, path, args.hops), args.iterations, webapp.page_cache.clear)
+				line = f'{rows:>10,}  {path:<28}{first_ms:>14.2f}{first_kb:>10.0f}{deep_ms:>16.2f}{deep_kb:>10.0f}'
+				if args.legacy:
+					conn = sqlite3.connect(os.environ['DATABASE'])
+					started = time.perf_counter()
+					conn.execute(legacy_sql).fetchall()
+					line += f'{(time.perf_counter() - started) * 1000:>14.2f}'
+					conn.close()
+				print(line)
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
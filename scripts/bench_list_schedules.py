@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+schedule.py 일정 목록 출력: 예전 list_schedules() vs D-Day SQL 계산 + 페이지 단위 출력
+임시 DB 에 일정 --rows 개를 넣고 'all' 목록을
+  예전 방식: fetchall 후 행마다 strptime/now 로 D-Day 계산, 전체 행을 한 번에 tabulate
+  list_schedules(): julianday 로 D-Day 계산, --page-size 행씩 가져와 출력
+  list_schedules(limit=50, offset=rows/2): 중간 한 페이지
+로 출력(버림)하며 걸린 시간과 파이썬 할당 최대치(tracemalloc, 따로 한 번 더 실행)를 잰다.
+
+사용법:
+    python scripts/bench_list_schedules.py [--rows 500000] [--page-size 100]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from tabulate import tabulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import search  # noqa: E402
+from schedule import FlightScheduleManager  # noqa: E402
+
+
+def legacy_list(cursor):
+	"""예전 list_schedules('all') 의 조회와 출력"""
+	cursor.execute('SELECT * FROM schedules ORDER BY event_date DESC')
+	schedules = cursor.fetchall()
+	table_data = []
+	for schedule in schedules:
+		event_date = datetime.strptime(schedule['event_date'], '%Y-%m-%d')
+		today_date = datetime.now()
+		delta = (event_date.date() - today_date.date()).days
+		if delta < 0:
+			d_day = f"D+{abs(delta)}"
+		elif delta == 0:
+			d_day = "D-Day"
+		else:
+			d_day = f"D-{delta}"
+		table_data.append([
+			schedule['id'],
+			schedule['title'],
+			schedule['location'] or '-',
+			schedule['event_date'],
+			d_day,
+			schedule['description'][:30] + '...' if schedule['description'] and len(schedule['description']) > 30 else schedule['description'] or '-'
+		])
+	headers = ['ID', '제목', '장소', '날짜', 'D-Day', '설명']
+	print("\n" + "="*100)
+	print(tabulate(table_data, headers=headers, tablefmt='grid'))
+	print("="*100 + "\n")
+	return len(schedules)
+
+
+def populate(path, rows, seed=1):
+	rng = random.Random(seed)
+	start = date(2015, 1, 1)
+	manager = FlightScheduleManager(path)
+	conn = sqlite3.connect(path)
+	conn.execute('BEGIN')
+	with search.deferred_index(conn, 'schedules'):
+		conn.executemany('INSERT INTO schedules (title, location, event_date, description) VALUES (?, ?, ?, ?)',
+			((f'비행 {i}', f'기지{rng.randrange(40)}', (start + timedelta(days=rng.randrange(5000))).isoformat(),
+				'편대 기동 연습과 스모크 점검, 관람객 안내 방송 리허설' if i % 2 else '') for i in range(rows)))
+	conn.commit()
+	conn.close()
+	return manager
+
+
+def measure(fn, trace=False):
+	"""(결과, 초, 파이썬 할당 최대치 MB 또는 None) - 출력은 버린다"""
+	if trace:
+		tracemalloc.start()
+	started = time.perf_counter()
+	with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+		result = fn()
+	seconds = time.perf_counter() - started
+	peak = None
+	if trace:
+		peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+		tracemalloc.stop()
+	return result, seconds, peak
+
+
+def main():
+	parser = argparse.ArgumentParser(description='일정 목록 출력 시간과 메모리')
+	parser.add_argument('--rows', type=int, default=500000)
+	parser.add_argument('--page-size', type=int, default=100)
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		manager = populate(os.path.join(workdir, 'schedules.db'), args.rows)
+		manager.connect()
+		cases = [
+			('예전 list_schedules() 전체', lambda: legacy_list(manager.cursor)),
+			(f'list_schedules() 전체 ({args.page_size}행씩)', lambda: manager.list_schedules(page_size=args.page_size)),
+			('list_schedules(limit=50, 중간)', lambda: manager.list_schedules(limit=50, offset=args.rows // 2)),
+		]
+		print(f'일정 {args.rows:,}개\n')
+		header = f"{'방식':<36}{'행':>10}{'초':>8}{'최대 할당 MB':>14}"
+		print(header)
+		print('-' * (len(header) + 6))
+		for label, fn in cases:
+			count, seconds, _ = measure(fn)
+			_, _, peak = measure(fn, trace=True)
+			print(f'{label:<36}{count:>10,}{seconds:>8.2f}{peak:>14.1f}')
+		manager.close()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
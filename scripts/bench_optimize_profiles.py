@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업로드 최적화 프로필별 시간과 최대 메모리 (images.OPTIMIZE_PROFILES)
+static/images 의 사진(반응형 변형 <이름>-<너비>w.* 제외)과 --dslr 장의 24MP(6000x4000) JPEG 를
+프로필마다 1200px JPEG 로 최적화하며, 사진 한 장마다 걸린 시간과 최대 RSS 증가량을 잰다.
+최대 RSS 는 /proc/self/clear_refs 로 VmHWM 을 되돌린 뒤 처리 후 VmHWM - 처리 전 VmRSS 로 구한다
+(Linux 전용, 되돌릴 수 없으면 메모리 열은 비운다). 프로필마다 새 프로세스에서 실행한다.
+결과 파일은 임시 폴더에 쓰므로 저장소 파일은 바뀌지 않는다.
+
+사용법:
+    python scripts/bench_optimize_profiles.py [--dslr 3] [--profiles quality,balanced,fast] [--repeat 1]
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VARIANT = re.compile(r'-\d+w\.\w+$')
+
+
+def memory():
+	"""(현재 RSS, 최대 RSS) MB - /proc 이 없으면 None"""
+	values = {}
+	try:
+		with open('/proc/self/status') as f:
+			for line in f:
+				key, _, value = line.partition(':')
+				if key in ('VmRSS', 'VmHWM'):
+					values[key] = int(value.split()[0]) / 1024
+	except OSError:
+		return None
+	return values['VmRSS'], values['VmHWM']
+
+
+def reset_peak():
+	"""VmHWM 을 현재 RSS 로 되돌린다 (성공 여부)"""
+	try:
+		with open('/proc/self/clear_refs', 'w') as f:
+			f.write('5')
+		return True
+	except OSError:
+		return False
+
+
+def run_profile(profile, paths, repeat, workdir):
+	"""(자식 프로세스) 사진마다 {'seconds', 'peak_mb', 'bytes'} 를 JSON 으로 출력"""
+	import images
+
+	results = []
+	for i, path in enumerate(paths):
+		output_path = os.path.join(workdir, f'{profile}-{i}.jpg')
+		# 처음 한 번은 모듈/코덱 로딩이 섞이므로 재지 않는다
+		images._optimize(path, output_path, profile=profile)
+		for _ in range(repeat):
+			tracked = reset_peak()
+			before = memory()
+			started = time.perf_counter()
+			images._optimize(path, output_path, profile=profile)
+			seconds = time.perf_counter() - started
+			after = memory()
+			peak = after[1] - before[0] if tracked and before and after else None
+			results.append({'path': path, 'seconds': seconds, 'peak_mb': peak, 'bytes': os.path.getsize(output_path)})
+	print(json.dumps(results))
+
+
+def make_dslr(path, seed):
+	"""카메라 원본 크기(6000x4000, 품질 95) 노이즈 JPEG"""
+	from PIL import Image
+	noise = Image.effect_noise((6000, 4000), 48 + seed)
+	image = Image.merge('RGB', (noise, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT), noise.transpose(Image.Transpose.FLIP_TOP_BOTTOM)))
+	buf = io.BytesIO()
+	image.save(buf, 'JPEG', quality=95)
+	with open(path, 'wb') as f:
+		f.write(buf.getvalue())
+
+
+def percentile(values, p):
+	values = sorted(values)
+	return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def summarize(profile, label, rows):
+	seconds = [row['seconds'] for row in rows]
+	peaks = [row['peak_mb'] for row in rows if row['peak_mb'] is not None]
+	peak = f'{max(peaks):>12.1f}' if peaks else f"{'-':>12}"
+	print(f'{profile:<10}{label:<10}{len(rows):>6}{sum(seconds):>10.2f}{sum(seconds) / len(rows) * 1000:>10.0f}'
+		f'{percentile(seconds, 95) * 1000:>10.0f}{peak}{sum(row["bytes"] for row in rows) / len(rows) / 1024:>12.0f}')
+
+
+def main():
+	import images
+
+	parser = argparse.ArgumentParser(description='업로드 최적화 프로필별 시간과 최대 메모리')
+	parser.add_argument('--profiles', default=','.join(images.OPTIMIZE_PROFILES))
+	parser.add_argument('--dslr', type=int, default=3, help='함께 처리할 24MP JPEG 장 수')
+	parser.add_argument('--repeat', type=int, default=1, help='사진마다 잴 횟수')
+	parser.add_argument('--images', default=os.path.join(ROOT, 'static', 'images'))
+	parser.add_argument('--child', help=argparse.SUPPRESS)
+	parser.add_argument('--workdir', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		run_profile(args.child, json.loads(sys.stdin.read()), args.repeat, args.workdir)
+		return
+
+	static = sorted(os.path.join(args.images, name) for name in os.listdir(args.images)
+		if os.path.splitext(name)[1].lower() in images.UPLOAD_EXTENSIONS and not VARIANT.search(name))
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		dslr = []
+		for i in range(args.dslr):
+			dslr.append(os.path.join(workdir, f'dslr-{i}.jpg'))
+			make_dslr(dslr[-1], i)
+		print(f'static/images {len(static)}장 + 24MP JPEG {len(dslr)}장, 최대 1200px JPEG 로 최적화, 사진당 {args.repeat}회\n')
+
+		header = f"{'프로필':<10}{'사진':<10}{'장':>6}{'합계 s':>10}{'평균 ms':>10}{'p95 ms':>10}{'최대 RSS MB':>12}{'결과 KB':>12}"
+		print(header)
+		print('-' * (len(header) + 8))
+		for profile in args.profiles.split(','):
+			child = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', profile, '--workdir', workdir,
+				'--repeat', str(args.repeat)], input=json.dumps(static + dslr), capture_output=True, text=True, check=True)
+			rows = json.loads(child.stdout)
+			summarize(profile, 'static', [row for row in rows if row['path'] not in dslr])
+			if dslr:
+				summarize(profile, '24MP', [row for row in rows if row['path'] in dslr])
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
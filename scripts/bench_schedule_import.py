@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+schedule.py 일정 가져오기/내보내기 처리량 (행/초)
+임시 폴더에 일정 --rows 개짜리 CSV 와 JSON 파일을 만들고, 빈 DB 마다
+  예전 방식: add_schedule() 을 행마다 호출 (행마다 커밋, --legacy-rows 개만 재서 행/초 계산)
+  import_schedules(): 스트리밍 읽기 + 검증 + executemany 한 트랜잭션
+로 넣고, export_schedules() 로 다시 내보내며 걸린 시간과 파이썬 할당 최대치(tracemalloc)를 출력한다.
+tracemalloc 은 실행을 느리게 하므로 시간과 메모리는 따로 (빈 DB 에서 한 번씩 더) 잰다.
+내보내기 메모리가 행 수와 상관없이 작으면 테이블 전체를 메모리에 올리지 않는 것이다.
+
+사용법:
+    python scripts/bench_schedule_import.py [--rows 100000] [--legacy-rows 2000]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from schedule import FlightScheduleManager  # noqa: E402
+
+PLACES = ['서울공항', '청주기지', '원주기지', '사천기지', '광주기지', '여수', '부산', '강릉', 'Singapore', 'Fairford']
+
+
+def events(rows, seed=1):
+	rng = random.Random(seed)
+	start = date(2020, 1, 1)
+	for i in range(rows):
+		place = rng.choice(PLACES)
+		yield {
+			'title': f'{place} 비행 {i}',
+			'location': place,
+			'event_date': (start + timedelta(days=rng.randrange(3650))).isoformat(),
+			'description': '편대 기동, 스모크 점검, 관람객 안내' if i % 3 else '',
+		}
+
+
+def write_files(workdir, rows):
+	csv_path = os.path.join(workdir, 'events.csv')
+	json_path = os.path.join(workdir, 'events.json')
+	with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+		writer = csv.DictWriter(f, fieldnames=('title', 'location', 'event_date', 'description'))
+		writer.writeheader()
+		writer.writerows(events(rows))
+	with open(json_path, 'w', encoding='utf-8') as f:
+		f.write('[\n' + ',\n'.join(json.dumps(event, ensure_ascii=False) for event in events(rows)) + '\n]\n')
+	return csv_path, json_path
+
+
+def measure(fn, trace=False):
+	"""(결과, 초, 파이썬 할당 최대치 MB) - trace=False 면 메모리는 재지 않는다 (tracemalloc 이 느리게 만들므로)"""
+	if trace:
+		tracemalloc.start()
+	started = time.perf_counter()
+	with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+		result = fn()
+	seconds = time.perf_counter() - started
+	peak = None
+	if trace:
+		peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+		tracemalloc.stop()
+	return result, seconds, peak
+
+
+def fresh_manager(workdir, name):
+	manager = FlightScheduleManager(os.path.join(workdir, name))
+	manager.connect()
+	return manager
+
+
+def main():
+	parser = argparse.ArgumentParser(description='일정 가져오기/내보내기 처리량')
+	parser.add_argument('--rows', type=int, default=100000)
+	parser.add_argument('--legacy-rows', type=int, default=2000, help='예전 방식으로 넣을 행 수 (행마다 커밋이라 느림)')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		csv_path, json_path = write_files(workdir, args.rows)
+		print(f"일정 {args.rows:,}개: CSV {os.path.getsize(csv_path) / 1024 / 1024:.1f}MB, "
+			f"JSON {os.path.getsize(json_path) / 1024 / 1024:.1f}MB\n")
+
+		header = f"{'작업':<36}{'행':>10}{'초':>8}{'행/초':>10}{'최대 할당 MB':>14}"
+		print(header)
+		print('-' * (len(header) + 6))
+
+		def report(label, rows, seconds, peak):
+			print(f'{label:<36}{rows:>10,}{seconds:>8.2f}{rows / seconds:>10,.0f}{peak:>14.1f}')
+
+		def run(name, fn):
+			"""빈 DB 에서 fn(manager) 를 두 번 (시간, tracemalloc 으로 메모리)"""
+			results = []
+			for trace in (False, True):
+				manager = fresh_manager(workdir, f'{name}-{trace}.db')
+				results.append(measure(lambda: fn(manager), trace))
+				manager.close()
+			return results[0][0], results[0][1], results[1][2]
+
+		legacy = list(events(args.legacy_rows))
+		_, seconds, peak = run('legacy', lambda manager: [manager.add_schedule(e['title'], e['location'], e['event_date'],
+			e['description']) for e in legacy])
+		report('add_schedule() 행마다 커밋', len(legacy), seconds, peak)
+
+		for label, path in (('import CSV', csv_path), ('import JSON', json_path)):
+			result, seconds, peak = run(label.split()[1], lambda manager: manager.import_schedules(path))
+			assert result['imported'] == args.rows, result
+			report(label, result['imported'], seconds, peak)
+
+		manager = fresh_manager(workdir, 'export.db')
+		with contextlib.redirect_stdout(io.StringIO()):
+			manager.import_schedules(csv_path)
+		for label, ext in (('export CSV', 'csv'), ('export JSON', 'json')):
+			target = os.path.join(workdir, f'out.{ext}')
+			count, seconds, _ = measure(lambda: manager.export_schedules(target))
+			_, _, peak = measure(lambda: manager.export_schedules(target), trace=True)
+			report(label, count, seconds, peak)
+		manager.close()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
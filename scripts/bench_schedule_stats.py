@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+schedule.py 일정 통계: 예전 COUNT(*) 다섯 번 vs 쿼리 하나 (FlightScheduleManager.get_statistics)
+임시 DB 에 일정 --rows 개(2000~2035년 날짜, 장소 40곳)를 넣고, 예전 방식의 다섯 쿼리를 인덱스 없이/있이 재고,
+행마다 조건을 계산하는 조건부 집계(SUM(event_date >= ?) ...) 한 번과, get_statistics() 를
+건수만/월별·장소별 건수 포함으로 잰다. 시간은 --repeat 회의 중앙값이다.
+
+사용법:
+    python scripts/bench_schedule_stats.py [--rows 1000000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from schedule import FlightScheduleManager  # noqa: E402
+
+
+def legacy_statistics(cursor):
+	"""예전 get_statistics() 의 쿼리 (출력 제외)"""
+	today = datetime.now().strftime('%Y-%m-%d')
+	cursor.execute('SELECT COUNT(*) as total FROM schedules')
+	total = cursor.fetchone()[0]
+	cursor.execute('SELECT COUNT(*) as upcoming FROM schedules WHERE event_date >= ?', (today,))
+	upcoming = cursor.fetchone()[0]
+	cursor.execute('SELECT COUNT(*) as past FROM schedules WHERE event_date < ?', (today,))
+	past = cursor.fetchone()[0]
+	week_future = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+	cursor.execute('SELECT COUNT(*) as week FROM schedules WHERE event_date >= ? AND event_date <= ?', (today, week_future))
+	week = cursor.fetchone()[0]
+	month_future = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+	cursor.execute('SELECT COUNT(*) as month FROM schedules WHERE event_date >= ? AND event_date <= ?', (today, month_future))
+	month = cursor.fetchone()[0]
+	return {'total': total, 'upcoming': upcoming, 'past': past, 'week': week, 'month': month}
+
+
+def conditional_statistics(cursor):
+	"""조건부 집계 한 번 (event_date 인덱스 전체를 훑으며 행마다 조건 계산)"""
+	today = datetime.now().strftime('%Y-%m-%d')
+	week_future = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+	month_future = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+	cursor.execute('''
+		SELECT COUNT(*), SUM(event_date >= :today), SUM(event_date < :today),
+			SUM(event_date BETWEEN :today AND :week), SUM(event_date BETWEEN :today AND :month)
+		FROM schedules
+	''', {'today': today, 'week': week_future, 'month': month_future})
+	return cursor.fetchone()
+
+
+def populate(path, rows, seed=1):
+	"""예전 schedule.py 스키마(인덱스 없음)로 일정을 채운다"""
+	rng = random.Random(seed)
+	start = datetime(2000, 1, 1)
+	places = [f'기지{i}' for i in range(40)] + ['']
+	conn = sqlite3.connect(path)
+	conn.execute('''
+		CREATE TABLE schedules (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			title TEXT NOT NULL,
+			location TEXT,
+			event_date TEXT NOT NULL,
+			description TEXT,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+	conn.executemany('INSERT INTO schedules (title, location, event_date, description) VALUES (?, ?, ?, ?)',
+		((f'비행 {i}', rng.choice(places), (start + timedelta(days=rng.randrange(36 * 365))).strftime('%Y-%m-%d'), '')
+			for i in range(rows)))
+	conn.commit()
+	conn.close()
+
+
+def timed(fn, repeat):
+	fn()  # 페이지 캐시 준비
+	timings = []
+	for _ in range(repeat):
+		started = time.perf_counter()
+		result = fn()
+		timings.append(time.perf_counter() - started)
+	return result, statistics.median(timings)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='일정 통계 쿼리 비교')
+	parser.add_argument('--rows', type=int, default=1000000)
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		path = os.path.join(workdir, 'schedules.db')
+		populate(path, args.rows)
+		conn = sqlite3.connect(path)
+		old, old_plain = timed(lambda: legacy_statistics(conn.cursor()), args.repeat)
+		conn.close()
+
+		# 현재 스키마로 열면 event_date/location 인덱스와 검색 색인이 생긴다
+		started = time.perf_counter()
+		manager = FlightScheduleManager(path)
+		manager.connect()
+		print(f'일정 {args.rows:,}개, 인덱스/검색 색인 생성 {time.perf_counter() - started:.1f}s\n')
+		_, old_indexed = timed(lambda: legacy_statistics(manager.cursor), args.repeat)
+		_, conditional_s = timed(lambda: conditional_statistics(manager.cursor), args.repeat)
+		with contextlib.redirect_stdout(io.StringIO()):
+			_, counts_s = timed(lambda: manager.get_statistics(as_json=True, histograms=False), args.repeat)
+			new, new_s = timed(lambda: manager.get_statistics(as_json=True), args.repeat)
+		manager.close()
+		assert all(old[key] == new[key] for key in old), (old, new)
+
+		print(f"{'방식':<40}{'쿼리':>6}{'ms':>10}")
+		print('-' * 56)
+		print(f"{'예전 COUNT(*) 5회, 인덱스 없음':<40}{5:>6}{old_plain * 1000:>10.1f}")
+		print(f"{'예전 COUNT(*) 5회, event_date 인덱스':<40}{5:>6}{old_indexed * 1000:>10.1f}")
+		print(f"{'조건부 집계 SUM(event_date >= ?) ...':<40}{1:>6}{conditional_s * 1000:>10.1f}")
+		print(f"{'get_statistics(histograms=False)':<40}{1:>6}{counts_s * 1000:>10.1f}")
+		print(f"{'get_statistics() (+월별/장소별)':<40}{3:>6}{new_s * 1000:>10.1f}")
+		print(f"\n전체 {new['total']:,} / 다가오는 {new['upcoming']:,} / 지난 {new['past']:,} / "
+			f"이번 주 {new['week']:,} / 이번 달 {new['month']:,}, 월 {len(new['by_month'])}개")
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일정 검색: LIKE '%검색어%' 전체 스캔 vs FTS5 trigram 색인 (search.py)
+임시 DB 에 일정 --rows 개(한글/영문 제목·장소, 무작위 단어 설명)를 만들고, schedule.py 의 예전 LIKE 쿼리와
+search.search() 로 같은 검색어를 찾아 쿼리당 시간(중앙값)과 결과 수를 비교한다. 색인 생성 시간과
+DB 크기 증가도 출력한다. LIKE 는 날짜순 전체 결과를, FTS 는 관련도 상위 --limit 개를 가져온다.
+예전 LIKE 는 검색어 전체를 붙은 문자열로, FTS 는 단어마다 따로 찾으므로 여러 단어 검색은 결과 수가 다르다.
+bm25 순위는 일치하는 모든 행에서 계산하므로 아주 흔한 단어일수록 FTS 시간도 늘어난다.
+
+사용법:
+    python scripts/bench_search.py [--rows 100000] [--repeat 5] [--limit 50]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import search  # noqa: E402
+
+PLACES = ['서울공항', '청주기지', '원주기지', '사천기지', '광주기지', '여수 엑스포', '부산 해운대', '강릉 경포대',
+	'Singapore Changi', 'RIAT Fairford', 'Avalon', 'Dubai World Central']
+EVENTS = ['에어쇼', '축하비행', '정기 훈련', '특수비행 연습', '국군의 날 행사', '졸업식 축하비행', '해외 전시',
+	'Airshow', 'Display practice', 'Flypast', 'Media day']
+WORDS = ['블랙이글스', '편대', '기동', '태극', '하트', '루프', '롤', '스모크', '관람', '안전', '기상', '주차', '셔틀버스',
+	'입장', '예매', '리허설', 'formation', 'smoke', 'loop', 'roll', 'crowd', 'weather', 'briefing', 'T-50B']
+# 설명의 나머지 단어는 음절을 섞어 만든다 (실제 공지처럼 어휘가 넓고 위 단어는 일부 행에만 나오도록)
+SYLLABLES = '가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후기니디리미비시이지치'
+QUERIES = ['블랙이글스', '에어쇼', '축하비행', '청주기', '셔틀버스 예매', 'Airshow', 'formation loop', '서울', 'T-50B 리허설']
+LEGACY_QUERY = '''
+	SELECT * FROM schedules
+	WHERE title LIKE ? OR location LIKE ? OR description LIKE ?
+	ORDER BY event_date DESC
+'''
+
+
+def populate(conn, rows, seed=1):
+	rng = random.Random(seed)
+	conn.execute('''
+		CREATE TABLE schedules (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			title TEXT NOT NULL,
+			location TEXT,
+			event_date TEXT NOT NULL,
+			description TEXT,
+			created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+		)
+	''')
+
+	def generate():
+		for _ in range(rows):
+			place = rng.choice(PLACES)
+			year = rng.randint(2015, 2026)
+			words = rng.sample(WORDS, rng.randint(2, 5)) + [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+				for _ in range(rng.randint(8, 25))]
+			rng.shuffle(words)
+			yield (f'{year} {place} {rng.choice(EVENTS)}', place, f'{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+				' '.join(words))
+
+	conn.executemany('INSERT INTO schedules (title, location, event_date, description) VALUES (?, ?, ?, ?)', generate())
+	conn.commit()
+
+
+def timed(fn, repeat):
+	timings = []
+	for _ in range(repeat):
+		started = time.perf_counter()
+		result = fn()
+		timings.append(time.perf_counter() - started)
+	return result, statistics.median(timings)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='일정 검색 LIKE vs FTS5')
+	parser.add_argument('--rows', type=int, default=100000)
+	parser.add_argument('--repeat', type=int, default=5)
+	parser.add_argument('--limit', type=int, default=50, help='FTS 검색 결과 수 (CLI 기본값)')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		path = os.path.join(workdir, 'search.db')
+		conn = sqlite3.connect(path)
+		conn.row_factory = sqlite3.Row
+		populate(conn, args.rows)
+		size_before = os.path.getsize(path)
+		started = time.perf_counter()
+		search.ensure_index(conn, 'schedules')
+		conn.execute('VACUUM')
+		print(f'일정 {args.rows:,}개, 색인 생성 {time.perf_counter() - started:.1f}s, '
+			f'DB {size_before / 1024 / 1024:.1f}MB → {os.path.getsize(path) / 1024 / 1024:.1f}MB\n')
+
+		header = f"{'검색어':<18}{'LIKE 건수':>10}{'LIKE ms':>10}{'FTS 건수':>10}{'FTS ms':>10}{'배':>8}"
+		print(header)
+		print('-' * (len(header) + 8))
+		for query in QUERIES:
+			# 예전 CLI 는 검색어 전체를 하나의 LIKE 패턴으로 찾았다
+			term = f'%{query}%'
+			legacy, legacy_s = timed(lambda: conn.execute(LEGACY_QUERY, (term, term, term)).fetchall(), args.repeat)
+			(rows, more), fts_s = timed(lambda: search.search(conn, 'schedules', query, limit=args.limit), args.repeat)
+			count = f"{len(rows)}{'+' if more else ''}"
+			print(f'{query:<18}{len(legacy):>10}{legacy_s * 1000:>10.1f}{count:>10}{fts_s * 1000:>10.1f}{legacy_s / fts_s:>8.1f}')
+		conn.close()
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
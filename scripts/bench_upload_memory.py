@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+사진 업로드 중 워커 최대 메모리(RSS) 비교
+앱을 별도 프로세스(werkzeug 단일 스레드 서버)로 띄우고 큰 JPEG(기본 4032x3024, 약 10MB 이상)를
+/admin/pilots/new 로 여러 번 올린 뒤, 서버 프로세스의 최대 RSS(/proc/<pid>/status 의 VmHWM)를 본다.
+IMAGE_WORKERS=0 으로 요청 안에서 디코딩까지 하므로 업로드 수신 + 저장 + 디코딩이 모두 워커 메모리에 잡힌다.
+
+- legacy: Werkzeug 기본 요청(메모리 버퍼 후 임시 파일) + file.save() 복사 + 전체 해상도 디코딩
+- streaming: UploadRequest(임시 파일에 바로 쓰고 이름만 바꿈) + JPEG draft 디코딩
+
+Linux 전용 (/proc 사용). 저장소 DB 와 static 폴더는 건드리지 않는다.
+
+사용법:
+    python scripts/bench_upload_memory.py [--uploads 5] [--size 4032x3024] [--quality 97]
+"""
+
+import argparse
+import http.client
+import http.cookies
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def serve(port, mode):
+	"""(서버 프로세스) 앱을 띄운다 - legacy 면 예전 동작으로 되돌린다"""
+	import flask
+	import images
+	import app as webapp
+	from werkzeug.serving import run_simple
+
+	webapp.app.static_folder = os.environ['BENCH_STATIC']
+	if mode == 'legacy':
+		webapp.app.request_class = flask.Request
+		load_rgb = images._load_rgb
+		images._load_rgb = lambda file_path, draft_size=None: load_rgb(file_path)
+	run_simple('127.0.0.1', port, webapp.app, threaded=False)
+
+
+def memory(pid):
+	"""(현재 RSS, 최대 RSS) MB"""
+	values = {}
+	with open(f'/proc/{pid}/status') as f:
+		for line in f:
+			key, _, value = line.partition(':')
+			if key in ('VmRSS', 'VmHWM'):
+				values[key] = int(value.split()[0]) / 1024
+	return values['VmRSS'], values['VmHWM']
+
+
+def multipart(fields, file_field, filename, data):
+	boundary = uuid.uuid4().hex
+	parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+		for name, value in fields.items()]
+	parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+		f'Content-Type: image/jpeg\r\n\r\n'.encode() + data + b'\r\n')
+	parts.append(f'--{boundary}--\r\n'.encode())
+	return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def request(port, method, path, body=None, headers=None):
+	conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+	conn.request(method, path, body=body, headers=headers or {})
+	response = conn.getresponse()
+	response.read()
+	conn.close()
+	return response
+
+
+def run(mode, photo, uploads, workdir):
+	port = free_port()
+	env = dict(os.environ, DATABASE=os.path.join(workdir, f'{mode}.db'), IMAGE_WORKERS='0',
+		BENCH_STATIC=os.path.join(workdir, f'static-{mode}'), IMAGE_INCOMING_FOLDER=os.path.join(workdir, f'incoming-{mode}'))
+	server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', str(port), '--mode', mode],
+		env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+	try:
+		for _ in range(100):
+			try:
+				request(port, 'GET', '/')
+				break
+			except OSError:
+				time.sleep(0.1)
+		login = request(port, 'POST', '/admin/login', urlencode({'username': 'admin', 'password': 'blackeagles2025'}),
+			{'Content-Type': 'application/x-www-form-urlencoded'})
+		cookie = http.cookies.SimpleCookie(login.getheader('Set-Cookie'))
+		headers = {'Cookie': '; '.join(f'{key}={morsel.value}' for key, morsel in cookie.items())}
+		# 작은 업로드 한 번으로 PIL 등 모듈 로딩을 끝낸 뒤의 메모리를 기준으로 한다
+		form = {'number': '1', 'position': 'LEAD', 'generation': '1', 'aircraft': 'T-50', 'order_num': '0', 'is_active': '1'}
+		body, content_type = multipart({**form, 'callsign': 'warmup'}, 'photo', 'warmup.jpg', small_photo())
+		request(port, 'POST', '/admin/pilots/new', body, {**headers, 'Content-Type': content_type})
+		baseline, _ = memory(server.pid)
+		started = time.perf_counter()
+		for i in range(uploads):
+			body, content_type = multipart({**form, 'callsign': f'bench{i}'}, 'photo', f'{i}.jpg', photo)
+			response = request(port, 'POST', '/admin/pilots/new', body, {**headers, 'Content-Type': content_type})
+			assert response.status == 302, response.status
+		elapsed = (time.perf_counter() - started) / uploads
+		_, peak = memory(server.pid)
+		return baseline, peak, elapsed
+	finally:
+		server.terminate()
+		server.wait()
+
+
+def small_photo():
+	from bench_image_uploads import make_photo
+	return make_photo(64, 48, 0)
+
+
+def free_port():
+	with socket.socket() as sock:
+		sock.bind(('127.0.0.1', 0))
+		return sock.getsockname()[1]
+
+
+def main():
+	parser = argparse.ArgumentParser(description='사진 업로드 중 워커 최대 메모리 비교')
+	parser.add_argument('--uploads', type=int, default=5)
+	parser.add_argument('--size', default='4032x3024')
+	parser.add_argument('--quality', type=int, default=97, help='JPEG 품질 (높을수록 파일이 큼)')
+	parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+	parser.add_argument('--mode', default='streaming', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+	if args.serve:
+		serve(args.serve, args.mode)
+		return
+
+	import io
+	from PIL import Image
+	width, height = (int(v) for v in args.size.split('x'))
+	noise = Image.effect_noise((width, height), 64)
+	buf = io.BytesIO()
+	Image.merge('RGB', (noise, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT), noise.transpose(Image.Transpose.FLIP_TOP_BOTTOM))).save(
+		buf, 'JPEG', quality=args.quality)
+	photo = buf.getvalue()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-bench-')
+	try:
+		print(f'사진 {width}x{height}, {len(photo) / 1024 / 1024:.1f}MB, {args.uploads}회 업로드 (IMAGE_WORKERS=0)\n')
+		header = f"{'방식':<12}{'기준 RSS MB':>14}{'최대 RSS MB':>14}{'증가 MB':>10}{'요청당 ms':>12}"
+		print(header)
+		print('-' * (len(header) + 6))
+		for mode in ('legacy', 'streaming'):
+			baseline, peak, elapsed = run(mode, photo, args.uploads, workdir)
+			print(f'{mode:<12}{baseline:>14.1f}{peak:>14.1f}{peak - baseline:>10.1f}{elapsed * 1000:>12.0f}')
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
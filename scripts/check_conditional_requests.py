@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+압축한 응답의 조건부 요청(304) 확인
+채팅 세션에 메시지를 COMPRESS_MIN_SIZE 이상이 되도록 보내고 /api/chat/messages 를 Accept-Encoding 별
+(identity, gzip, br)로 폴링한 뒤, 받은 ETag 를 If-None-Match 로 다시 보내 304 가 오는지 본다.
+그 자리에서 압축한 응답의 ETag 에는 인코딩이 붙으므로(compression.py) 뷰가 원래 ETag 로 비교하지 못하면 매번 200 이 된다.
+새 메시지가 온 뒤의 재검증은 200 이어야 한다. 하나라도 다르면 종료 코드 1.
+저장소 DB 의 임시 복사본으로 실행하므로 저장소 파일은 바뀌지 않는다.
+
+사용법:
+    python scripts/check_conditional_requests.py [--messages 20]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='압축한 응답의 조건부 요청(304) 확인')
+	parser.add_argument('--messages', type=int, default=20, help='폴링 응답이 압축 최소 크기를 넘도록 보낼 메시지 수')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-etag-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'etag.db')
+	shutil.copy(os.path.join(ROOT, 'blackeagles.db'), os.environ['DATABASE'])
+	try:
+		import app as webapp
+		from compression import available_encodings
+		client = webapp.app.test_client()
+
+		session_id = client.post('/chat/start', json={'name': 'etag'}).get_json()['session_id']
+		for i in range(args.messages):
+			client.post('/chat/send', json={'session_id': session_id, 'message': f'에어쇼 셔틀버스 시간 문의 {i}'})
+		url = f'/api/chat/messages/{session_id}'
+
+		failures = []
+		print(f"{'Accept-Encoding':<18}{'Content-Encoding':<18}{'ETag':<24}{'재검증':>8}{'새 메시지 후':>14}")
+		print('-' * 84)
+		for encoding in ('identity',) + available_encodings():
+			headers = {'Accept-Encoding': encoding}
+			first = client.get(url, headers=headers)
+			etag = first.headers.get('ETag', '')
+			again = client.get(url, headers={**headers, 'If-None-Match': etag})
+			client.post('/chat/send', json={'session_id': session_id, 'message': '새 메시지'})
+			changed = client.get(url, headers={**headers, 'If-None-Match': etag})
+			used = first.headers.get('Content-Encoding', '-')
+			print(f'{encoding:<18}{used:<18}{etag:<24}{again.status_code:>8}{changed.status_code:>14}')
+			if encoding != 'identity' and used != encoding:
+				failures.append(f'{encoding}: 압축되지 않음 (본문 {len(first.get_data())} 바이트)')
+			if again.status_code != 304 or again.headers.get('ETag') != etag:
+				failures.append(f'{encoding}: 같은 ETag 재검증이 {again.status_code} {again.headers.get("ETag")}')
+			if changed.status_code != 200:
+				failures.append(f'{encoding}: 새 메시지 후 재검증이 {changed.status_code}')
+
+		for failure in failures:
+			print(f'[실패] {failure}')
+		if failures:
+			sys.exit(1)
+		print('\n✅ 압축한 폴링 응답도 변화가 없으면 304')
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
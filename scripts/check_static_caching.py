@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+페이지당 정적 파일 재검증 요청 수 확인
+공개 페이지를 요청해 HTML 이 참조하는 CSS/JS/이미지(link, script, img, srcset, style 의 url())를 모으고,
+각 파일을 같은 URL 로 요청해 Cache-Control 을 본다. max-age 가 없거나 no-cache 인 파일은 다음 페이지를
+볼 때 브라우저가 If-Modified-Since/If-None-Match 로 다시 확인(304)하므로 '재검증' 으로 센다.
+지문(?v=해시)을 뗀 같은 파일 URL(예전 방식)도 함께 요청해 비교한다.
+저장소 DB 의 임시 복사본으로 실행하므로 저장소 파일은 바뀌지 않는다.
+
+사용법:
+    python scripts/check_static_caching.py [--pages /,/about,/gallery,/notice,/schedule] [--duplicates]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+from collections import defaultdict
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_PAGES = '/,/?lang=en,/about,/gallery,/notice,/schedule,/contact,/donate'
+
+
+class ResourceCollector(HTMLParser):
+	"""페이지가 불러오는 로컬 정적 파일 URL"""
+
+	def __init__(self):
+		super().__init__()
+		self.urls = set()
+
+	def add(self, url):
+		if url and url.startswith('/static/'):
+			self.urls.add(url)
+
+	def handle_starttag(self, tag, attrs):
+		attrs = dict(attrs)
+		if tag == 'link' and attrs.get('rel') == 'stylesheet':
+			self.add(attrs.get('href'))
+		elif tag in ('script', 'img'):
+			self.add(attrs.get('src'))
+		if attrs.get('srcset'):
+			for candidate in attrs['srcset'].split(','):
+				self.add(candidate.strip().split(' ')[0])
+		for url in re.findall(r"url\('([^']+)'\)", attrs.get('style') or ''):
+			self.add(url)
+
+
+def revalidates(response):
+	"""다음 페이지를 볼 때 브라우저가 서버에 다시 확인하는 응답인지"""
+	cache = response.cache_control
+	return bool(cache.no_cache) or not cache.max_age
+
+
+def without_fingerprint(url):
+	parts = urlsplit(url)
+	query = '&'.join(item for item in parts.query.split('&') if item and not item.startswith('v='))
+	return parts.path + ('?' + query if query else '')
+
+
+def duplicates(static_folder):
+	"""내용이 같은 정적 파일 묶음 - [(크기, [경로, ...]), ...]"""
+	groups = defaultdict(list)
+	for folder, _, names in os.walk(static_folder):
+		for name in names:
+			path = os.path.join(folder, name)
+			with open(path, 'rb') as f:
+				groups[hashlib.file_digest(f, 'sha256').hexdigest()].append(path)
+	return [(os.path.getsize(paths[0]), paths) for paths in groups.values() if len(paths) > 1]
+
+
+def main():
+	parser = argparse.ArgumentParser(description='페이지당 정적 파일 재검증 요청 수 확인')
+	parser.add_argument('--pages', default=DEFAULT_PAGES)
+	parser.add_argument('--duplicates', action='store_true', help='static 폴더의 같은 내용 파일도 출력')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-cache-')
+	os.environ['DATABASE'] = os.path.join(workdir, 'cache.db')
+	shutil.copy(os.path.join(ROOT, 'blackeagles.db'), os.environ['DATABASE'])
+	try:
+		import app as webapp
+		client = webapp.app.test_client()
+
+		header = f"{'페이지':<16}{'정적 파일':>10}{'재검증 (지문 없음)':>20}{'재검증 (현재)':>16}"
+		print(header)
+		print('-' * (len(header) + 8))
+		missing = set()
+		for page in args.pages.split(','):
+			response = client.get(page)
+			assert response.status_code == 200, (page, response.status_code)
+			collector = ResourceCollector()
+			collector.feed(response.get_data(as_text=True))
+			before = after = 0
+			for url in collector.urls:
+				current = client.get(url)
+				if current.status_code != 200:
+					missing.add(unquote(url))
+					continue
+				after += revalidates(current)
+				before += revalidates(client.get(without_fingerprint(url)))
+			print(f'{page:<16}{len(collector.urls):>10}{before:>20}{after:>16}')
+		if missing:
+			print(f'\n저장소에 없는 파일 {len(missing)}개 제외: ' + ', '.join(sorted(missing)[:5]) + (' ...' if len(missing) > 5 else ''))
+
+		if args.duplicates:
+			groups = duplicates(webapp.app.static_folder)
+			wasted = sum(size * (len(paths) - 1) for size, paths in groups)
+			print(f'\nstatic 폴더의 같은 내용 파일: {len(groups)}묶음, 중복 {wasted / 1024:.0f} KB')
+			for size, paths in sorted(groups, reverse=True)[:10]:
+				names = ', '.join(os.path.relpath(path, webapp.app.static_folder) for path in paths)
+				print(f'  {size / 1024:>8.0f} KB  {names}')
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유휴 채팅 위젯 부하 비교 (폴링 vs 롱폴링 vs 푸시)
+gunicorn 으로 앱을 띄우고, 채팅 세션을 연 채 아무 메시지도 오가지 않는 위젯 N개를 흉내 낸다.
+
+- poll: CHAT_PUSH=false, 위젯마다 3초 간격으로 /api/chat/messages/<session_id> 요청
+- longpoll / longpoll-gevent: 위젯마다 since + wait 로 요청 하나를 걸어 두고, 응답이 오면 바로 다시 요청
+  (gthread 워커 / gevent 워커)
+- push: CHAT_PUSH=true, 위젯마다 Socket.IO 웹소켓 연결 후 세션 방에 join 하고 대기 (ping 에만 응답)
+
+측정 구간 동안의 초당 HTTP 요청 수, 웹소켓 프레임 수, 서버 프로세스(마스터 + 워커)의 CPU 사용 시간과
+측정 끝 시점에 서버가 붙잡고 있는 연결 수, 스레드 수, 메모리(RSS)를 비교한다.
+
+사용법:
+    python scripts/load_test_chat_widgets.py [--widgets 500] [--seconds 30] [--interval 3]
+        [--modes poll,longpoll,longpoll-gevent,push]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import simple_websocket
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def free_port():
+	with socket.socket() as s:
+		s.bind(('127.0.0.1', 0))
+		return s.getsockname()[1]
+
+
+def process_tree(pid):
+	"""pid 와 모든 하위 프로세스 (Linux /proc)"""
+	pids = [pid]
+	for current in pids:
+		try:
+			with open(f'/proc/{current}/task/{current}/children') as f:
+				pids.extend(int(child) for child in f.read().split())
+		except OSError:
+			pass
+	return pids
+
+
+def cpu_seconds(pid):
+	"""프로세스 트리의 user + system CPU 시간(초)"""
+	total = 0
+	for current in process_tree(pid):
+		try:
+			with open(f'/proc/{current}/stat') as f:
+				fields = f.read().rsplit(')', 1)[1].split()
+			total += int(fields[11]) + int(fields[12])
+		except OSError:
+			pass
+	return total / CLOCK_TICKS
+
+
+def process_status(pid):
+	"""프로세스 트리의 (스레드 수, RSS MB)"""
+	threads = rss_kb = 0
+	for current in process_tree(pid):
+		try:
+			with open(f'/proc/{current}/status') as f:
+				for line in f:
+					if line.startswith('Threads:'):
+						threads += int(line.split()[1])
+					elif line.startswith('VmRSS:'):
+						rss_kb += int(line.split()[1])
+		except OSError:
+			pass
+	return threads, rss_kb / 1024
+
+
+def established_connections(port):
+	"""서버 포트로 맺어진 TCP 연결 수 (서버 쪽 소켓 기준)"""
+	count = 0
+	for path in ('/proc/net/tcp', '/proc/net/tcp6'):
+		try:
+			with open(path) as f:
+				next(f)
+				for line in f:
+					fields = line.split()
+					if int(fields[1].rsplit(':', 1)[1], 16) == port and fields[3] == '01':
+						count += 1
+		except OSError:
+			pass
+	return count
+
+
+# 모드별 (위젯 동작, 서버 환경변수)
+MODES = {
+	'poll': ('폴링 (3초)', 'poll', {'CHAT_PUSH': 'false', 'CHAT_LONG_POLL': 'false'}),
+	'longpoll': ('롱폴링 (gthread)', 'longpoll', {'CHAT_PUSH': 'false'}),
+	'longpoll-gevent': ('롱폴링 (gevent)', 'longpoll', {'CHAT_PUSH': 'false', 'GUNICORN_WORKER_CLASS': 'gevent'}),
+	'push': ('푸시 (Socket.IO)', 'push', {'CHAT_PUSH': 'true'}),
+}
+
+
+def start_server(port, widgets, overrides, database):
+	env = dict(
+		os.environ,
+		DATABASE=database,
+		GUNICORN_BIND=f'127.0.0.1:{port}',
+		GUNICORN_WORKERS='1',
+		GUNICORN_THREADS=str(widgets + 50),
+		GUNICORN_WORKER_CONNECTIONS=str(widgets + 50),
+		DB_POOL_SIZE='16',
+		**overrides,
+	)
+	env.pop('SOCKETIO_ASYNC_MODE', None)
+	server = subprocess.Popen(
+		[sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+		cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+	)
+	deadline = time.time() + 30
+	while time.time() < deadline:
+		try:
+			urllib.request.urlopen(f'http://127.0.0.1:{port}/contact', timeout=1).read()
+			return server
+		except OSError:
+			time.sleep(0.2)
+	server.kill()
+	raise RuntimeError('서버가 시작되지 않았습니다')
+
+
+def start_session(port, index):
+	request = urllib.request.Request(
+		f'http://127.0.0.1:{port}/chat/start',
+		data=json.dumps({'name': f'widget{index}', 'email': ''}).encode(),
+		headers={'Content-Type': 'application/json'},
+	)
+	with urllib.request.urlopen(request, timeout=10) as response:
+		return json.loads(response.read())['session_id']
+
+
+class Counters:
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.values = {'http': 0, 'ws_frames': 0, 'errors': 0, 'connected': 0}
+
+	def add(self, key, amount=1):
+		with self.lock:
+			self.values[key] += amount
+
+	def snapshot(self):
+		with self.lock:
+			return dict(self.values)
+
+
+def polling_widget(port, session_id, interval, stop, counters):
+	"""chat-widget.js 의 폴링 동작: 3초마다 메시지 목록 요청 (keep-alive 연결 재사용)"""
+	conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+	counters.add('connected')
+	stop.wait(random.uniform(0, interval))
+	while not stop.is_set():
+		try:
+			conn.request('GET', f'/api/chat/messages/{session_id}')
+			conn.getresponse().read()
+			counters.add('http')
+		except (OSError, http.client.HTTPException):
+			counters.add('errors')
+			conn.close()
+			conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+		stop.wait(interval)
+	conn.close()
+
+
+def long_poll_widget(port, session_id, wait, stop, counters):
+	"""chat-widget.js 의 롱폴링 동작: since + wait 요청을 항상 하나 걸어 둔다"""
+	conn = http.client.HTTPConnection('127.0.0.1', port, timeout=wait + 15)
+	last_id = 0
+	counters.add('connected')
+	while not stop.is_set():
+		try:
+			conn.request('GET', f'/api/chat/messages/{session_id}?since={last_id}&wait={wait:g}')
+			response = conn.getresponse()
+			body = response.read()
+			if response.status == 200:
+				last_id = json.loads(body).get('last_id', last_id)
+			counters.add('http')
+		except (OSError, http.client.HTTPException):
+			counters.add('errors')
+			conn.close()
+			conn = http.client.HTTPConnection('127.0.0.1', port, timeout=wait + 15)
+			stop.wait(1)
+	conn.close()
+
+
+def push_widget(port, session_id, stop, counters):
+	"""Socket.IO 클라이언트 동작: 웹소켓 연결 → 네임스페이스 연결 → join → ping 응답만"""
+	try:
+		ws = simple_websocket.Client(f'ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket')
+		counters.add('http')  # 웹소켓 업그레이드 요청
+		ws.receive(timeout=10)  # Engine.IO open 패킷
+		ws.send('40')
+		ws.receive(timeout=10)  # 네임스페이스 연결 응답
+		ws.send('42' + json.dumps(['join', {'session_id': session_id}]))
+		counters.add('connected')
+	except Exception:
+		counters.add('errors')
+		return
+	while not stop.is_set():
+		try:
+			packet = ws.receive(timeout=1)
+		except simple_websocket.ConnectionClosed:
+			counters.add('errors')
+			return
+		if packet is None:
+			continue
+		counters.add('ws_frames')
+		if packet == '2':  # 서버 ping → pong
+			ws.send('3')
+			counters.add('ws_frames')
+	ws.close()
+
+
+def run_mode(mode, args):
+	name, client, overrides = MODES[mode]
+	workdir = tempfile.mkdtemp(prefix='vbe-widgets-')
+	database = os.path.join(workdir, 'blackeagles.db')
+	shutil.copy(os.path.join(ROOT, 'blackeagles.db'), database)
+	port = free_port()
+	server = start_server(port, args.widgets, overrides, database)
+	try:
+		sessions = [start_session(port, i) for i in range(args.widgets)]
+		stop = threading.Event()
+		counters = Counters()
+		if client == 'push':
+			targets = [(push_widget, (port, sid, stop, counters)) for sid in sessions]
+		elif client == 'longpoll':
+			targets = [(long_poll_widget, (port, sid, args.wait, stop, counters)) for sid in sessions]
+		else:
+			targets = [(polling_widget, (port, sid, args.interval, stop, counters)) for sid in sessions]
+		threads = [threading.Thread(target=target, args=target_args, daemon=True) for target, target_args in targets]
+		for thread in threads:
+			thread.start()
+
+		# 모든 위젯이 연결되고 한 주기가 지난 뒤부터 측정
+		deadline = time.time() + 60
+		while counters.snapshot()['connected'] + counters.snapshot()['errors'] < args.widgets and time.time() < deadline:
+			time.sleep(0.2)
+		time.sleep(args.interval)
+
+		before, cpu_before, started = counters.snapshot(), cpu_seconds(server.pid), time.time()
+		time.sleep(args.seconds)
+		after, cpu_after, elapsed = counters.snapshot(), cpu_seconds(server.pid), time.time() - started
+		held = established_connections(port)
+		server_threads, rss_mb = process_status(server.pid)
+
+		stop.set()
+		for thread in threads:
+			thread.join(timeout=5)
+		return {
+			'name': name,
+			'connected': after['connected'],
+			'http_per_sec': (after['http'] - before['http']) / elapsed,
+			'frames_per_sec': (after['ws_frames'] - before['ws_frames']) / elapsed,
+			'cpu_percent': (cpu_after - cpu_before) / elapsed * 100,
+			'held': held,
+			'threads': server_threads,
+			'rss_mb': rss_mb,
+			'errors': after['errors'],
+		}
+	finally:
+		server.terminate()
+		server.wait(timeout=10)
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='유휴 채팅 위젯 부하 비교 (폴링 vs 롱폴링 vs 푸시)')
+	parser.add_argument('--widgets', type=int, default=500)
+	parser.add_argument('--seconds', type=float, default=30, help='측정 구간 (푸시 ping 주기 25초보다 길게)')
+	parser.add_argument('--interval', type=float, default=3, help='폴링 간격 (chat-widget.js 와 동일하게 3초)')
+	parser.add_argument('--wait', type=float, default=25, help='롱폴링 대기 시간 (chat-widget.js 와 동일하게 25초)')
+	parser.add_argument('--modes', default=','.join(MODES), help='비교할 방식 (쉼표 구분)')
+	args = parser.parse_args()
+
+	modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+	for mode in modes:
+		if mode not in MODES:
+			parser.error(f'알 수 없는 방식: {mode} (가능: {", ".join(MODES)})')
+	if 'longpoll-gevent' in modes:
+		try:
+			import gevent  # noqa: F401
+		except ImportError:
+			print('gevent 가 설치되어 있지 않아 longpoll-gevent 는 건너뜁니다 (pip install gevent)')
+			modes.remove('longpoll-gevent')
+
+	print(f'유휴 위젯 {args.widgets}개, 측정 {args.seconds:g}초\n')
+	results = [run_mode(mode, args) for mode in modes]
+	header = (f"{'방식':<20}{'위젯':>6}{'HTTP 요청/s':>13}{'WS 프레임/s':>13}{'서버 CPU %':>12}"
+		f"{'유지 연결':>10}{'서버 스레드':>11}{'RSS MB':>9}{'오류':>6}")
+	print(header)
+	print('-' * len(header))
+	for r in results:
+		print(f"{r['name']:<20}{r['connected']:>6}{r['http_per_sec']:>13.1f}{r['frames_per_sec']:>13.1f}"
+			f"{r['cpu_percent']:>12.1f}{r['held']:>10}{r['threads']:>11}{r['rss_mb']:>9.1f}{r['errors']:>6}")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공개 페이지 전송량(페이지 무게) 비교
+저장소의 DB 와 static 폴더를 임시 폴더에 복사해 /about, /gallery 를 요청하고,
+브라우저가 실제로 내려받을 이미지를 골라(<picture> 의 <source> 형식, srcset 과 sizes 로
+화면 너비·DPR 에 맞는 후보) HTML + 이미지 바이트를 합산한다.
+반응형 변형을 끈 상태(RESPONSIVE_IMAGES=false, 원본 <img>)와 변형을 만든 뒤의 상태를 비교한다.
+저장소의 static 폴더와 DB 는 건드리지 않는다.
+
+- 같은 페이지에서 두 번 나오는 이미지는 한 번만 센다 (브라우저 캐시)
+- loading="lazy" 이미지도 스크롤해서 모두 본다고 보고 센다
+- 외부 URL 이미지는 크기를 알 수 없으므로 개수만 따로 출력한다
+- 저장소 DB 의 갤러리 행은 없는 파일을 가리키므로, static/images 의 사진으로 갤러리 행을 --gallery 개 추가한다
+
+사용법:
+    python scripts/page_weight.py [--viewport 1280] [--dpr 1] [--accept avif,webp] [--folders "images,low show"] [--gallery 12]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = ['/about', '/about?lang=en', '/gallery', '/gallery?lang=en']
+MIME_FORMATS = {'image/avif': 'avif', 'image/webp': 'webp'}
+
+
+class ImageCollector(HTMLParser):
+	"""<img> 와 <picture><source> 를 모아 이미지 하나당 후보 목록으로 만든다"""
+
+	def __init__(self):
+		super().__init__()
+		self.images = []
+		self._sources = None
+
+	def handle_starttag(self, tag, attrs):
+		attrs = dict(attrs)
+		if tag == 'picture':
+			self._sources = []
+		elif tag == 'source' and self._sources is not None:
+			self._sources.append(attrs)
+		elif tag == 'img' and attrs.get('src'):
+			self.images.append({'img': attrs, 'sources': self._sources or []})
+
+	def handle_endtag(self, tag):
+		if tag == 'picture':
+			self._sources = None
+
+
+def slot_width(sizes, viewport):
+	"""sizes 속성에서 현재 화면 너비에 맞는 표시 너비(px)"""
+	for entry in (sizes or '100vw').split(','):
+		entry = entry.strip()
+		condition = re.match(r'\(max-width:\s*(\d+)px\)\s*(.+)', entry)
+		if condition:
+			if viewport > int(condition.group(1)):
+				continue
+			entry = condition.group(2)
+		if entry.endswith('vw'):
+			return viewport * float(entry[:-2]) / 100
+		return float(entry.rstrip('px'))
+	return viewport
+
+
+def choose(srcset, sizes, viewport, dpr):
+	"""srcset 후보 중 표시 너비 × DPR 이상인 가장 작은 것 (없으면 가장 큰 것)"""
+	candidates = []
+	for item in srcset.split(','):
+		url, width = item.strip().rsplit(' ', 1)
+		candidates.append((int(width.rstrip('w')), url))
+	candidates.sort()
+	needed = slot_width(sizes, viewport) * dpr
+	for width, url in candidates:
+		if width >= needed:
+			return url
+	return candidates[-1][1]
+
+
+def selected_url(image, viewport, dpr, accept):
+	for source in image['sources']:
+		if MIME_FORMATS.get(source.get('type')) in accept:
+			return choose(source['srcset'], source.get('sizes'), viewport, dpr)
+	img = image['img']
+	if img.get('srcset'):
+		return choose(img['srcset'], img.get('sizes'), viewport, dpr)
+	return img['src']
+
+
+def page_weight(client, static_folder, path, viewport, dpr, accept):
+	"""(HTML 바이트, 이미지 수, 이미지 바이트, 외부 이미지 수)"""
+	response = client.get(path)
+	assert response.status_code == 200, (path, response.status_code)
+	collector = ImageCollector()
+	collector.feed(response.get_data(as_text=True))
+	urls = {selected_url(image, viewport, dpr, accept) for image in collector.images}
+	image_bytes = external = 0
+	for url in urls:
+		if not url.startswith('/static/'):
+			external += 1
+			continue
+		file_path = os.path.join(static_folder, unquote(url[len('/static/'):].split('?', 1)[0]))
+		if os.path.exists(file_path):
+			image_bytes += os.path.getsize(file_path)
+	return len(response.data), len(urls), image_bytes, external
+
+
+def seed_gallery(database, static_folder, count):
+	"""static/images 의 사진(이미 만든 변형 제외)을 가리키는 갤러리 행 추가"""
+	photos = sorted(name for name in os.listdir(os.path.join(static_folder, 'images'))
+		if name.lower().endswith('.jpg') and not re.search(r'-\d+w\.\w+$', name))[:count]
+	conn = sqlite3.connect(database)
+	conn.executemany('INSERT INTO gallery (title, image_url, order_num, is_active) VALUES (?, ?, ?, 1)',
+		((name, f'/static/images/{name}', i) for i, name in enumerate(photos)))
+	conn.commit()
+	conn.close()
+
+
+def measure(webapp, client, enabled, args):
+	webapp.image_variants.enabled = enabled
+	webapp.page_cache.clear()
+	accept = set(filter(None, args.accept.split(',')))
+	return {path: page_weight(client, webapp.app.static_folder, path, args.viewport, args.dpr, accept) for path in PAGES}
+
+
+def main():
+	parser = argparse.ArgumentParser(description='공개 페이지 전송량 비교')
+	parser.add_argument('--viewport', type=int, default=1280, help='화면 너비(CSS px)')
+	parser.add_argument('--dpr', type=float, default=1.0, help='기기 픽셀 비율')
+	parser.add_argument('--accept', default='avif,webp', help='브라우저가 지원하는 형식 (빈 값이면 JPEG 만)')
+	parser.add_argument('--folders', default='images,low show', help='템플릿에 경로가 적힌 정적 이미지 폴더')
+	parser.add_argument('--gallery', type=int, default=12, help='추가할 갤러리 사진 수')
+	args = parser.parse_args()
+
+	workdir = tempfile.mkdtemp(prefix='vbe-weight-')
+	database = os.path.join(workdir, 'weight.db')
+	shutil.copy(os.path.join(ROOT, 'blackeagles.db'), database)
+	static_folder = os.path.join(workdir, 'static')
+	shutil.copytree(os.path.join(ROOT, 'static'), static_folder)
+	os.environ['DATABASE'] = database
+	os.environ['IMAGE_WORKERS'] = '0'
+	try:
+		import app as webapp
+		webapp.app.static_folder = static_folder
+		client = webapp.app.test_client()
+		seed_gallery(database, static_folder, args.gallery)
+
+		before = measure(webapp, client, False, args)
+		with webapp.app.app_context():
+			conn = webapp.get_db()
+			sources = webapp.variant_sources(conn, [folder for folder in args.folders.split(',') if folder])
+			made, _ = webapp.image_pipeline.backfill_variants(conn, static_folder, sources)
+		after = measure(webapp, client, True, args)
+
+		print(f'화면 너비 {args.viewport}px, DPR {args.dpr}, 지원 형식 {args.accept or "jpeg"}, 변형 생성 이미지 {made}개\n')
+		header = f"{'페이지':<20}{'이미지':>8}{'HTML KB':>10}{'이미지 KB (전)':>16}{'이미지 KB (후)':>16}{'합계 KB (전)':>14}{'합계 KB (후)':>14}{'감소':>8}"
+		print(header)
+		print('-' * (len(header) + 8))
+		for path in PAGES:
+			html_before, count, images_before, external = before[path]
+			html_after, _, images_after, _ = after[path]
+			total_before = html_before + images_before
+			total_after = html_after + images_after
+			saved = (1 - total_after / total_before) * 100 if total_before else 0
+			line = (f'{path:<20}{count:>8}{html_after / 1024:>10.1f}{images_before / 1024:>16.0f}{images_after / 1024:>16.0f}'
+				f'{total_before / 1024:>14.0f}{total_after / 1024:>14.0f}{saved:>7.1f}%')
+			if external:
+				line += f'  (외부 이미지 {external}개 제외)'
+			print(line)
+	finally:
+		shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
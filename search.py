@@ -0,0 +1,194 @@
+"""
+전문 검색 (SQLite FTS5, trigram 토크나이저)
+공지사항·일정·문의 메시지를 <테이블>_fts 가상 테이블(외부 콘텐츠)로 색인하고, 원본 테이블의 트리거가
+추가/수정/삭제를 같은 트랜잭션에서 색인에 반영한다. trigram 토크나이저는 글자 세 개 단위로 색인하므로
+띄어쓰기나 조사와 상관없이 한글 부분 문자열('블랙이' → '블랙이글스 에어쇼')도 찾는다.
+
+- 검색어는 공백으로 나눈 모든 단어를 포함하는 행을 bm25 점수(제목 가중치가 큼) 순으로 돌려준다
+- 세 글자 미만 단어는 색인을 쓸 수 없으므로 LIKE 조건으로 거른다 (그 단어만 있으면 최신순)
+- 웹(/search, /admin/messages/search)과 schedule.py CLI 가 같은 search() 를 쓴다
+"""
+
+import contextlib
+import re
+
+from markupsafe import Markup, escape
+
+# 검색 대상 테이블 → (색인 컬럼, 컬럼별 bm25 가중치)
+INDEXES = {
+	'notices': (('title', 'content', 'author'), (10.0, 1.0, 2.0)),
+	'schedules': (('title', 'location', 'description'), (10.0, 5.0, 1.0)),
+	'contact_messages': (('name', 'email', 'message'), (5.0, 5.0, 1.0)),
+}
+# trigram 색인을 쓸 수 있는 최소 글자 수
+MIN_TERM_LENGTH = 3
+# 일치 부분 표시 (템플릿에서 highlight 필터가 이스케이프 후 <mark> 로 바꾼다)
+MARK_START, MARK_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+
+def fts_table(table):
+	return f'{table}_fts'
+
+
+def _insert_trigger(table):
+	columns = INDEXES[table][0]
+	fts = fts_table(table)
+	return f'''
+		CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+			INSERT INTO {fts} (rowid, {', '.join(columns)}) VALUES (new.id, {', '.join(f'new.{column}' for column in columns)});
+		END
+	'''
+
+
+def create_index(cursor, table):
+	"""table 의 FTS5 색인, 동기화 트리거를 만들고 기존 행을 색인한다"""
+	columns = INDEXES[table][0]
+	fts = fts_table(table)
+	names = ', '.join(columns)
+	new = ', '.join(f'new.{column}' for column in columns)
+	old = ', '.join(f'old.{column}' for column in columns)
+	cursor.execute(f'''
+		CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+		USING fts5({names}, content='{table}', content_rowid='id', tokenize='trigram')
+	''')
+	cursor.execute(_insert_trigger(table))
+	cursor.execute(f'''
+		CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+			INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', old.id, {old});
+		END
+	''')
+	cursor.execute(f'''
+		CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN
+			INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', old.id, {old});
+			INSERT INTO {fts} (rowid, {names}) VALUES (new.id, {new});
+		END
+	''')
+	cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+@contextlib.contextmanager
+def deferred_index(conn, table):
+	"""대량 추가 동안 행마다 도는 추가 트리거를 끄고, 끝나면 새 행을 INSERT ... SELECT 한 번으로 색인한다
+
+	호출하는 쪽이 연 트랜잭션 안에서 써야 한다 (실패해서 되돌리면 트리거도 원래대로 돌아온다).
+	새 행은 id 가 기존 최댓값보다 큰 행이다 (AUTOINCREMENT).
+	"""
+	fts = fts_table(table)
+	if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)).fetchone():
+		yield
+		return
+	names = ', '.join(INDEXES[table][0])
+	last_id = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+	conn.execute(f'DROP TRIGGER IF EXISTS {fts}_ai')
+	yield
+	conn.execute(f'INSERT INTO {fts} (rowid, {names}) SELECT id, {names} FROM {table} WHERE id > ?', (last_id,))
+	conn.execute(_insert_trigger(table))
+
+
+def ensure_index(conn, table):
+	"""색인이 없으면 만든다 (마이그레이션을 쓰지 않는 DB 용) - 새로 만들었으면 True"""
+	exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table(table),)).fetchone()
+	if exists:
+		return False
+	create_index(conn.cursor(), table)
+	conn.commit()
+	return True
+
+
+def terms(query):
+	"""검색어를 단어 목록으로 (따옴표는 버리고, 중복 제거)"""
+	return list(dict.fromkeys(term for term in re.split(r'\s+', (query or '').replace('"', ' ')) if term))
+
+
+def _like(term):
+	return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def search(conn, table, query, limit=20, offset=0, columns=None, where=None, params=()):
+	"""table 에서 query 의 모든 단어를 포함하는 행 - (행 목록, 다음 결과가 더 있는지)
+
+	행은 원본 테이블 컬럼(dict)에 snippet(일치 부분을 MARK_START/MARK_END 로 감싼 발췌)을 더한 것이다.
+	columns 로 찾을 컬럼을, where/params 로 원본 테이블(t) 조건을 더할 수 있다.
+	"""
+	index_columns, weights = INDEXES[table]
+	columns = [column for column in (columns or index_columns) if column in index_columns]
+	words = terms(query)
+	if not words or not columns:
+		return [], False
+	fts = fts_table(table)
+	long_terms = [term for term in words if len(term) >= MIN_TERM_LENGTH]
+	short_terms = [term for term in words if len(term) < MIN_TERM_LENGTH]
+
+	conditions, args = [], []
+	if long_terms:
+		phrase = ' AND '.join('"' + term + '"' for term in long_terms)
+		if len(columns) < len(index_columns):
+			phrase = '{' + ' '.join(columns) + '} : (' + phrase + ')'
+		conditions.append(f'{fts} MATCH ?')
+		args.append(phrase)
+	for term in short_terms:
+		conditions.append('(' + ' OR '.join(f"t.{column} LIKE ? ESCAPE '\\'" for column in columns) + ')')
+		args.extend([_like(term)] * len(columns))
+	if where:
+		conditions.append(f'({where})')
+		args.extend(params)
+
+	if not long_terms:
+		# 색인을 쓸 수 없으면 원본 테이블만 최신순으로 훑는다
+		rows = conn.execute(f'''
+			SELECT t.* FROM {table} AS t
+			WHERE {' AND '.join(conditions)}
+			ORDER BY t.id DESC
+			LIMIT ? OFFSET ?
+		''', (*args, limit + 1, offset)).fetchall()
+		rows = [dict(row) for row in rows]
+		for row in rows:
+			row['snippet'] = _mark(row, columns, short_terms)
+		return rows[:limit], len(rows) > limit
+
+	# 순위만 먼저 매기고, 발췌(snippet)는 돌려줄 행에만 만든다 (정렬 전에 모든 일치 행에서 계산하지 않도록)
+	ids = [row[0] for row in conn.execute(f'''
+		SELECT t.id
+		FROM {fts} JOIN {table} AS t ON t.id = {fts}.rowid
+		WHERE {' AND '.join(conditions)}
+		ORDER BY bm25({fts}, {', '.join(str(weight) for weight in weights)}), t.id DESC
+		LIMIT ? OFFSET ?
+	''', (*args, limit + 1, offset))]
+	more, ids = len(ids) > limit, ids[:limit]
+	if not ids:
+		return [], more
+	rows = conn.execute(f'''
+		SELECT t.*, snippet({fts}, -1, '{MARK_START}', '{MARK_END}', '…', {SNIPPET_TOKENS}) AS snippet
+		FROM {fts} JOIN {table} AS t ON t.id = {fts}.rowid
+		WHERE {fts} MATCH ? AND {fts}.rowid IN ({', '.join('?' * len(ids))})
+	''', (args[0], *ids)).fetchall()
+	found = {row['id']: dict(row) for row in rows}
+	return [found[id_] for id_ in ids if id_ in found], more
+
+
+def _mark(row, columns, words, width=40):
+	"""색인 없이 찾은 행의 발췌 - 처음 일치한 컬럼에서 단어 주변 width 글자"""
+	for column in columns:
+		text = row[column] or ''
+		lowered = text.lower()
+		positions = [position for position in (lowered.find(word.lower()) for word in words) if position >= 0]
+		if not positions:
+			continue
+		start = max(0, min(positions) - width // 2)
+		excerpt = text[start:start + width * 2]
+		for word in words:
+			excerpt = re.sub(re.escape(word), lambda m: MARK_START + m.group(0) + MARK_END, excerpt, flags=re.IGNORECASE)
+		return ('…' if start else '') + excerpt + ('…' if start + width * 2 < len(text) else '')
+	return ''
+
+
+def highlight(snippet):
+	"""발췌를 HTML 로 - 본문은 이스케이프하고 일치 부분만 <mark> (Jinja 필터)"""
+	text = str(escape(snippet or ''))
+	return Markup(text.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def plain(snippet):
+	"""발췌의 일치 표시를 터미널용 [] 로"""
+	return (snippet or '').replace(MARK_START, '[').replace(MARK_END, ']')
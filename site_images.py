@@ -0,0 +1,63 @@
+"""
+사이트 이미지 레지스트리
+site_images 테이블(image_key → image_path)을 워커 메모리에 한 번 읽어 두고 모든 요청이 공유한다.
+관리자 수정 핸들러가 커밋 직후 refresh() 로 바로 갱신하고, 다른 워커에서의 수정은
+data_versions 의 site_images 버전이 바뀐 것을 보고 다음 요청에서 다시 읽는다.
+템플릿에서는 Jinja 전역 site_images / site_image(key, default) 로 사용한다.
+"""
+
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from flask import g
+
+
+class SiteImageRegistry(Mapping):
+	"""읽기 위주의 프로세스 단위 이미지 경로 조회 테이블"""
+
+	TABLE = 'site_images'
+
+	def __init__(self, db, versions):
+		# versions: 현재 요청의 data_versions 값(dict)을 돌려주는 함수
+		self.db = db
+		self.versions = versions
+		self._images = MappingProxyType({})
+		self._version = None
+		self._lock = threading.Lock()
+		self.loads = 0
+
+	def init_app(self, app):
+		app.add_template_global(self, 'site_images')
+		app.add_template_global(self.get, 'site_image')
+
+	def refresh(self, conn=None):
+		"""테이블을 다시 읽어 교체 (관리자 수정 커밋 직후 호출)"""
+		conn = conn or self.db.connection()
+		row = conn.execute('SELECT version FROM data_versions WHERE table_name = ?', (self.TABLE,)).fetchone()
+		rows = conn.execute('SELECT image_key, image_path FROM site_images').fetchall()
+		with self._lock:
+			self._images = MappingProxyType({r['image_key']: r['image_path'] for r in rows})
+			self._version = row['version'] if row else None
+			self.loads += 1
+
+	def _current(self):
+		"""요청당 한 번만 버전을 확인하고, 바뀌었으면 다시 읽는다"""
+		if not g.get('site_images_checked'):
+			g.site_images_checked = True
+			version = self.versions().get(self.TABLE)
+			if self._version is None or version != self._version:
+				self.refresh()
+		return self._images
+
+	def __getitem__(self, key):
+		return self._current()[key]
+
+	def __iter__(self):
+		return iter(self._current())
+
+	def __len__(self):
+		return len(self._current())
+
+	def stats(self):
+		return {'images': len(self._images), 'version': self._version, 'loads': self.loads}
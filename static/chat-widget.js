@@ -1,14 +1,29 @@
 /**
  * 실시간 1대1 채팅 위젯
  * 우측 하단에 표시되며 클릭으로 열기/닫기 가능
+ * 서버가 푸시(Socket.IO)를 지원하면 세션 방에 연결해 새 메시지를 받고,
+ * 연결할 수 없으면 롱폴링(서버가 새 메시지가 올 때까지 응답을 미룸), 그것도 꺼져 있으면 3초 폴링으로 동작한다
  */
 
+// 스크립트 태그의 data-push / data-long-poll 로 서버가 지원하는 방식을 받는다
+const CHAT_SCRIPT = document.currentScript;
+const SOCKET_IO_CLIENT = 'https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.7.5/socket.io.min.js';
+const LONG_POLL_WAIT = 25; // 초 (서버의 CHAT_LONG_POLL_TIMEOUT 을 넘으면 서버 값으로 잘린다)
+
 class ChatWidget {
     constructor() {
         this.sessionId = localStorage.getItem('chat_session_id');
         this.userName = localStorage.getItem('chat_user_name') || '방문자';
         this.isOpen = false;
         this.pollInterval = null;
+        this.socket = null;
+        this.messages = [];
+        this.lastId = null;
+        this.pushEnabled = !!(CHAT_SCRIPT && CHAT_SCRIPT.dataset.push === 'true');
+        this.longPollEnabled = !!(CHAT_SCRIPT && CHAT_SCRIPT.dataset.longPoll === 'true');
+        this.longPolling = false;
+        this.pollGeneration = 0;
+        this.pollAbort = null;
         this.init();
     }
 
@@ -19,7 +34,7 @@ class ChatWidget {
         // 세션이 있으면 메시지 로드
         if (this.sessionId) {
             this.loadMessages();
-            this.startPolling();
+            this.startUpdates();
         }
     }
 
@@ -131,25 +146,19 @@ class ChatWidget {
             if (this.sessionId) {
                 this.showChatArea();
                 this.loadMessages();
-                if (!this.pollInterval) {
-                    this.startPolling();
+                if (!this.pollInterval && !this.longPolling && !this.socket) {
+                    this.startUpdates();
                 }
             }
         } else {
-            if (this.pollInterval) {
-                clearInterval(this.pollInterval);
-                this.pollInterval = null;
-            }
+            this.stopUpdates();
         }
     }
 
     closeChat() {
         this.isOpen = false;
         document.getElementById('chat-window').style.display = 'none';
-        if (this.pollInterval) {
-            clearInterval(this.pollInterval);
-            this.pollInterval = null;
-        }
+        this.stopUpdates();
     }
 
     async startChat() {
@@ -182,7 +191,7 @@ class ChatWidget {
                 localStorage.setItem('chat_user_name', name);
 
                 this.showChatArea();
-                this.startPolling();
+                this.startUpdates();
             }
         } catch (error) {
             console.error('채팅 시작 오류:', error);
@@ -255,39 +264,72 @@ class ChatWidget {
 
             if (data.success) {
                 input.value = '';
-                this.loadMessages();
+                // 푸시로 연결되어 있으면 보낸 메시지도 소켓으로 돌아온다
+                if (!this.socket || !this.socket.connected) {
+                    this.loadMessages();
+                }
             }
         } catch (error) {
             console.error('메시지 전송 오류:', error);
         }
     }
 
-    async loadMessages() {
-        if (!this.sessionId) return;
+    // wait(초)를 주면 롱폴링 - 새 메시지가 올 때까지 서버가 응답을 미룬다. 성공 여부를 돌려준다
+    async loadMessages(wait = 0) {
+        if (!this.sessionId) return false;
 
         try {
-            const response = await fetch(`/api/chat/messages/${this.sessionId}`);
+            // 이미 받은 메시지 이후만 요청 (변화가 없으면 서버가 304 로 응답하고 브라우저 캐시 본문을 돌려준다)
+            const params = new URLSearchParams();
+            if (this.lastId !== null) {
+                params.set('since', this.lastId);
+                if (wait) params.set('wait', wait);
+            }
+            const query = params.toString() ? `?${params}` : '';
+            const options = {};
+            if (wait) {
+                this.pollAbort = new AbortController();
+                options.signal = this.pollAbort.signal;
+            }
+            const response = await fetch(`/api/chat/messages/${this.sessionId}${query}`, options);
             const data = await response.json();
 
             if (data.success) {
-                this.displayMessages(data.messages);
+                if (this.mergeMessages(data.messages, this.lastId === null)) {
+                    this.displayMessages(this.messages);
+                }
+                this.lastId = Math.max(this.lastId || 0, data.last_id || 0);
 
                 // 세션 종료 확인
                 if (data.session_status === 'closed') {
                     this.handleSessionClosed();
                 }
             }
+            return !!data.success;
         } catch (error) {
-            console.error('메시지 로드 오류:', error);
+            if (error.name !== 'AbortError') {
+                console.error('메시지 로드 오류:', error);
+            }
+            return false;
         }
     }
 
-    handleSessionClosed() {
-        // 폴링 중지
-        if (this.pollInterval) {
-            clearInterval(this.pollInterval);
-            this.pollInterval = null;
+    // 새 메시지를 합치고 목록이 바뀌었는지 돌려준다
+    mergeMessages(messages, replace) {
+        if (replace) {
+            this.messages = messages;
+            return true;
         }
+        const known = new Set(this.messages.map(m => m.id));
+        const added = messages.filter(m => !known.has(m.id));
+        if (!added.length) return false;
+        this.messages = this.messages.concat(added);
+        return true;
+    }
+
+    handleSessionClosed() {
+        // 폴링/푸시 중지
+        this.stopUpdates();
 
         // 입력창 숨기고 종료 메시지 표시
         const inputArea = document.getElementById('chat-input-area');
@@ -317,14 +359,13 @@ class ChatWidget {
         localStorage.removeItem('chat_session_id');
         localStorage.removeItem('chat_user_name');
 
-        // 폴링 중지
-        if (this.pollInterval) {
-            clearInterval(this.pollInterval);
-            this.pollInterval = null;
-        }
+        // 폴링/푸시 중지
+        this.stopUpdates();
 
         // 상태 초기화
         this.sessionId = null;
+        this.messages = [];
+        this.lastId = null;
         this.userName = '방문자';
 
         // 영역 초기화
@@ -394,11 +435,117 @@ class ChatWidget {
     }
 
     startPolling() {
+        if (this.longPollEnabled) {
+            this.startLongPolling();
+            return;
+        }
+        if (this.pollInterval) return;
         this.pollInterval = setInterval(() => {
             this.loadMessages();
         }, 3000); // 3초마다 새 메시지 확인
     }
 
+    // 응답이 오면 바로 다음 요청을 보내 항상 요청 하나만 서버에 걸어 둔다
+    async startLongPolling() {
+        if (this.longPolling) return;
+        this.longPolling = true;
+        // 중지 후 다시 시작해도 이전 루프가 이어 돌지 않도록 세대 번호로 구분
+        const generation = ++this.pollGeneration;
+        const active = () => this.longPolling && generation === this.pollGeneration && this.sessionId;
+        while (active()) {
+            const ok = await this.loadMessages(LONG_POLL_WAIT);
+            if (!ok && active()) {
+                // 오류 시 잠시 쉬었다가 재시도
+                await new Promise(resolve => setTimeout(resolve, 3000));
+            }
+        }
+        if (generation === this.pollGeneration) {
+            this.longPolling = false;
+        }
+    }
+
+    stopPolling() {
+        if (this.pollInterval) {
+            clearInterval(this.pollInterval);
+            this.pollInterval = null;
+        }
+        this.longPolling = false;
+        this.pollGeneration++;
+        if (this.pollAbort) {
+            this.pollAbort.abort();
+            this.pollAbort = null;
+        }
+    }
+
+    // 푸시가 가능하면 소켓 연결, 아니면 폴링
+    startUpdates() {
+        if (!this.pushEnabled) {
+            this.startPolling();
+            return;
+        }
+        this.loadSocketClient()
+            .then(() => this.connectSocket())
+            .catch(() => this.startPolling());
+    }
+
+    stopUpdates() {
+        this.stopPolling();
+        if (this.socket) {
+            this.socket.disconnect();
+            this.socket = null;
+        }
+    }
+
+    loadSocketClient() {
+        if (window.io) return Promise.resolve();
+        if (!ChatWidget.socketClientPromise) {
+            ChatWidget.socketClientPromise = new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = SOCKET_IO_CLIENT;
+                script.onload = resolve;
+                script.onerror = () => {
+                    ChatWidget.socketClientPromise = null;
+                    reject(new Error('socket.io client load failed'));
+                };
+                document.head.appendChild(script);
+            });
+        }
+        return ChatWidget.socketClientPromise;
+    }
+
+    connectSocket() {
+        if (this.socket || !this.sessionId) return;
+        const socket = window.io({ transports: ['websocket', 'polling'] });
+        this.socket = socket;
+
+        socket.on('connect', () => {
+            socket.emit('join', { session_id: this.sessionId });
+            // 연결(재연결) 동안 놓친 메시지를 한 번 받아오고 폴링은 중지
+            this.stopPolling();
+            this.loadMessages();
+        });
+
+        // 연결이 끊기면 다시 연결될 때까지 폴링으로 대체
+        socket.on('disconnect', (reason) => {
+            if (reason !== 'io client disconnect') this.startPolling();
+        });
+        socket.on('connect_error', () => this.startPolling());
+
+        socket.on('chat_message', (data) => {
+            if (data.session_id !== this.sessionId) return;
+            if (this.mergeMessages([data.message], false)) {
+                this.displayMessages(this.messages);
+            }
+            this.lastId = Math.max(this.lastId || 0, data.message.id);
+        });
+
+        socket.on('chat_closed', (data) => {
+            if (data.session_id === this.sessionId) {
+                this.handleSessionClosed();
+            }
+        });
+    }
+
     escapeHtml(text) {
         const div = document.createElement('div');
         div.textContent = text;
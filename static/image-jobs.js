@@ -0,0 +1,37 @@
+/**
+ * 업로드 사진 처리 상태 확인
+ *
+ * 업로드 직후 사진은 서버에서 최적화가 끝날 때까지 자리표시 이미지
+ * (/static/images/processing.svg?job=<id>)를 가리킵니다.
+ * 이 스크립트는 해당 이미지를 찾아 /admin/api/image-jobs/<id> 를 확인하고,
+ * 처리가 끝나면 최종 사진으로 바꿉니다.
+ */
+
+(function () {
+    const PLACEHOLDER = '/static/images/processing.svg?job=';
+    const INTERVAL = 1500;
+    const MAX_TRIES = 80;
+
+    function watch(img, jobId, tries) {
+        fetch(`/admin/api/image-jobs/${encodeURIComponent(jobId)}`, { credentials: 'same-origin' })
+            .then((response) => (response.ok ? response.json() : null))
+            .then((job) => {
+                if (job && job.url && job.status !== 'queued') {
+                    img.src = job.url;
+                    if (job.status === 'failed') img.title = '사진 처리에 실패해 이전 사진을 표시합니다.';
+                    return;
+                }
+                if (job && tries < MAX_TRIES) setTimeout(() => watch(img, jobId, tries + 1), INTERVAL);
+            })
+            .catch(() => {
+                if (tries < MAX_TRIES) setTimeout(() => watch(img, jobId, tries + 1), INTERVAL);
+            });
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+        document.querySelectorAll(`img[src^="${PLACEHOLDER}"]`).forEach((img) => {
+            const jobId = img.getAttribute('src').slice(PLACEHOLDER.length);
+            if (jobId) watch(img, jobId, 0);
+        });
+    });
+})();
@@ -0,0 +1,108 @@
+"""
+업로드 요청 본문 스트리밍
+Werkzeug 기본 요청은 파일 파트를 메모리(SpooledTemporaryFile)에 받다가 넘치면 임시 파일로 옮기고,
+핸들러는 그것을 file.save() 로 다시 복사한다. UploadRequest 는 파일 파트를 처음부터 처리 전 폴더의
+임시 파일에 조각(chunk) 단위로 쓰고, save_upload() 는 그 파일을 복사 없이 이름만 바꿔 옮긴다.
+그래서 업로드 크기와 상관없이 워커 메모리에는 파서의 조각 버퍼만 남는다.
+
+- 파일 파트의 첫 바이트(매직 헤더)가 JPEG/PNG/GIF/WebP/zip 이 아니면 본문을 끝까지 받지 않고 415 로 거절한다
+- 요청이 끝날 때 옮기지 않은 임시 파일은 지운다
+"""
+
+import os
+import tempfile
+
+from flask import Request, current_app
+from werkzeug.exceptions import UnsupportedMediaType
+
+# 파일 형식별 매직 헤더 (WebP 는 RIFF....WEBP)
+SIGNATURES = {
+	'jpeg': (b'\xff\xd8\xff',),
+	'png': (b'\x89PNG\r\n\x1a\n',),
+	'gif': (b'GIF87a', b'GIF89a'),
+	'zip': (b'PK\x03\x04',),
+}
+HEADER_SIZE = 12
+
+
+def sniff(header):
+	"""파일 첫 바이트로 본 형식 (허용하지 않는 형식이면 None)"""
+	if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+		return 'webp'
+	for kind, prefixes in SIGNATURES.items():
+		if header.startswith(prefixes):
+			return kind
+	return None
+
+
+class UploadFile:
+	"""처리 전 폴더의 임시 파일에 바로 쓰는 파일 파트 (첫 조각에서 형식 확인)"""
+
+	def __init__(self, folder, filename):
+		os.makedirs(folder, exist_ok=True)
+		self._file = tempfile.NamedTemporaryFile(dir=folder, prefix='upload-', suffix='.part', delete=False)
+		self.name = self._file.name
+		self.filename = filename
+		self._header = b''  # 형식을 확인하면 None
+
+	def _check(self):
+		header, self._header = self._header, None
+		# 빈 파트는 파일을 고르지 않고 제출한 폼 (핸들러가 file.filename 으로 거른다)
+		if header and sniff(header) is None:
+			raise UnsupportedMediaType('이미지 파일(JPEG, PNG, GIF, WebP) 또는 zip 만 올릴 수 있습니다.')
+
+	def write(self, data):
+		if self._header is not None:
+			self._header += data[:HEADER_SIZE]
+			if len(self._header) >= HEADER_SIZE:
+				self._check()
+		return self._file.write(data)
+
+	def seek(self, offset, whence=0):
+		# 파서가 파트를 다 쓰고 처음으로 되감을 때, 헤더보다 짧은 파일도 확인한다
+		if self._header is not None:
+			self._check()
+		return self._file.seek(offset, whence)
+
+	def __getattr__(self, name):
+		return getattr(self._file, name)
+
+	def __iter__(self):
+		return iter(self._file)
+
+
+class UploadRequest(Request):
+	"""파일 파트를 메모리 대신 처리 전 폴더의 임시 파일로 받는 요청"""
+
+	def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+		pipeline = current_app.extensions.get('image_pipeline')
+		folder = pipeline.incoming_folder if pipeline is not None else tempfile.gettempdir()
+		upload = UploadFile(folder, filename)
+		self._uploads = getattr(self, '_uploads', []) + [upload]
+		return upload
+
+	def close(self):
+		super().close()
+		for upload in getattr(self, '_uploads', ()):
+			upload.close()
+			try:
+				os.remove(upload.name)
+			except FileNotFoundError:
+				pass  # save_upload() 로 옮긴 파일
+
+
+def save_upload(file, path):
+	"""업로드 파일(FileStorage)을 path 에 둔다 - 임시 파일로 받은 파트는 복사 없이 이름만 바꾼다"""
+	stream = file.stream
+	if isinstance(stream, UploadFile):
+		stream.close()
+		try:
+			os.replace(stream.name, path)
+			return
+		except OSError:
+			pass  # 다른 파일 시스템이면 아래에서 복사
+		with open(stream.name, 'rb') as source, open(path, 'wb') as target:
+			while chunk := source.read(1024 * 1024):
+				target.write(chunk)
+		return
+	file.save(path)